@@ -0,0 +1,218 @@
+"""
+Refresh benchmarks against a fake Docker daemon
+
+Measures, for each container count: API round trips and latency of a full
+listing (cold and warm image cache), of an event-driven single-container
+update, Containers menu reconcile time under the offscreen Qt platform, and
+peak Python memory. Results are printed as JSON.
+
+    python -m benchmarks.bench_refresh --sizes 10,500,5000 --latency 0.002
+"""
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import dataclasses
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from .fake_daemon import FakeDockerDaemon
+
+# Qt objects must outlive every benchmark; tearing them down mid-run crashes PySide
+_qt_objects: list = []
+
+def _timed(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "min_ms": ordered[0] * 1000,
+    }
+
+async def bench_listing(service, daemon: FakeDockerDaemon, repeats: int) -> dict:
+    """Full listings through DockerService.resync()."""
+    await service.is_docker_running()
+
+    service._invalidate_images()
+    daemon.reset_counters()
+    tracemalloc.start()
+    started = time.perf_counter()
+    await service.resync()
+    cold = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    cold_requests = dict(daemon.requests)
+
+    samples = []
+    daemon.reset_counters()
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await service.resync()
+        samples.append(time.perf_counter() - started)
+    return {
+        "cold_ms": cold * 1000,
+        "cold_round_trips": sum(cold_requests.values()),
+        "cold_requests": cold_requests,
+        "warm": _timed(samples),
+        "warm_round_trips": daemon.total_requests / repeats,
+        "peak_memory_bytes": peak,
+    }
+
+def bench_events(service, daemon: FakeDockerDaemon, repeats: int) -> dict:
+    """Time from a daemon state change to the service's listener firing."""
+    changed = threading.Event()
+    service.add_listener(changed.set)
+    service.start_watching()
+    deadline = time.monotonic() + 30
+    while service.snapshot() is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    container_id = next(iter(daemon.containers))
+    samples = []
+    daemon.reset_counters()
+    for i in range(repeats):
+        changed.clear()
+        started = time.perf_counter()
+        running = i % 2 == 0
+        daemon.set_state(container_id, "running" if running else "exited",
+                         "start" if running else "die")
+        if not changed.wait(10):
+            break
+        samples.append(time.perf_counter() - started)
+    service.stop_watching()
+    return {
+        "update": _timed(samples) if samples else None,
+        "round_trips_per_event": daemon.total_requests / max(1, len(samples)),
+    }
+
+def bench_menu(containers, repeats: int) -> Optional[dict]:
+    """Update the Containers submenu offscreen: cold, unchanged and one change.
+
+    Each update is timed as if the menu and the group of the first running
+    container were open (their rows are built), plus the cheaper case of an update
+    arriving while the menu is closed.
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PySide6.QtWidgets import QApplication
+        from colama.ui.menu_bar import ColamaMenuBar
+    except ImportError:
+        return None
+
+    app = QApplication.instance() or QApplication([])
+    tray = ColamaMenuBar()
+    _qt_objects.extend([app, tray])
+    for service in tray.profiles.services().values():
+        service.stop_watching()
+    menu = tray.containers_menu
+    # The container that changes, and whose group submenu is kept "open"
+    index = next((i for i, c in enumerate(containers) if c.is_running), 0)
+    opened = containers[index].group if containers else ""
+
+    def update(items) -> float:
+        started = time.perf_counter()
+        tray._reconcile_container_actions(items)
+        menu.refresh()
+        # Group submenus are built when shown; refresh the one "open" like Qt would
+        group = menu._groups.get(opened)
+        if group is not None:
+            group.refresh()
+        return time.perf_counter() - started
+
+    tracemalloc.start()
+    cold = update(containers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows_built = len(list(menu.rows()))
+    assert not containers or rows_built > 0, "the menu benchmark built no container rows"
+
+    unchanged, changed, closed = [], [], []
+    for i in range(repeats):
+        unchanged.append(update(containers))
+
+        updated = list(containers)
+        # Its status text changes; flipping is_running would move it to "Stopped"
+        updated[index] = dataclasses.replace(updated[index], status=f"bench-{i}")
+        changed.append(update(updated))
+
+        started = time.perf_counter()
+        tray._reconcile_container_actions(containers)
+        closed.append(time.perf_counter() - started)
+
+    update([])
+    tray.profiles.shutdown()
+    app.processEvents()
+    return {
+        "cold_ms": cold * 1000,
+        "unchanged": _timed(unchanged),
+        "one_change": _timed(changed),
+        "closed": _timed(closed),
+        "rows_built": rows_built,
+        "peak_memory_bytes": peak,
+    }
+
+def run_size(size: int, latency: float, repeats: int, menu: bool) -> dict:
+    socket_path = os.path.join(tempfile.mkdtemp(prefix="colama-bench-"), "docker.sock")
+    os.environ["DOCKER_HOST"] = f"unix://{socket_path}"
+    from colama.services.docker_service import DockerService
+
+    with FakeDockerDaemon(socket_path, containers=size, latency=latency) as daemon:
+        service = DockerService()
+        try:
+            listing = asyncio.run(bench_listing(service, daemon, repeats))
+            containers = service.snapshot() or []
+            events = bench_events(service, daemon, repeats)
+        finally:
+            service.shutdown()
+        result = {
+            "containers": size,
+            "latency_ms": latency * 1000,
+            "listing": listing,
+            "events": events,
+        }
+        if menu:
+            result["menu"] = bench_menu(containers, repeats)
+    return result
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="10,500,5000",
+                        help="Comma-separated container counts (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Per-request daemon latency in seconds (default: %(default)s)")
+    parser.add_argument("--repeats", type=int, default=10,
+                        help="Measured iterations per case (default: %(default)s)")
+    parser.add_argument("--no-menu", action="store_true", help="Skip the Qt menu benchmark")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+        },
+        "results": [
+            run_size(int(size), args.latency, args.repeats, not args.no_menu)
+            for size in args.sizes.split(",")
+        ],
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+if __name__ == "__main__":
+    code = main()
+    sys.stdout.flush()
+    # Some PySide6 builds underflow None's refcount in void setters and abort at
+    # interpreter teardown after thousands of menu updates; results are already out
+    os._exit(code)
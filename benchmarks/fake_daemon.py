@@ -0,0 +1,439 @@
+"""
+A stand-in Docker Engine API served on a unix socket
+
+Implements just enough of the API for DockerService: ping/version, container
+and image listings, container inspect and lifecycle actions, system/df and
+prunes, and streaming /events, container logs and image pull endpoints. Every request is counted per route and can be delayed by a
+fixed latency to mimic a slow daemon.
+"""
+from collections import Counter
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+import hashlib
+import json
+import os
+import queue
+import re
+import socketserver
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+
+API_VERSION = "1.44"
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode()).hexdigest()
+
+class FakeDockerDaemon:
+    """Synthetic daemon state plus a threaded HTTP server over a unix socket."""
+
+    def __init__(self, socket_path: str, containers: int = 10, images: int = 20,
+                 latency: float = 0.0):
+        self.socket_path = socket_path
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self.containers: Dict[str, dict] = {}
+        self.images: Dict[str, dict] = {}
+        self.volumes: Dict[str, dict] = {}
+        self.build_cache: List[dict] = []
+        self._subscribers: List[queue.Queue] = []
+        self.logs: Dict[str, List[str]] = {}
+        # Seconds a container takes to exit on stop; the stop's ?t= grace period caps it
+        self.stop_delays: Dict[str, float] = {}
+        # Seconds each streamed pull progress line takes
+        self.pull_delay = 0.05
+        self._log_subscribers: Dict[str, List[queue.Queue]] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.BaseServer] = None
+        self.seed(containers, images)
+
+    def seed(self, containers: int, images: int = 20) -> None:
+        """Replace the state with synthetic containers spread over a few images and projects."""
+        self.images = {}
+        for i in range(images):
+            image_id = "sha256:" + _digest(f"image-{i}")
+            self.images[image_id] = {
+                "Id": image_id,
+                "RepoTags": [f"example/app{i}:latest"],
+                "RepoDigests": [f"example/app{i}@sha256:{_digest(f'digest-{i}')}"],
+                "Size": 50_000_000 + i * 1_000_000,
+                "Created": 1_700_000_000 + i,
+                "Labels": {},
+            }
+        # A few untagged leftovers from rebuilds
+        for i in range(max(1, images // 5)):
+            image_id = "sha256:" + _digest(f"dangling-{i}")
+            self.images[image_id] = {
+                "Id": image_id, "RepoTags": [], "RepoDigests": [],
+                "Size": 20_000_000, "Created": 1_600_000_000 + i, "Labels": {},
+            }
+        image_ids = [i for i, image in self.images.items() if image["RepoTags"]]
+        self.containers = {}
+        for i in range(containers):
+            container_id = _digest(f"container-{i}")
+            image_id = image_ids[i % len(image_ids)]
+            running = i % 3 != 0
+            self.containers[container_id] = {
+                "Id": container_id,
+                "Names": [f"/container-{i}"],
+                "Image": self.images[image_id]["RepoTags"][0],
+                "ImageID": image_id,
+                "Command": "/entrypoint.sh",
+                "Created": 1_700_000_000 + i,
+                "State": "running" if running else "exited",
+                "Status": "Up 2 hours" if running else "Exited (0) 1 hour ago",
+                "Labels": {
+                    "com.docker.compose.project": f"project{i % 25}",
+                    "com.docker.compose.service": f"service{i}",
+                },
+            }
+            if i >= 25:
+                # Each service of a project depends on the one before it
+                self.containers[container_id]["Labels"]["com.docker.compose.depends_on"] = (
+                    f"service{i - 25}:service_started:false"
+                )
+        self.volumes = {
+            f"volume{i}": {"Name": f"volume{i}", "Driver": "local",
+                           "UsageData": {"Size": 5_000_000 * (i + 1), "RefCount": i % 2}}
+            for i in range(4)
+        }
+        self.build_cache = [
+            {"ID": _digest(f"cache-{i}")[:25], "Description": f"RUN step {i}", "Size": 10_000_000,
+             "InUse": False, "Shared": i == 0, "Type": "regular"}
+            for i in range(3)
+        ]
+
+    def reset_counters(self) -> None:
+        self.requests.clear()
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def emit(self, event: dict) -> None:
+        """Push an event to every open /events stream."""
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.put(event)
+
+    def write_logs(self, container_id: str, lines: List[str]) -> None:
+        """Append stdout lines to a container's log and to anyone following it."""
+        with self._lock:
+            self.logs.setdefault(container_id, []).extend(lines)
+            for subscriber in self._log_subscribers.get(container_id, []):
+                subscriber.put(lines)
+
+    def set_state(self, container_id: str, state: str, action: str) -> None:
+        container = self.containers[container_id]
+        container["State"] = state
+        container["Status"] = "Up 1 second" if state == "running" else "Exited (0) 1 second ago"
+        self.emit({
+            "Type": "container", "Action": action, "status": action, "id": container_id,
+            "Actor": {"ID": container_id, "Attributes": {"name": container["Names"][0][1:]}},
+            "time": int(time.time()),
+        })
+
+    def set_health(self, container_id: str, health: str) -> None:
+        """Report a healthcheck result, as a running container with a healthcheck would."""
+        container = self.containers[container_id]
+        container["Status"] = f"Up 1 minute ({health})"
+        self.emit({
+            "Type": "container", "Action": f"health_status: {health}",
+            "status": f"health_status: {health}", "id": container_id,
+            "Actor": {"ID": container_id, "Attributes": {"name": container["Names"][0][1:]}},
+            "time": int(time.time()),
+        })
+
+    def start(self) -> "FakeDockerDaemon":
+        """Serve in a background thread."""
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        daemon = self
+
+        class Handler(_Handler):
+            pass
+        Handler.daemon = daemon
+        self._server = _Server(self.socket_path, Handler)
+        threading.Thread(target=self._server.serve_forever, name="fake-dockerd", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._lock:
+            for subscriber in self._subscribers:
+                subscriber.put(None)
+            for subscribers in self._log_subscribers.values():
+                for subscriber in subscribers:
+                    subscriber.put(None)
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def __enter__(self) -> "FakeDockerDaemon":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    # Concurrent shutdowns open a connection per container at once
+    request_queue_size = 128
+
+    def handle_error(self, request, client_address) -> None:
+        pass  # clients hanging up mid-request are expected
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    daemon: FakeDockerDaemon
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def address_string(self) -> str:
+        return "unix"
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, data, status: int = 200) -> None:
+        self._send(status, json.dumps(data).encode())
+
+    def _not_found(self, what: str) -> None:
+        self._json({"message": f"No such {what}"}, 404)
+
+    def _container(self, ref: str) -> Optional[dict]:
+        containers = self.daemon.containers
+        if ref in containers:
+            return containers[ref]
+        return next((c for c in containers.values()
+                     if c["Id"].startswith(ref) or c["Names"][0] == "/" + ref), None)
+
+    def _route(self, method: str) -> None:
+        url = urlsplit(self.path)
+        path = re.sub(r"^/v[\d.]+", "", url.path)
+        query = parse_qs(url.query)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+
+        route = re.sub(r"/[0-9a-f]{12,64}(?=/|$)", "/{id}", path)
+        self.daemon.requests[f"{method} {route}"] += 1
+        if self.daemon.latency:
+            time.sleep(self.daemon.latency)
+
+        if path == "/_ping":
+            return self._send(200, b"OK", "text/plain")
+        if path == "/version":
+            return self._json({"ApiVersion": API_VERSION, "Version": "25.0.0", "Os": "linux"})
+        if path == "/events":
+            return self._events()
+        if path == "/containers/json":
+            return self._list_containers(query)
+        if path == "/images/json":
+            return self._json(list(self.daemon.images.values()))
+        if path == "/system/df":
+            return self._system_df()
+        if path == "/images/prune":
+            filters = json.loads(query.get("filters", ["{}"])[0])
+            dangling_only = "false" not in str(filters.get("dangling", ["true"]))
+            used = {c["ImageID"] for c in self.daemon.containers.values()}
+            removed = [i for i, image in self.daemon.images.items()
+                       if i not in used and (not dangling_only or not image["RepoTags"])]
+            reclaimed = sum(self.daemon.images.pop(i)["Size"] for i in removed)
+            return self._json({"ImagesDeleted": [{"Deleted": i} for i in removed],
+                               "SpaceReclaimed": reclaimed})
+        if path == "/volumes/prune":
+            removed = [n for n, v in self.daemon.volumes.items() if not v["UsageData"]["RefCount"]]
+            reclaimed = sum(self.daemon.volumes.pop(n)["UsageData"]["Size"] for n in removed)
+            return self._json({"VolumesDeleted": removed, "SpaceReclaimed": reclaimed})
+        if path == "/build/prune":
+            reclaimed = sum(r["Size"] for r in self.daemon.build_cache if not r["InUse"])
+            self.daemon.build_cache = [r for r in self.daemon.build_cache if r["InUse"]]
+            return self._json({"CachesDeleted": [], "SpaceReclaimed": reclaimed})
+        if path == "/containers/prune":
+            removed = [cid for cid, c in self.daemon.containers.items() if c["State"] != "running"]
+            for container_id in removed:
+                del self.daemon.containers[container_id]
+            return self._json({"ContainersDeleted": removed, "SpaceReclaimed": 0})
+
+        match = re.match(r"^/containers/([^/]+)/logs$", path)
+        if match:
+            container = self._container(match.group(1))
+            if container is None:
+                return self._not_found("container")
+            return self._logs(container["Id"], query)
+
+        match = re.match(r"^/containers/([^/]+)/(json|start|stop|restart|kill)$", path)
+        if match:
+            container = self._container(match.group(1))
+            if container is None:
+                return self._not_found("container")
+            action = match.group(2)
+            if action == "json":
+                return self._json({
+                    "Id": container["Id"], "Name": container["Names"][0],
+                    "Image": container["ImageID"],
+                    "Config": {"Image": container["Image"], "Labels": container["Labels"], "Tty": False},
+                    "State": {"Status": container["State"], "Running": container["State"] == "running"},
+                })
+            if action == "stop" and container["Id"] in self.daemon.stop_delays:
+                grace = float(query.get("t", ["10"])[0])
+                time.sleep(min(self.daemon.stop_delays[container["Id"]], grace))
+            if action in ("start", "restart"):
+                self.daemon.set_state(container["Id"], "running", action)
+            else:
+                self.daemon.set_state(container["Id"], "exited", "die" if action == "kill" else action)
+            return self._send(204)
+
+        match = re.match(r"^/images/(.+)/json$", path)
+        if match:
+            ref = unquote(match.group(1))
+            if "@" not in ref and ":" not in ref.rsplit("/", 1)[-1]:
+                ref += ":latest"
+            image = next((i for i in self.daemon.images.values()
+                          if i["Id"] == ref or ref in i["RepoTags"] or ref in i["RepoDigests"]), None)
+            return self._json(image) if image else self._not_found("image")
+        match = re.match(r"^/distribution/(.+)/json$", path)
+        if match:
+            name = unquote(match.group(1)).partition("@")[0].rsplit(":", 1)[0]
+            return self._json({"Descriptor": {"digest": f"sha256:{_digest(name)}"}})
+        if path == "/images/create":
+            return self._pull(query["fromImage"][0], query.get("tag", ["latest"])[0])
+
+        self._not_found(f"route {method} {path}")
+
+    def _list_containers(self, query: Dict[str, List[str]]) -> None:
+        containers = list(self.daemon.containers.values())
+        if query.get("all", ["0"])[0] in ("0", "false"):
+            containers = [c for c in containers if c["State"] == "running"]
+        filters = json.loads(query.get("filters", ["{}"])[0])
+        ids = filters.get("id")
+        if ids:
+            if isinstance(ids, dict):
+                ids = list(ids)
+            containers = [c for c in containers if any(c["Id"].startswith(i) for i in ids)]
+        self._json(containers)
+
+    def _system_df(self) -> None:
+        daemon = self.daemon
+        users = Counter(c["ImageID"] for c in daemon.containers.values())
+        images = [dict(image, SharedSize=0, Containers=users[image_id])
+                  for image_id, image in daemon.images.items()]
+        containers = [dict(c, SizeRw=1_000_000) for c in daemon.containers.values()]
+        self._json({
+            "LayersSize": sum(image["Size"] for image in images),
+            "Images": images,
+            "Containers": containers,
+            "Volumes": list(daemon.volumes.values()),
+            "BuildCache": daemon.build_cache,
+        })
+
+    def _start_chunked(self, content_type: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        self.wfile.flush()
+
+    def _write_chunk(self, chunk: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.flush()
+
+    def _logs(self, container_id: str, query: Dict[str, List[str]]) -> None:
+        """Multiplexed stdout frames: the last `tail` lines, then new ones if following."""
+        def frame(lines: List[str]) -> bytes:
+            payload = "".join(line + "\n" for line in lines).encode()
+            return struct.pack(">BxxxL", 1, len(payload)) + payload
+
+        tail = query.get("tail", ["all"])[0]
+        follow = query.get("follow", ["0"])[0] in ("1", "true", "True")
+        subscriber: queue.Queue = queue.Queue()
+        with self.daemon._lock:
+            lines = list(self.daemon.logs.get(container_id, []))
+            if follow:
+                self.daemon._log_subscribers.setdefault(container_id, []).append(subscriber)
+        if tail != "all":
+            lines = lines[-int(tail):] if int(tail) else []
+
+        self._start_chunked("application/vnd.docker.multiplexed-stream")
+        try:
+            if lines:
+                self._write_chunk(frame(lines))
+            while follow:
+                batch = subscriber.get()
+                if batch is None:
+                    break
+                self._write_chunk(frame(batch))
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass
+        finally:
+            if follow:
+                with self.daemon._lock:
+                    self.daemon._log_subscribers[container_id].remove(subscriber)
+            self.close_connection = True
+
+    def _pull(self, name: str, tag: str) -> None:
+        """Stream progress for two layers, then add the image as the registry's current digest."""
+        self._start_chunked("application/json")
+        lines = [{"status": f"Pulling from {name}", "id": tag}]
+        for layer in ("aaaaaaaaaaaa", "bbbbbbbbbbbb"):
+            lines.append({"status": "Pulling fs layer", "id": layer, "progressDetail": {}})
+        for current in (5_000_000, 10_000_000):
+            for layer in ("aaaaaaaaaaaa", "bbbbbbbbbbbb"):
+                lines.append({"status": "Downloading", "id": layer,
+                              "progressDetail": {"current": current, "total": 10_000_000}})
+        for layer in ("aaaaaaaaaaaa", "bbbbbbbbbbbb"):
+            lines.append({"status": "Pull complete", "id": layer, "progressDetail": {}})
+        digest = f"sha256:{_digest(name)}"
+        lines.append({"status": f"Digest: {digest}"})
+        for line in lines:
+            time.sleep(self.daemon.pull_delay)
+            self._write_chunk((json.dumps(line) + "\n").encode())
+        ref = name if tag.startswith("sha256:") else f"{name}:{tag}"
+        image_id = "sha256:" + _digest(ref)
+        for image in self.daemon.images.values():
+            if ref in image["RepoTags"]:
+                image["RepoTags"].remove(ref)  # the tag moves to the new image
+        self.daemon.images[image_id] = {
+            "Id": image_id, "RepoTags": [] if tag.startswith("sha256:") else [ref],
+            "RepoDigests": [f"{name}@{digest}"], "Size": 20_000_000,
+            "Created": int(time.time()), "Labels": {},
+        }
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _events(self) -> None:
+        subscriber: queue.Queue = queue.Queue()
+        with self.daemon._lock:
+            self.daemon._subscribers.append(subscriber)
+        self._start_chunked("application/json")
+        try:
+            while True:
+                event = subscriber.get()
+                if event is None:
+                    break
+                self._write_chunk((json.dumps(event) + "\n").encode())
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            pass
+        finally:
+            with self.daemon._lock:
+                self.daemon._subscribers.remove(subscriber)
+            self.close_connection = True
+
+    def do_GET(self) -> None:
+        self._route("GET")
+
+    def do_POST(self) -> None:
+        self._route("POST")
+
+    def do_DELETE(self) -> None:
+        self._route("DELETE")
@@ -1,49 +1,88 @@
+import asyncio
 import os
+import threading
 import rumps
-import subprocess
+from PyObjCTools import AppHelper
+from colama.services.docker_service import DockerService
 
 class Colama(rumps.App):
-    running_docker_images = {}
-
     def __init__(self):
         super(Colama, self).__init__("Co-lama")
         self.openPathSettings()
         os.environ['PATH'] += os.pathsep + self.getPath()
         self.icon = 'lama.png'
         self.menu = ["Status", rumps.separator, "Start Docker", "Stop Docker", rumps.separator, "Containers", "Refresh"]
-        
-        self.update_docker_status()
-        self.timer = rumps.Timer(self.update_docker_status, 15)
+
+        # Docker calls run on their own event loop thread so they never block the rumps main loop.
+        # The events stream keeps the container list current; the timer is only a safety net.
+        self.docker = DockerService()
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, name="colama-legacy-loop", daemon=True).start()
+        self.docker.add_listener(self.request_refresh)
+        self.docker_running = None  # unknown until the first refresh
+        self.containers = {}  # container ID -> ContainerInfo
+        self._busy = None  # status line while Colima starts or stops
+        self._notifications = []
+        self._dirty = False
+        self._apply_pending = False  # apply_state already queued on the main thread
+        self._lock = threading.Lock()
+        self.docker.start_watching()
+        self.request_refresh()
+
+        self.timer = rumps.Timer(self.request_refresh, 15)
         self.timer.start()
 
-        self.check_docker_images()
-        self.check = rumps.Timer(self.check_docker_images, 10)
-        self.check.start()
-        
         self.update_docker_images_ui()
 
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def request_refresh(self, _=None):
+        self._submit(self._refresh())
+
+    async def _refresh(self):
+        running = await self.docker.is_docker_running()
+        containers = await self.docker.get_containers() if running else []
+        containers = {c.container_id: c for c in containers}
+        with self._lock:
+            if (running, containers) != (self.docker_running, self.containers):
+                self.docker_running = running
+                self.containers = containers
+                self._dirty = True
+                self._schedule_apply()
+
+    def _set_busy(self, text):
+        with self._lock:
+            self._busy = text
+            self._dirty = True
+            self._schedule_apply()
+
+    def _notify(self, *message):
+        with self._lock:
+            self._notifications.append(message)
+            self._schedule_apply()
+
+    def _schedule_apply(self):
+        # Caller holds _lock. Results are applied to the menu on the main thread,
+        # once per batch of changes.
+        if not self._apply_pending:
+            self._apply_pending = True
+            AppHelper.callAfter(self.apply_state)
+
+    def apply_state(self, _=None):
+        with self._lock:
+            self._apply_pending = False
+            dirty, self._dirty = self._dirty, False
+            notifications, self._notifications = self._notifications, []
+        for message in notifications:
+            rumps.notification(*message)
+        if dirty:
+            self.update_docker_status()
+            self.update_docker_images_ui()
 
-    def check_docker_images(self, _=None):
-        if self.is_docker_running():
-            dockerPS = subprocess.check_output(["docker ps -a"], shell=True).decode('utf-8')
-            dockerPS = dockerPS.split('\n')[1:]  # Skip the header row
-
-            new_docker_images = {}  # Create a new dictionary to hold the current Docker images
-
-            for row in dockerPS:
-                if row:  # Skip empty rows
-                    columns = row.split()
-                    if len(columns) > 1:  # Make sure there is an image name
-                        image_name = columns[1]  # The image name is the second column
-                        container_id = columns[0]  # The container ID is the first column
-                        status = columns[4:10]  # The status is the fifth column
-                        is_up = "Up" in status  # Check if the status includes "Up"
-                        new_docker_images[image_name] = [container_id, is_up]  # Save the container ID and the status
-
-            if new_docker_images != self.running_docker_images:
-                self.running_docker_images = new_docker_images
-                self.update_docker_images_ui()
-
+    @rumps.clicked("Refresh")
+    def refresh(self, _):
+        self.request_refresh()
 
     def update_docker_images_ui(self, _=None):
         if "Containers" in self.menu:
@@ -52,72 +91,75 @@ class Colama(rumps.App):
         self.menu.insert_before("Refresh", images_menu)
         images_menu.add(rumps.MenuItem("Delete all containers", callback=self.del_containers))
         images_menu.add(rumps.separator)
-        for image in self.running_docker_images.keys():
-            data = self.running_docker_images[image]
-            if(data[1]):
-                images_menu.add(rumps.MenuItem(image, callback=self.userclickStop, icon="green.png"))
-            else:
-                images_menu.add(rumps.MenuItem(image, callback=self.userclickStart, icon="red.png"))
+        for container in sorted(self.containers.values(), key=lambda c: c.name):
+            # Keyed by container ID: several containers can share one image
+            item = rumps.MenuItem(
+                f"{container.name} ({container.image})",
+                callback=self.userclickStop if container.is_running else self.userclickStart,
+                icon="green.png" if container.is_running else "red.png",
+            )
+            item.container_id = container.container_id
+            images_menu.add(item)
 
     def userclickStop(self, menuitem):
-        self.openActionWindow(menuitem.title, "stop")
+        self.openActionWindow(menuitem.container_id, "stop")
     def userclickStart(self, menuitem):
-        self.openActionWindow(menuitem.title, "start")
-
-    def delete_image(self, image):
-        def callback(self, menuitem):  
-            rumps.notification("docker rmi " + image, "test", menuitem.title)  
-            subprocess.run(["docker rmi " + image], shell=True, check=True)
-            self.check_docker_images()
-            self.update_docker_images_ui()
-        return callback
-
-    def is_docker_running(self):
-        try:
-            subprocess.check_output(["docker info"], shell=True)
-            return True
-        except subprocess.CalledProcessError:
-            return False
+        self.openActionWindow(menuitem.container_id, "start")
 
     @rumps.clicked("Start Docker")
     def start_colima(self, _):
-        if self.is_docker_running():
+        if self.docker_running:
             rumps.notification("ZzZzZ", "Docker is already running pal", "You are already there!")
             return
-        self.menu["Status"].title = "🟡 Starting..."
+        self._set_busy("🟡 Starting...")
         rumps.notification("Yeah Boi", "We're trying to start Docker", "Hang in there buddy, no stress")
-        subprocess.run(["colima start"], shell=True, check=True)
-        self.menu["Status"].title = "🟢 Docker is up and running"
-        rumps.notification("🦙🦙🦙🦙🦙", "Dude..", "We did it")
+        self._submit(self._start_colima())
+
+    async def _start_colima(self):
+        success = await self.docker.start_colima()
+        self._set_busy(None)
+        await self._refresh()
+        if success:
+            self._notify("🦙🦙🦙🦙🦙", "Dude..", "We did it")
+        else:
+            self._notify("Buuuuuuh", "Colima did not start", "Check `colima start` in a terminal")
 
     @rumps.clicked("Stop Docker")
     def stop_colima(self, _):
-        if not self.is_docker_running():
+        if not self.docker_running:
             rumps.notification("Buuuuuuh", "Docker is not running", "Can´t stop what is not running dummy")
             return
-        self.menu["Status"].title = "🟡 Stopping..."
-        subprocess.run(["colima stop"], shell=True, check=True)
-        self.menu["Status"].title = "🔴 Nope, not running"
-        rumps.notification("Finally", "Going back to bed", "Maybe something to eat.. cake?")
+        self._set_busy("🟡 Stopping...")
+        self._submit(self._stop_colima())
+
+    async def _stop_colima(self):
+        await self.docker.stop_colima()
+        self._set_busy(None)
+        await self._refresh()
+        self._notify("Finally", "Going back to bed", "Maybe something to eat.. cake?")
 
     def del_containers(self, _):
-        if not self.is_docker_running():
+        if not self.docker_running:
             rumps.notification("Buuuuuuh", "Docker is not running", "Can´t help you with that attitude -.-")
             return
-        subprocess.run(["docker rm $(docker ps --filter status=exited -q)"], shell=True, check=True)
-        rumps.notification("That was bold", "Hope you know what you are doing..", "Well well, more cake?")
-    
-    def openActionWindow(self, image_name, action):
-        
-        data = self.running_docker_images[image_name]
-        subprocess.run(["docker " + action + " " + data[0]], shell=True, check=True) 
-        rumps.notification("Im getting tired", "I do everything for you 🙄", "I'm going back to bed")
-        self.check_docker_images()
-        self.update_docker_images_ui()
-    
-    def openPathSettings(self, _=None):  
+        self._submit(self._del_containers())
+
+    async def _del_containers(self):
+        if await self.docker.remove_stopped_containers():
+            self._notify("That was bold", "Hope you know what you are doing..", "Well well, more cake?")
+
+    def openActionWindow(self, container_id, action):
+        self._submit(self._container_action(container_id, action))
+
+    async def _container_action(self, container_id, action):
+        handler = self.docker.start_container if action == "start" else self.docker.stop_container
+        if await handler(container_id):
+            self._notify("Im getting tired", "I do everything for you 🙄", "I'm going back to bed")
+        await self._refresh()
+
+    def openPathSettings(self, _=None):
         actualPath=self.getPath()
-        if not actualPath or actualPath == "":                
+        if not actualPath or actualPath == "":
             window = rumps.Window('Nothing...', 'ALERTZ')
             window.title = '¡Hola!'
             window.message = 'Can you please tell me your path to all your programs? 🙏 (The path to where your package manager has all the stuff)'
@@ -140,9 +182,11 @@ class Colama(rumps.App):
             with open(path, "r") as pathFile:
                 actualPath = pathFile.readline()
             return actualPath
-        
+
     def update_docker_status(self, _=None):
-        if self.is_docker_running():
+        if self._busy:
+            self.menu["Status"].title = self._busy
+        elif self.docker_running:
             self.menu["Status"].title = "🟢 Docker is up and running"
         else:
             self.menu["Status"].title = "🔴 Nope, not running"
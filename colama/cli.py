@@ -0,0 +1,479 @@
+"""
+Headless command line interface
+
+Only the standard library is imported up front: docker-py, rich and Qt are
+loaded by the subcommands that need them, so `colama status` stays fast and
+works on machines without a display.
+"""
+from dataclasses import asdict
+from typing import List, Optional
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from . import __version__
+from .services.disk_usage import PRUNE_TARGETS
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="colama",
+        description="Manage Docker containers running in Colima. "
+                    "Without a command, the menu bar app is launched.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--profile", help="Colima profile to talk to (default: DOCKER_HOST)")
+    parser.add_argument("--endpoint", action="append", default=[], metavar="SPEC",
+                        help="Extra Docker endpoint for merged views: a daemon URL, profile:NAME "
+                             "or context:NAME, optionally prefixed with NAME= (repeatable)")
+    parser.add_argument("--idle-suspend", type=float, metavar="MINUTES",
+                        help="Menu bar app: stop Colima after MINUTES without container activity")
+    instrumentation = parser.add_argument_group("instrumentation")
+    instrumentation.add_argument("--metrics-port", type=int, metavar="PORT",
+                                 help="Serve Prometheus metrics on 127.0.0.1:PORT/metrics")
+    instrumentation.add_argument("--metrics-json", metavar="PATH",
+                                 help="Dump metrics as JSON to PATH periodically and on exit")
+    instrumentation.add_argument("--metrics-interval", type=float, default=60.0, metavar="SECONDS",
+                                 help="Seconds between JSON dumps (default: %(default)s)")
+    instrumentation.add_argument("--profile-session", metavar="DIR",
+                                 help="Write cProfile and tracemalloc snapshots for this session to DIR")
+    commands = parser.add_subparsers(dest="command")
+
+    commands.add_parser("tray", help="Launch the menu bar app")
+
+    status = commands.add_parser("status", help="Show whether the Docker daemon is up")
+    status.add_argument("--json", action="store_true", help="Print machine-readable output")
+
+    ps = commands.add_parser("ps", help="List containers")
+    ps.add_argument("-a", "--all", action="store_true", help="Include stopped containers")
+    ps.add_argument("-E", "--endpoints", action="store_true",
+                    help="Also list every configured endpoint, each as soon as it answers")
+    ps.add_argument("--json", action="store_true", help="Print machine-readable output")
+
+    start = commands.add_parser("start", help="Start Colima (resuming a suspended VM's "
+                                              "containers, then pulling the pre-warm images), "
+                                              "or the given containers")
+    start.add_argument("containers", nargs="*", help="Container names or IDs")
+    start.add_argument("--json", action="store_true", help="Print machine-readable output")
+
+    stop = commands.add_parser("stop", help="Stop Colima, or the given containers")
+    stop.add_argument("containers", nargs="*", help="Container names or IDs")
+    stop.add_argument("-t", "--timeout", type=float, metavar="SECONDS",
+                      help="Stopping Colima: grace period shared by all containers before "
+                           "stragglers are killed (default: 10)")
+    stop.add_argument("--json", action="store_true", help="Print machine-readable output")
+
+    suspend = commands.add_parser("suspend", help="Stop Colima; `start` brings back what was running")
+    suspend.add_argument("--json", action="store_true", help="Print machine-readable output")
+
+    prewarm = commands.add_parser("prewarm", help="Pull the pre-warm images (or the given ones) "
+                                                  "that are not current yet")
+    prewarm.add_argument("images", nargs="*", help="Image references (default: the pre-warm list)")
+    prewarm.add_argument("--json", action="store_true", help="Print machine-readable output")
+
+    resize = commands.add_parser("resize", help="Recommend a VM size from the usage the menu bar "
+                                                "app recorded, and optionally apply it")
+    resize.add_argument("--apply", action="store_true",
+                        help="Restart Colima at the recommended size, keeping running containers")
+    resize.add_argument("--json", action="store_true", help="Print machine-readable output")
+
+    watch = commands.add_parser("watch", help="Print the container list whenever it changes")
+    watch.add_argument("--json", action="store_true", help="Print one JSON document per change")
+
+    logs = commands.add_parser("logs", help="Print a container's logs")
+    logs.add_argument("container", help="Container name or ID")
+    logs.add_argument("-f", "--follow", action="store_true", help="Keep printing new lines")
+    logs.add_argument("-n", "--tail", type=int, default=100,
+                      help="Lines to show from the end of the log (default: %(default)s)")
+
+    df = commands.add_parser("df", help="Show disk usage and what pruning would free")
+    df.add_argument("--top", type=int, default=10, help="Largest consumers to list (default: %(default)s)")
+    df.add_argument("--json", action="store_true", help="Print machine-readable output")
+
+    prune = commands.add_parser("prune", help="Free disk space in the Colima VM")
+    prune.add_argument("targets", nargs="+", choices=list(PRUNE_TARGETS), metavar="TARGET",
+                       help="One or more of: " + ", ".join(PRUNE_TARGETS))
+    prune.add_argument("--dry-run", action="store_true", help="Only estimate the space freed")
+    prune.add_argument("--json", action="store_true", help="Print machine-readable output")
+    return parser
+
+def _print_json(data) -> None:
+    print(json.dumps(data))
+
+def _print_containers(containers, title: Optional[str] = None) -> None:
+    from rich.table import Table
+    from .console import console
+
+    table = Table(box=None, title=title, title_justify="left")
+    for column in ("CONTAINER ID", "NAME", "IMAGE", "STATUS"):
+        table.add_column(column)
+    for c in containers:
+        status = c.status + (f" ({c.health})" if c.health else "")
+        if c.flapping:
+            status = f"[yellow]{status}, restarting[/yellow]"
+        elif c.health == "unhealthy":
+            status = f"[yellow]{status}[/yellow]"
+        else:
+            status = f"[green]{status}[/green]" if c.is_running else f"[red]{status}[/red]"
+        table.add_row(c.container_id, c.name, c.image, status)
+    console.print(table)
+
+async def _status(service, args: argparse.Namespace) -> int:
+    running = await service.is_docker_running()
+    if args.json:
+        _print_json({
+            "running": running,
+            "profile": args.profile,
+            "socket": service.health.socket_path,
+        })
+    else:
+        target = f"profile {args.profile}" if args.profile else service.health.socket_path or "DOCKER_HOST"
+        print(f"Docker is {'running' if running else 'not running'} ({target})")
+    return 0 if running else 1
+
+async def _ps(service, args: argparse.Namespace) -> int:
+    if args.endpoints:
+        return await _ps_endpoints(service, args)
+    if not await service.is_docker_running():
+        print("Docker is not running", file=sys.stderr)
+        return 1
+    containers = await service.get_containers()
+    if not args.all:
+        containers = [c for c in containers if c.is_running]
+    if args.json:
+        _print_json([asdict(c) for c in containers])
+    else:
+        _print_containers(containers)
+    return 0
+
+async def _ps_endpoints(service, args: argparse.Namespace) -> int:
+    from .services.endpoints import LOCAL_ENDPOINT, EndpointFanout, configured_endpoints
+
+    fanout = EndpointFanout(configured_endpoints(args.endpoint))
+    fanout.add_service(args.profile or LOCAL_ENDPOINT, service)
+
+    def show(name: str, containers) -> None:
+        if args.json:
+            return
+        if containers is None:
+            print(f"{name}: not reachable\n")
+        else:
+            _print_containers([c for c in containers if args.all or c.is_running], title=name)
+            print()
+        sys.stdout.flush()
+
+    try:
+        results = await fanout.get_containers(show)
+    finally:
+        fanout.shutdown()
+    if args.json:
+        _print_json({name: None if containers is None else
+                     [asdict(c) for c in containers if args.all or c.is_running]
+                     for name, containers in results.items()})
+    return 0 if all(containers is not None for containers in results.values()) else 1
+
+def _resolve(containers, names: List[str]) -> List[str]:
+    """Map names or ID prefixes onto container IDs."""
+    ids = []
+    for name in names:
+        match = next((c for c in containers
+                      if c.name == name or c.container_id.startswith(name)), None)
+        if match is None:
+            raise SystemExit(f"colama: no such container: {name}")
+        ids.append(match.container_id)
+    return ids
+
+async def _start_stop(service, args: argparse.Namespace) -> int:
+    if args.containers:
+        if not await service.is_docker_running():
+            print("Docker is not running", file=sys.stderr)
+            return 1
+        ids = _resolve(await service.get_containers(), args.containers)
+        results = await service.bulk_action(args.command, ids)
+        if args.json:
+            _print_json(results)
+        else:
+            for container_id, ok in results.items():
+                print(f"{container_id}: {'ok' if ok else 'failed'}")
+        return 0 if all(results.values()) else 1
+
+    if args.command == "start":
+        from .services.colima import PHASE_LABELS
+        from .services.idle import Suspender
+
+        def on_phase(phase: str, message: str) -> None:
+            if not args.json:
+                print(f"{PHASE_LABELS[phase]}: {message}", file=sys.stderr)
+
+        restored = await Suspender(service).resume(on_phase)
+        success = restored is not None
+        report = service.last_start_report
+        if not args.json and restored:
+            print(f"Restarted {sum(restored.values())} of {len(restored)} containers "
+                  f"that were running when Colima was stopped", file=sys.stderr)
+        # Pulls run in the background after a start; exiting would abort them
+        pulls = await _wait_for_pulls(service, args) if success and service.prewarm_task else None
+        if args.json:
+            _print_json({"success": success, "phases": report.phases if report else {},
+                         "total": report.total if report else 0.0, "restored": restored or {},
+                         "pulled": pulls.results() if pulls else {}})
+    else:
+        from .services.idle import Suspender
+
+        def on_progress(message: str) -> None:
+            if not args.json:
+                print(message, file=sys.stderr)
+
+        # Remembers the running containers, so `colama start` brings them back
+        success = await Suspender(service).suspend(on_progress, args.timeout, reason="stop")
+        report = service.last_stop_report
+        if args.json:
+            _print_json({"success": success, "containers": report.containers if report else {},
+                         "total": report.total if report else 0.0})
+    return 0 if success else 1
+
+async def _wait_for_pulls(service, args: argparse.Namespace):
+    """Await a pre-warm run, printing each image as it finishes."""
+    reported = set()
+
+    def on_progress(progress) -> None:
+        for ref, pull in progress.pulls.items():
+            if pull.finished and ref not in reported:
+                reported.add(ref)
+                if not args.json:
+                    detail = f": {pull.error}" if pull.error else ""
+                    print(f"{ref}: {pull.state}{detail}", file=sys.stderr)
+
+    service.add_pull_listener(on_progress)
+    progress = await service.prewarm_task
+    on_progress(progress)
+    return progress
+
+async def _prewarm(service, args: argparse.Namespace) -> int:
+    from .services.prewarm import configured_images
+
+    images = args.images or configured_images()
+    if not images:
+        print("No images to pull; list them in ~/.config/colama/prewarm or COLAMA_PREWARM",
+              file=sys.stderr)
+        return 1
+    if not await service.is_docker_running():
+        print("Docker is not running", file=sys.stderr)
+        return 1
+    service.prewarm_task = asyncio.ensure_future(service.pull_images(images))
+    progress = await _wait_for_pulls(service, args)
+    if args.json:
+        _print_json(progress.results())
+    else:
+        print(progress.report())
+    return 0 if not progress.count("failed") else 1
+
+async def _suspend(service, args: argparse.Namespace) -> int:
+    from .services.idle import Suspender
+
+    if not await service.is_docker_running():
+        print("Docker is not running", file=sys.stderr)
+        return 1
+    suspender = Suspender(service)
+    success = await suspender.suspend()
+    record = suspender.record
+    if args.json:
+        _print_json({"success": success, "containers": record.containers if record else []})
+    elif success:
+        count = len(record.containers) if record else 0
+        print(f"Colima stopped; `colama start` restarts the {count} running containers")
+    return 0 if success else 1
+
+async def _resize(service, args: argparse.Namespace) -> int:
+    from .services.colima import DEFAULT_PROFILE, PHASE_LABELS, list_profiles
+    from .services.sizing import UsageHistory, history_path, recommend, resize
+
+    name = args.profile or DEFAULT_PROFILE
+    profile = next((p for p in await list_profiles() if p.name == name), None)
+    if profile is None:
+        print(f"No Colima profile named {name}", file=sys.stderr)
+        return 1
+    history = UsageHistory.load(history_path(args.profile))
+    recommendation = recommend(history, profile.resources)
+    if args.json:
+        _print_json({
+            "samples": len(history), "current": asdict(profile.resources),
+            "recommended": asdict(recommendation.recommended) if recommendation else None,
+            "reasons": recommendation.reasons if recommendation else [],
+        })
+    elif recommendation is None:
+        print(f"Not enough usage history yet ({len(history)} samples); "
+              "the menu bar app records one a minute while Docker runs")
+    else:
+        print(f"Now:         {recommendation.current}")
+        print(f"Recommended: {recommendation.recommended}"
+              + ("" if recommendation.changed else " (no change)"))
+        for reason in recommendation.reasons:
+            print(f"  {reason}")
+    if not args.apply or recommendation is None or not recommendation.changed:
+        return 0 if recommendation is not None else 1
+
+    def on_phase(phase: str, message: str) -> None:
+        if not args.json:
+            print(f"{PHASE_LABELS[phase]}: {message}", file=sys.stderr)
+
+    restored = await resize(service, recommendation.recommended, on_phase)
+    if restored is None:
+        print("Colima did not come back up", file=sys.stderr)
+        return 1
+    if not args.json:
+        print(f"Restarted {sum(restored.values())} of {len(restored)} containers", file=sys.stderr)
+    return 0
+
+async def _current_containers(service) -> Optional[list]:
+    """The container listing, or None if Docker is not running."""
+    if not await service.is_docker_running():
+        return None
+    return await service.get_containers()
+
+def _logs(service, args: argparse.Namespace) -> int:
+    containers = asyncio.run(_current_containers(service))
+    if containers is None:
+        print("Docker is not running", file=sys.stderr)
+        return 1
+    [container_id] = _resolve(containers, [args.container])
+    tail = service.tail_logs(container_id, max_lines=args.tail, follow=args.follow)
+    dropped = 0
+    try:
+        while tail.running or tail.backlog:
+            lines = tail.drain(1000)
+            if tail.dropped > dropped:
+                print(f"[{tail.dropped - dropped} lines skipped]", file=sys.stderr)
+                dropped = tail.dropped
+            if lines:
+                print("\n".join(lines), flush=True)
+            else:
+                time.sleep(0.1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        tail.stop()
+    if tail.error:
+        print(f"colama: {tail.error}", file=sys.stderr)
+        return 1
+    return 0
+
+async def _df(service, args: argparse.Namespace) -> int:
+    from .services.stats import format_bytes
+
+    usage = await service.get_disk_usage(max_age=0)
+    if usage is None:
+        print("Could not get disk usage (is Docker running?)", file=sys.stderr)
+        return 1
+    top = usage.top(args.top)
+    if args.json:
+        _print_json({"totals": usage.totals, "reclaimable": usage.reclaimable,
+                     "top": [asdict(item) for item in top]})
+        return 0
+    for kind, size in usage.totals.items():
+        print(f"{kind:<12} {format_bytes(size):>10}")
+    print("\nReclaimable:")
+    for target, size in usage.reclaimable.items():
+        print(f"  {PRUNE_TARGETS[target]:<16} {format_bytes(size):>10}   colama prune {target}")
+    print("\nLargest:")
+    for item in top:
+        print(f"  {format_bytes(item.size):>10}  {item.kind:<12} {item.name}"
+              + ("" if item.in_use else "  (unused)"))
+    return 0
+
+async def _prune(service, args: argparse.Namespace) -> int:
+    from .services.stats import format_bytes
+
+    if args.dry_run:
+        usage = await service.get_disk_usage(max_age=0)
+        if usage is None:
+            print("Could not get disk usage (is Docker running?)", file=sys.stderr)
+            return 1
+        results = {target: usage.reclaimable[target] for target in args.targets}
+    else:
+        results = {target: await service.prune(target) for target in args.targets}
+    if args.json:
+        _print_json({"dry_run": args.dry_run, "reclaimed": results})
+    else:
+        verb = "would free" if args.dry_run else "freed"
+        for target, size in results.items():
+            print(f"{target}: {'failed' if size is None else f'{verb} {format_bytes(size)}'}")
+    return 0 if all(size is not None for size in results.values()) else 1
+
+def _watch(service, args: argparse.Namespace) -> int:
+    def show(containers: Optional[list]) -> None:
+        if containers is None:
+            if args.json:
+                _print_json({"running": False, "containers": []})
+            else:
+                print("Docker is not running")
+        elif args.json:
+            _print_json({"running": True, "containers": [asdict(c) for c in containers]})
+        else:
+            _print_containers(containers)
+        sys.stdout.flush()
+
+    changed = threading.Event()
+    service.add_listener(changed.set)
+    service.start_watching()
+    try:
+        # Once up front: with the daemon down, no listener fires until it comes up
+        show(asyncio.run(_current_containers(service)))
+        while True:
+            changed.wait()
+            changed.clear()
+            show(service.snapshot())
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        service.stop_watching()
+
+def instrumentation_enabled(args: argparse.Namespace) -> bool:
+    """Whether any opt-in exporter was asked for."""
+    return bool(getattr(args, "metrics_port", None) is not None
+                or getattr(args, "metrics_json", None) or getattr(args, "profile_session", None))
+
+def _start_instrumentation(args: argparse.Namespace) -> None:
+    """Start the requested metrics exporters; they are stopped at interpreter exit."""
+    if not instrumentation_enabled(args):
+        return
+    import atexit
+    from .services.metrics import JsonDumper, MetricsServer, SessionProfiler, metrics
+
+    if args.metrics_port is not None:
+        server = MetricsServer(metrics, args.metrics_port).start()
+        atexit.register(server.stop)
+        print(f"Serving metrics on http://{server.host}:{server.port}/metrics", file=sys.stderr)
+    if args.metrics_json:
+        atexit.register(JsonDumper(metrics, args.metrics_json, args.metrics_interval).start().stop)
+    if args.profile_session:
+        profiler = SessionProfiler(args.profile_session).start()
+
+        def write_profile() -> None:
+            for path in profiler.stop():
+                print(f"Wrote {path}", file=sys.stderr)
+        atexit.register(write_profile)
+
+def run(argv: Optional[List[str]] = None) -> int:
+    """Run the CLI and return its exit code."""
+    args = build_parser().parse_args(argv)
+    _start_instrumentation(args)
+    if args.command in (None, "tray"):
+        from .main import run_tray
+        return run_tray(args)
+
+    from .services.docker_service import DockerService
+    service = DockerService(profile=args.profile)
+    try:
+        if args.command == "watch":
+            return _watch(service, args)
+        if args.command == "logs":
+            return _logs(service, args)
+        handler = {
+            "status": _status, "ps": _ps, "start": _start_stop, "stop": _start_stop,
+            "suspend": _suspend, "resize": _resize, "prewarm": _prewarm, "df": _df, "prune": _prune,
+        }[args.command]
+        return asyncio.run(handler(service, args))
+    finally:
+        service.shutdown()
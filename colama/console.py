@@ -0,0 +1,15 @@
+"""
+Shared rich console, created on first use to keep startup fast
+"""
+import functools
+
+@functools.lru_cache(maxsize=None)
+def get_console():
+    from rich.console import Console
+    return Console()
+
+class _LazyConsole:
+    def __getattr__(self, name):
+        return getattr(get_console(), name)
+
+console = _LazyConsole()
@@ -1,12 +1,15 @@
 import sys
-import asyncio
-from PySide6.QtWidgets import QApplication
-import qasync
-from colama.ui.menu_bar import ColamaMenuBar
 
-def main():
-    """Main entry point for the Colama application."""
-    app = QApplication(sys.argv)
+def run_tray(args=None) -> int:
+    """Launch the menu bar app; Qt is only imported here."""
+    import asyncio
+    from PySide6.QtWidgets import QApplication
+    import qasync
+    from colama.cli import instrumentation_enabled
+    from colama.services.metrics import LoopLagMonitor, metrics
+    from colama.ui.menu_bar import ColamaMenuBar
+
+    app = QApplication(sys.argv[:1])
     app.setQuitOnLastWindowClosed(False)
     
     # Create event loop
@@ -14,13 +17,26 @@ def main():
     asyncio.set_event_loop(loop)
     
     # Create menu bar
-    tray = ColamaMenuBar()
+    tray = ColamaMenuBar(profile=getattr(args, "profile", None),
+                         endpoints=getattr(args, "endpoint", []),
+                         idle_suspend=getattr(args, "idle_suspend", None))
     
     # Run initial updates
     loop.create_task(tray.initial_update())
     
+    # Event-loop lag is what makes the tray feel sluggish; only measured when
+    # someone reads the metrics, so an idle tray does not wake up for it
+    if instrumentation_enabled(args):
+        LoopLagMonitor(metrics).start(loop)
+    
     with loop:
         loop.run_forever()
+    return 0
+
+def main():
+    """Main entry point for the Colama application."""
+    from colama.cli import run
+    sys.exit(run(sys.argv[1:]))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,221 @@
+"""
+Streaming, cancellable control of the Colima CLI
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, cast
+import asyncio
+import json
+import os
+import re
+import signal
+import time
+from .metrics import metrics
+
+# Startup phases in the order Colima goes through them
+PHASES = [
+    ("vm", "Booting VM"),
+    ("runtime", "Provisioning runtime"),
+    ("socket", "Waiting for Docker socket"),
+]
+PHASE_LABELS = dict(PHASES)
+
+_MESSAGE = re.compile(r'msg="([^"]*)"|^\w+\[\d+\]\s+(.*?)\s{2,}|^\w+\[\d+\]\s+(.*)$')
+
+def parse_message(line: str) -> str:
+    """Extract the human message from a logrus-formatted Colima line."""
+    match = _MESSAGE.search(line.strip())
+    if not match:
+        return line.strip()
+    return next(group for group in match.groups() if group is not None).strip()
+
+def detect_phase(line: str) -> Optional[str]:
+    """Map a line of `colima start` output to the phase it belongs to."""
+    lower = line.lower()
+    if "context=vm" in lower:
+        return "vm"
+    if re.search(r"context=(docker|containerd|incus)", lower):
+        message = parse_message(lower)
+        if message.startswith(("starting", "waiting")):
+            return "socket"
+        return "runtime"
+    return None
+
+DEFAULT_PROFILE = "default"
+GIB = 1024 ** 3
+
+def colima_home() -> str:
+    """Directory holding Colima's per-profile state."""
+    return os.environ.get("COLIMA_HOME", os.path.expanduser("~/.colima"))
+
+def profile_socket(profile: str) -> str:
+    """Path of the Docker socket Colima exposes for a profile."""
+    return os.path.join(colima_home(), profile, "docker.sock")
+
+def profile_args(profile: Optional[str]) -> List[str]:
+    """Extra `colima` arguments selecting a non-default profile."""
+    if profile and profile != DEFAULT_PROFILE:
+        return ["--profile", profile]
+    return []
+
+@dataclass(frozen=True)
+class VMResources:
+    """VM size as `colima start` takes it: CPU count, memory and disk in GiB."""
+    cpus: int
+    memory: int
+    disk: int
+
+    def args(self) -> List[str]:
+        return ["--cpu", str(self.cpus), "--memory", str(self.memory), "--disk", str(self.disk)]
+
+    def __str__(self) -> str:
+        cpus = "1 CPU" if self.cpus == 1 else f"{self.cpus} CPUs"
+        return f"{cpus}, {self.memory} GiB memory, {self.disk} GiB disk"
+
+@dataclass
+class ColimaProfile:
+    name: str
+    status: str
+    arch: str = ""
+    cpus: int = 0
+    memory: int = 0
+    disk: int = 0
+    runtime: str = ""
+
+    @property
+    def is_running(self) -> bool:
+        return self.status.lower() == "running"
+
+    @property
+    def socket_path(self) -> str:
+        return profile_socket(self.name)
+
+    @property
+    def resources(self) -> VMResources:
+        # `colima list` reports memory and disk in bytes
+        return VMResources(self.cpus, round(self.memory / GIB), round(self.disk / GIB))
+
+@metrics.instrument("colima.list")
+async def list_profiles() -> List[ColimaProfile]:
+    """Discover Colima profiles from `colima list --json` (one object per line)."""
+    process = await asyncio.create_subprocess_exec(
+        "colima", "list", "--json",
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, _ = await process.communicate()
+    if process.returncode != 0:
+        return []
+    profiles = []
+    for line in stdout.decode(errors="replace").splitlines():
+        if not line.strip():
+            continue
+        data = json.loads(line)
+        profiles.append(ColimaProfile(
+            name=data.get("name", DEFAULT_PROFILE),
+            status=data.get("status", ""),
+            arch=data.get("arch", ""),
+            cpus=data.get("cpus", 0),
+            memory=data.get("memory", 0),
+            disk=data.get("disk", 0),
+            runtime=data.get("runtime", ""),
+        ))
+    return profiles
+
+@dataclass
+class StartupReport:
+    """Per-phase timings of one Colima start."""
+    phases: Dict[str, float] = field(default_factory=dict)
+    total: float = 0.0
+    returncode: Optional[int] = None
+    cancelled: bool = False
+    output: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        parts = [f"{PHASE_LABELS.get(name, name)} {seconds:.1f}s"
+                 for name, seconds in self.phases.items()]
+        parts.append(f"total {self.total:.1f}s")
+        return " · ".join(parts)
+
+@dataclass
+class ShutdownReport:
+    """How one Colima stop went: each container's outcome, then the VM."""
+    containers: Dict[str, str] = field(default_factory=dict)  # ID -> stopped, killed or failed
+    total: float = 0.0
+    returncode: Optional[int] = None
+
+    def summary(self) -> str:
+        outcomes = list(self.containers.values())
+        parts = [f"{outcomes.count(outcome)} {outcome}" for outcome in ("stopped", "killed", "failed")
+                 if outcome in outcomes]
+        parts.append(f"total {self.total:.1f}s")
+        return " · ".join(parts)
+
+class ColimaCommand:
+    """Runs one `colima` invocation, streaming its output line by line."""
+
+    # How long to wait after SIGTERM before killing a cancelled command
+    TERMINATE_GRACE = 10.0
+    # Lines of output kept for error reporting
+    OUTPUT_LINES = 50
+
+    def __init__(self, *args: str):
+        self.args = args
+        self.report = StartupReport()
+        self._process: Optional[asyncio.subprocess.Process] = None
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def run(self, on_phase: Optional[Callable[[str, str], None]] = None) -> StartupReport:
+        """Run to completion, calling on_phase(phase, message) as phases change."""
+        started = time.monotonic()
+        phase, phase_started = None, started
+        process = self._process = await asyncio.create_subprocess_exec(
+            "colima", *self.args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            # Own process group, so cancelling also reaches limactl and friends
+            start_new_session=True,
+        )
+        # Always set: stdout is a pipe
+        async for raw in cast(asyncio.StreamReader, process.stdout):
+            line = raw.decode(errors="replace").rstrip()
+            if not line:
+                continue
+            self.report.output = (self.report.output + [line])[-self.OUTPUT_LINES:]
+            message = parse_message(line)
+            next_phase = detect_phase(line)
+            if next_phase and next_phase != phase:
+                now = time.monotonic()
+                if phase:
+                    self.report.phases[phase] = self.report.phases.get(phase, 0.0) + now - phase_started
+                phase, phase_started = next_phase, now
+            if on_phase and phase:
+                on_phase(phase, message)
+
+        self.report.returncode = await process.wait()
+        now = time.monotonic()
+        if phase:
+            self.report.phases[phase] = self.report.phases.get(phase, 0.0) + now - phase_started
+        self.report.total = now - started
+        return self.report
+
+    async def cancel(self) -> None:
+        """Terminate the command, escalating to kill if it does not exit."""
+        process = self._process
+        if process is None or process.returncode is not None:
+            return
+        self.report.cancelled = True
+        self._signal(process, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), self.TERMINATE_GRACE)
+        except asyncio.TimeoutError:
+            self._signal(process, signal.SIGKILL)
+
+    @staticmethod
+    def _signal(process: asyncio.subprocess.Process, sig: int) -> None:
+        try:
+            os.killpg(process.pid, sig)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,75 @@
+"""
+Compose projects and their service dependency order, from container labels
+"""
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Set
+
+if TYPE_CHECKING:
+    from .docker_service import ContainerInfo
+
+PROJECT_LABEL = "com.docker.compose.project"
+SERVICE_LABEL = "com.docker.compose.service"
+# "db:service_healthy:false,cache:service_started:false" (service:condition[:restart])
+DEPENDS_ON_LABEL = "com.docker.compose.depends_on"
+
+def parse_depends_on(value: str) -> Dict[str, str]:
+    """Map each dependency's service name to its condition."""
+    depends: Dict[str, str] = {}
+    for entry in value.split(","):
+        service, _, rest = entry.strip().partition(":")
+        if service:
+            depends[service] = rest.split(":", 1)[0] or "service_started"
+    return depends
+
+@dataclass
+class Project:
+    """The containers of one project, by service, and what each service waits for."""
+
+    name: str
+    services: Dict[str, List["ContainerInfo"]] = field(default_factory=dict)
+    depends_on: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+    @property
+    def containers(self) -> List["ContainerInfo"]:
+        return [c for containers in self.services.values() for c in containers]
+
+    def levels(self) -> List[List[str]]:
+        """Services in start order: each level only depends on earlier levels.
+
+        Services within a level are independent and can start together.
+        Dependencies on services that have no container are ignored, and
+        services caught in a cycle end up together in a final level.
+        """
+        waiting = {service: set(depends) & self.services.keys()
+                   for service, depends in self.depends_on.items()}
+        levels: List[List[str]] = []
+        done: Set[str] = set()
+        while waiting:
+            level = sorted(service for service, depends in waiting.items() if depends <= done)
+            if not level:
+                levels.append(sorted(waiting))
+                break
+            levels.append(level)
+            done.update(level)
+            for service in level:
+                del waiting[service]
+        return levels
+
+def index_projects(containers: List["ContainerInfo"]) -> Dict[str, Project]:
+    """Group containers into projects in one pass over the listing.
+
+    Containers grouped with a colama.group label rather than by Compose form
+    a project too, with one service per container and no dependencies.
+    """
+    projects: Dict[str, Project] = {}
+    for container in containers:
+        if not container.group:
+            continue
+        project = projects.get(container.group)
+        if project is None:
+            project = projects[container.group] = Project(container.group)
+        service = container.service or container.name
+        project.services.setdefault(service, []).append(container)
+        if service not in project.depends_on or container.depends_on:
+            project.depends_on[service] = parse_depends_on(container.depends_on)
+    return projects
@@ -0,0 +1,83 @@
+"""
+Disk usage from the daemon's system/df endpoint, and what pruning would free
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List
+import time
+
+# Prune targets, in the order they are offered, with their labels
+PRUNE_TARGETS = {
+    "dangling-images": "Dangling images",
+    "unused-images": "Unused images",
+    "volumes": "Unused volumes",
+    "build-cache": "Build cache",
+}
+
+@dataclass
+class UsageItem:
+    kind: str  # image, container, volume or build-cache
+    name: str
+    size: int
+    in_use: bool
+
+@dataclass
+class DiskUsage:
+    """A parsed system/df response."""
+
+    items: List[UsageItem]
+    totals: Dict[str, int]  # kind -> bytes on disk
+    reclaimable: Dict[str, int]  # prune target -> estimated bytes freed
+    fetched_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_df(cls, df: dict) -> "DiskUsage":
+        items: List[UsageItem] = []
+        reclaimable = dict.fromkeys(PRUNE_TARGETS, 0)
+
+        for image in df.get("Images") or []:
+            tags = [t for t in image.get("RepoTags") or [] if t != "<none>:<none>"]
+            size = image.get("Size", 0)
+            in_use = image.get("Containers", 0) != 0  # -1 means not computed: assume used
+            items.append(UsageItem("image", tags[0] if tags else image.get("Id", "")[7:19], size, in_use))
+            if not in_use:
+                # Layers shared with other images stay on disk
+                unique = size - max(image.get("SharedSize", 0), 0)
+                reclaimable["unused-images"] += unique
+                if not tags:
+                    reclaimable["dangling-images"] += unique
+
+        for container in df.get("Containers") or []:
+            names = container.get("Names") or [""]
+            items.append(UsageItem("container", names[0].lstrip("/"), container.get("SizeRw", 0),
+                                   container.get("State") == "running"))
+
+        for volume in df.get("Volumes") or []:
+            usage = volume.get("UsageData") or {}
+            size = max(usage.get("Size", 0), 0)
+            in_use = usage.get("RefCount", 0) != 0
+            items.append(UsageItem("volume", volume.get("Name", ""), size, in_use))
+            if not in_use:
+                reclaimable["volumes"] += size
+
+        for record in df.get("BuildCache") or []:
+            size = record.get("Size", 0)
+            in_use = bool(record.get("InUse"))
+            items.append(UsageItem("build-cache", record.get("Description") or record.get("ID", ""),
+                                   size, in_use))
+            if not in_use and not record.get("Shared"):
+                reclaimable["build-cache"] += size
+
+        totals = {kind: sum(i.size for i in items if i.kind == kind)
+                  for kind in ("image", "container", "volume", "build-cache")}
+        if "LayersSize" in df:
+            # Image sizes double count shared layers; this is the real footprint
+            totals["image"] = df["LayersSize"]
+        return cls(items=items, totals=totals, reclaimable=reclaimable)
+
+    def top(self, count: int = 10) -> List[UsageItem]:
+        """The largest consumers across all kinds."""
+        return sorted(self.items, key=lambda i: i.size, reverse=True)[:count]
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
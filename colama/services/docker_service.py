@@ -1,11 +1,24 @@
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 import asyncio
-import docker
-import subprocess
-from rich.console import Console
+import functools
+import math
+import threading
+import time
+from .colima import ColimaCommand, ShutdownReport, StartupReport, VMResources, profile_args, profile_socket
+from .compose import DEPENDS_ON_LABEL, PROJECT_LABEL, SERVICE_LABEL, Project, index_projects
+from .disk_usage import PRUNE_TARGETS, DiskUsage
+from .health import DaemonHealth, ping_socket
+from .incidents import Incident, IncidentTracker, parse_health
+from .logs import LogTail
+from .metrics import metrics
+from .prewarm import ImagePull, PullProgress, configured_images, split_digest
+from .stats import ContainerStats, StatsCollector
+from ..console import console
 
-console = Console()
+if TYPE_CHECKING:
+    import docker
 
 @dataclass
 class ContainerInfo:
@@ -14,11 +27,123 @@ class ContainerInfo:
     image: str
     status: str
     is_running: bool
+    group: str = ""  # Compose project (or colama.group label), "" if none
+    health: str = ""  # healthy, unhealthy, starting, or "" without a healthcheck
+    flapping: bool = False  # in a restart loop
+    service: str = ""  # Compose service name
+    depends_on: str = ""  # raw Compose depends_on label, see compose.parse_depends_on
+
+# Container event actions that can change what the container listing shows
+CONTAINER_STATE_ACTIONS = {
+    "create", "start", "restart", "stop", "die", "kill", "oom",
+    "pause", "unpause", "rename", "update", "health_status",
+}
+
+# Labels that put a container in a group, first match wins
+GROUP_LABELS = (PROJECT_LABEL, "colama.group")
 
 class DockerService:
-    def __init__(self):
-        self.client: Optional[docker.DockerClient] = None
+    # Backoff between event stream reconnect attempts while the daemon is away
+    EVENTS_RETRY_MIN = 1.0
+    EVENTS_RETRY_MAX = 30.0
+    # Upper bound on any single daemon request, in seconds
+    CALL_TIMEOUT = 10.0
+    # Grace period given to a container before it is killed on stop
+    STOP_TIMEOUT = 10
+    # Shared deadline for stopping every container before the VM goes down
+    SHUTDOWN_TIMEOUT = 10.0
+    # How long a stop call may overrun that deadline before an explicit kill
+    KILL_GRACE = 5.0
+    # Concurrent stop calls while shutting down (one thread and connection each)
+    MAX_SHUTDOWN_WORKERS = 64
+    # Pre-warm image pulls that may run at once, and how long one may take
+    MAX_CONCURRENT_PULLS = 3
+    PULL_TIMEOUT = 1800.0
+    # Pull progress reaches listeners at most this often, in seconds
+    PULL_PROGRESS_INTERVAL = 0.25
+    MAX_WORKERS = 4
+    # Container start/stop/restart calls that may run at once
+    MAX_CONCURRENT_ACTIONS = 16
+    # Cap on concurrent stats streams (one connection each)
+    MAX_STATS_STREAMS = 64
+    # system/df and prunes walk every layer and volume, so they get far longer
+    SLOW_CALL_TIMEOUT = 300.0
+    # Disk usage older than this is refetched when asked for
+    DISK_USAGE_MAX_AGE = 300.0
+    # How long a project start waits on a service_healthy dependency
+    HEALTHY_TIMEOUT = 120.0
+    # Log lines kept per followed container
+    LOG_LINES = 5000
+    # Followed logs can sit silent for a long time; stop() closes them early
+    LOG_READ_TIMEOUT = 24 * 3600.0
+
+    def __init__(self, profile: Optional[str] = None, host: Optional[str] = None):
+        """Bind to a Colima profile's socket, a daemon URL (unix://, tcp://, ssh://),
+        or to the environment's daemon if neither is given."""
+        self.profile = profile
+        self.host = host
+        self.client: Optional["docker.DockerClient"] = None
+        self._client_lock = threading.Lock()
         self._ensure_path()
+
+        # Every blocking docker-py call runs here, never on the UI event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.MAX_WORKERS, thread_name_prefix="colama-docker"
+        )
+        # Slow container actions get their own pool so they never starve pings
+        self._action_executor = ThreadPoolExecutor(
+            max_workers=self.MAX_CONCURRENT_ACTIONS, thread_name_prefix="colama-action"
+        )
+
+        # Liveness cache and backoff; concurrent checks share one in-flight ping
+        socket_path: Optional[str]
+        if host is not None:
+            # "" rather than None: a remote host has no socket to watch
+            socket_path = host[len("unix://"):] if host.startswith("unix://") else ""
+        else:
+            socket_path = profile_socket(profile) if profile else None
+        self.health = DaemonHealth(socket_path=socket_path)
+        self._ping_future: Optional[asyncio.Future] = None
+
+        # Live resource stats, only collected once enable_stats() is called
+        self.stats = StatsCollector(
+            lambda: self._connect(self.MAX_STATS_STREAMS),
+            max_streams=self.MAX_STATS_STREAMS,
+        )
+        self._stats_enabled = False
+
+        # In-memory container table kept current by the events stream
+        self._containers: Dict[str, ContainerInfo] = {}
+        self._containers_lock = threading.Lock()
+        self._synced = False
+        self._listeners: List[Callable[[], None]] = []
+
+        # Restart loops and failing healthchecks, from die/health_status events
+        self.incidents = IncidentTracker()
+        self._incident_listeners: List[Callable[[Incident], None]] = []
+
+        # Image ID -> tags, shared by all listings and dropped on image events
+        self._images: Optional[Dict[str, List[str]]] = None
+        self._images_lock = threading.Lock()
+
+        self._events_thread: Optional[threading.Thread] = None
+        self._events_stream: Optional[Any] = None  # docker-py CancellableStream
+        self._events_stop = threading.Event()
+        self._events_wakeup = threading.Event()
+
+        # Last system/df result; concurrent refreshes share one request
+        self._disk_usage: Optional[DiskUsage] = None
+        self._df_future: Optional[asyncio.Future] = None
+
+        # The in-flight `colima start`, if any, and timings of the last one
+        self._colima_start: Optional[ColimaCommand] = None
+        self.last_start_report: Optional[StartupReport] = None
+        self.last_stop_report: Optional[ShutdownReport] = None
+        
+        # Images pulled after every successful start, see prewarm.configured_images
+        self.prewarm_task: Optional[asyncio.Task] = None
+        self.pull_progress: Optional[PullProgress] = None
+        self._pull_listeners: List[Callable[[PullProgress], None]] = []
     
     def _ensure_path(self) -> None:
         """Ensure the Docker path is properly set up."""
@@ -31,79 +156,534 @@ class DockerService:
         except FileNotFoundError:
             pass
 
-    async def start_colima(self) -> bool:
-        """Start Colima and Docker daemon."""
+    async def _call(self, func: Callable[..., Any], *args: Any, name: str,
+                    timeout: Optional[float] = None,
+                    executor: Optional[ThreadPoolExecutor] = None) -> Any:
+        """Run a blocking docker-py call on the executor with a timeout.
+
+        Latency (including time queued for a worker) and failures are
+        recorded in the metrics registry under `docker.<name>`.
+        """
+        loop = asyncio.get_running_loop()
+        with metrics.timed(f"docker.{name}"):
+            future = loop.run_in_executor(executor or self._executor, functools.partial(func, *args))
+            return await asyncio.wait_for(future, timeout or self.CALL_TIMEOUT)
+
+    def _connect(self, max_pool_size: Optional[int] = None,
+                 timeout: Optional[float] = None) -> "docker.DockerClient":
+        """Create a client whose HTTP requests are bounded by CALL_TIMEOUT (or `timeout`)."""
+        import docker
+        kwargs = dict(
+            timeout=int(timeout or self.CALL_TIMEOUT),
+            max_pool_size=max_pool_size or self.MAX_WORKERS + self.MAX_CONCURRENT_ACTIONS,
+        )
+        if self.host:
+            # ssh:// goes through the system ssh client, so ~/.ssh/config applies
+            return docker.DockerClient(base_url=self.host, use_ssh_client=self.host.startswith("ssh://"),
+                                       **kwargs)
+        if self.profile:
+            return docker.DockerClient(base_url=f"unix://{profile_socket(self.profile)}", **kwargs)
+        return docker.from_env(**kwargs)
+
+    def _get_client(self) -> "docker.DockerClient":
+        """Return the shared client, connecting on first use (blocking)."""
+        with self._client_lock:
+            if self.client is None:
+                self.client = self._connect()
+            return self.client
+
+    def _drop_client(self) -> None:
+        """Close the shared client; the next call reconnects through _connect()."""
+        with self._client_lock:
+            client, self.client = self.client, None
+        if client is not None:
+            client.close()
+
+    async def start_colima(self, on_phase: Optional[Callable[[str, str], None]] = None,
+                           resources: Optional[VMResources] = None) -> bool:
+        """Start Colima and Docker daemon.
+
+        Output is streamed as it arrives; `on_phase(phase, message)` is called
+        for every line once a startup phase is known. Per-phase timings end
+        up in `last_start_report`. `resources` resizes the VM as it boots.
+        """
+        command = ColimaCommand("start", *profile_args(self.profile),
+                                *(resources.args() if resources else ()))
+        self._colima_start = command
         try:
-            process = await asyncio.create_subprocess_shell(
-                "colima start",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            await process.communicate()
-            if process.returncode == 0:
-                self.client = docker.from_env()
+            report = await command.run(on_phase)
+            self.last_start_report = report
+            metrics.observe("colima.start", report.total, error=report.returncode != 0)
+            console.print(f"Colima start: {report.summary()}")
+            if report.returncode == 0:
+                self.health.reset()
+                self._events_wakeup.set()
+                self._start_prewarm()
                 return True
+            if not report.cancelled:
+                console.print("[red]Colima start failed:[/red]\n" + "\n".join(report.output[-10:]))
             return False
         except Exception as e:
             console.print(f"[red]Error starting Colima: {e}[/red]")
             return False
+        finally:
+            self._colima_start = None
+
+    @property
+    def is_colima_starting(self) -> bool:
+        return self._colima_start is not None and self._colima_start.running
+
+    async def cancel_colima_start(self) -> bool:
+        """Abort an in-flight `colima start`."""
+        command = self._colima_start
+        if command is None or not command.running:
+            return False
+        await command.cancel()
+        return True
+
+    @metrics.instrument("colima.stop")
+    async def stop_colima(self, progress: Optional[Callable[[str], None]] = None,
+                          timeout: Optional[float] = None) -> bool:
+        """Stop Colima and Docker daemon.
 
-    async def stop_colima(self) -> bool:
-        """Stop Colima and Docker daemon."""
+        Running containers are stopped first, all at once (see
+        stop_all_containers), so the VM no longer stops them one by one.
+        `progress(message)` is called as the shutdown moves on; the outcome
+        ends up in `last_stop_report`.
+        """
+        started = time.monotonic()
+        report = self.last_stop_report = ShutdownReport()
         try:
-            process = await asyncio.create_subprocess_shell(
-                "colima stop",
+            if await self.is_docker_running():
+                def stopped(done: int, total: int) -> None:
+                    if progress:
+                        progress(f"Stopping containers ({done}/{total})")
+                try:
+                    report.containers = await self.stop_all_containers(timeout, stopped)
+                except Exception as e:
+                    # The VM stop below still takes the containers down
+                    console.print(f"[red]Error stopping containers: {e}[/red]")
+            if progress:
+                progress("Stopping VM")
+            process = await asyncio.create_subprocess_exec(
+                "colima", "stop", *profile_args(self.profile),
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
             await process.communicate()
-            if self.client:
-                self.client.close()
-                self.client = None
+            # The daemon behind its pooled connections is gone
+            self._drop_client()
+            self.health.reset()
+            report.returncode = process.returncode
+            report.total = time.monotonic() - started
+            console.print(f"Colima stop: {report.summary()}")
             return process.returncode == 0
         except Exception as e:
             console.print(f"[red]Error stopping Colima: {e}[/red]")
             return False
 
-    def is_docker_running(self) -> bool:
+    async def stop_all_containers(self, timeout: Optional[float] = None,
+                                  progress: Optional[Callable[[int, int], None]] = None
+                                  ) -> Dict[str, str]:
+        """Stop every running container concurrently under one shared deadline.
+
+        Each stop gets what is left of `timeout` (SHUTDOWN_TIMEOUT) as its
+        grace period, after which the daemon kills the container; a stop call
+        still hanging KILL_GRACE seconds later is followed by an explicit
+        kill. Total time is bounded by the deadline, not the container count.
+        Returns each container's outcome: "stopped", "killed" or "failed".
+        """
+        running = [c.container_id for c in await self.get_containers() if c.is_running]
+        if not running:
+            return {}
+        timeout = self.SHUTDOWN_TIMEOUT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        total = len(running)
+        done = 0
+
+        # Own threads and connections: every stop blocks for up to the deadline
+        workers = min(total, self.MAX_SHUTDOWN_WORKERS)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="colama-shutdown")
+        loop = asyncio.get_running_loop()
+        client = await loop.run_in_executor(executor, functools.partial(self._connect, workers))
+
+        def stop(container_id: str) -> None:
+            # Measured when the call runs, so queued stops share the same deadline
+            client.api.stop(container_id, timeout=max(0, math.ceil(deadline - time.monotonic())))
+
+        async def run(container_id: str) -> str:
+            nonlocal done
+            try:
+                await self._call(stop, container_id, name="shutdown_stop",
+                                 timeout=max(0.0, deadline - time.monotonic()) + self.KILL_GRACE,
+                                 executor=executor)
+                outcome = "stopped"
+            except asyncio.TimeoutError:
+                outcome = await self._kill(container_id)
+            except Exception as e:
+                if getattr(e, "status_code", None) == 404:
+                    outcome = "stopped"  # removed on stop (--rm)
+                else:
+                    console.print(f"[red]Error stopping container {container_id}: {e}[/red]")
+                    outcome = await self._kill(container_id)
+            done += 1
+            if progress:
+                progress(done, total)
+            return outcome
+
+        try:
+            results = await asyncio.gather(*(run(container_id) for container_id in running))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            client.close()
+        return dict(zip(running, results))
+
+    async def _kill(self, container_id: str) -> str:
+        try:
+            await self._call(
+                lambda: self._get_client().api.kill(container_id),
+                name="kill_container",
+                executor=self._action_executor,
+            )
+            return "killed"
+        except Exception as e:
+            console.print(f"[red]Error killing container {container_id}: {e}[/red]")
+            return "failed"
+
+    async def is_docker_running(self) -> bool:
         """Check if Docker daemon is running."""
+        cached = self.health.cached()
+        if cached is not None:
+            return cached
+        if not self.health.should_probe():
+            return False
+
+        if self._ping_future is None:
+            self._ping_future = asyncio.ensure_future(self._probe())
+        future = self._ping_future
         try:
-            if not self.client:
-                self.client = docker.from_env()
-            self.client.ping()
+            return await asyncio.shield(future)
+        finally:
+            if self._ping_future is future and future.done():
+                self._ping_future = None
+
+    async def _probe(self) -> bool:
+        try:
+            alive = await self._call(self._ping, name="ping")
+        except asyncio.TimeoutError:
+            alive = False
+        if not alive:
+            metrics.error("docker.ping")
+        if self.health.record(alive):
+            # Daemon is back: let the events thread reconnect now
+            self._events_wakeup.set()
+        return alive
+
+    def _ping(self) -> bool:
+        try:
+            if self.client is None and self.health.socket_path:
+                # Plain socket probe: docker-py is only imported once it is needed
+                return ping_socket(self.health.socket_path, self.CALL_TIMEOUT)
+            # One long-lived client; its pool reconnects once the socket is back
+            self._get_client().ping()
             return True
         except:
-            self.client = None
             return False
 
-    def get_containers(self) -> List[ContainerInfo]:
+    def snapshot(self) -> Optional[List[ContainerInfo]]:
+        """Return the event-maintained container table, or None if it is not synced."""
+        with self._containers_lock:
+            return list(self._containers.values()) if self._synced else None
+
+    async def get_containers(self) -> List[ContainerInfo]:
         """Get all containers with their status."""
-        if not self.is_docker_running():
+        containers = self.snapshot()
+        if containers is not None:
+            return containers
+
+        if not await self.is_docker_running():
             return []
         
-        containers = []
-        try:
-            for container in self.client.containers.list(all=True):
-                containers.append(ContainerInfo(
-                    container_id=container.id[:12],
-                    name=container.name,
-                    image=container.image.tags[0] if container.image.tags else "none",
-                    status=container.status,
-                    is_running=container.status == "running"
-                ))
+        try:
+            return await self._call(lambda: self._list_containers(self._get_client()),
+                                    name="get_containers")
         except Exception as e:
             console.print(f"[red]Error getting containers: {e}[/red]")
-        
-        return containers
+            return []
+
+    def _container_info(self, client: "docker.DockerClient", summary: dict) -> ContainerInfo:
+        """Build a ContainerInfo from a containers/json entry."""
+        image = summary.get("Image", "")
+        if not image or image.startswith("sha256:"):
+            # Created from a bare image ID: fall back to the cached tags
+            tags = self._image_tags(client).get(summary.get("ImageID", ""))
+            image = tags[0] if tags else "none"
+        names = summary.get("Names") or [""]
+        labels = summary.get("Labels") or {}
+        return ContainerInfo(
+            container_id=summary["Id"][:12],
+            name=names[0].lstrip("/"),
+            image=image,
+            status=summary.get("State", ""),
+            is_running=summary.get("State") == "running",
+            group=next((labels[label] for label in GROUP_LABELS if labels.get(label)), ""),
+            health=parse_health(summary.get("Status", "")),
+            flapping=self.incidents.is_flapping(summary["Id"][:12]),
+            service=labels.get(SERVICE_LABEL, ""),
+            depends_on=labels.get(DEPENDS_ON_LABEL, ""),
+        )
+
+    def _list_containers(self, client: "docker.DockerClient",
+                         filters: Optional[dict] = None) -> List[ContainerInfo]:
+        """List containers with a single containers/json request."""
+        with metrics.timed("docker.list_containers"):
+            return [
+                self._container_info(client, summary)
+                for summary in client.api.containers(all=True, filters=filters)
+            ]
+
+    def _image_tags(self, client: "docker.DockerClient") -> Dict[str, List[str]]:
+        """Return the image ID -> tags cache, loading it with one images/json request."""
+        with self._images_lock:
+            if self._images is None:
+                with metrics.timed("docker.list_images"):
+                    self._images = {
+                        image["Id"]: [t for t in image.get("RepoTags") or [] if t != "<none>:<none>"]
+                        for image in client.api.images()
+                    }
+            return self._images
+
+    def _invalidate_images(self) -> None:
+        with self._images_lock:
+            self._images = None
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Register a callback fired whenever the container table changes.
+
+        Callbacks run on the events thread, so they must be thread-safe.
+        """
+        self._listeners.append(callback)
+
+    def enable_stats(self) -> None:
+        """Start streaming stats for every running container, following state changes."""
+        self._stats_enabled = True
+        self._sync_stats()
+
+    def get_stats(self, container_id: str) -> Optional[ContainerStats]:
+        """Return the rolling stats history for a container, if collected."""
+        return self.stats.get(container_id)
+
+    def aggregate_cpu(self, samples: int = 30) -> Optional[float]:
+        """CPU of all running containers together (percent of one core), averaged
+        over the last `samples` stats samples; None unless stats are enabled."""
+        if not self._stats_enabled:
+            return None
+        with self._containers_lock:
+            running = [c.container_id for c in self._containers.values() if c.is_running]
+        total = 0.0
+        for container_id in running:
+            stats = self.stats.get(container_id)
+            values = stats.cpu_percent.values()[-samples:] if stats else []
+            if values:
+                total += sum(values) / len(values)
+        return total
+
+    def aggregate_memory(self) -> Optional[float]:
+        """Latest memory use of all running containers together, in bytes;
+        None unless stats are enabled."""
+        if not self._stats_enabled:
+            return None
+        with self._containers_lock:
+            running = [c.container_id for c in self._containers.values() if c.is_running]
+        stats = (self.stats.get(container_id) for container_id in running)
+        return sum(s.memory.last() or 0.0 for s in stats if s is not None)
+
+    def disable_stats(self) -> None:
+        """Stop all stats streams until enable_stats() is called again."""
+        self._stats_enabled = False
+        self.stats.stop_all()
+
+    def _sync_stats(self) -> None:
+        if not self._stats_enabled or self._events_stop.is_set():
+            return
+        with self._containers_lock:
+            running = [c.container_id for c in self._containers.values() if c.is_running]
+            known = list(self._containers)
+        self.stats.sync(running, known)
+
+    def add_incident_listener(self, callback: Callable[[Incident], None]) -> None:
+        """Call `callback(incident)` (from the events thread) when a container
+        starts restart-looping or turns unhealthy; already throttled."""
+        self._incident_listeners.append(callback)
+
+    def _report(self, incident: Optional[Incident], event: dict) -> None:
+        if incident is None:
+            return
+        metrics.increment(f"container_incidents_{incident.kind}")
+        incident.name = (event.get("Actor") or {}).get("Attributes", {}).get("name", "")
+        for callback in self._incident_listeners:
+            try:
+                callback(incident)
+            except Exception as e:
+                console.print(f"[red]Error in incident listener: {e}[/red]")
+
+    def _notify_listeners(self) -> None:
+        self._sync_stats()
+        for callback in self._listeners:
+            try:
+                callback()
+            except Exception as e:
+                console.print(f"[red]Error in container listener: {e}[/red]")
+
+    def start_watching(self) -> None:
+        """Start following the daemon's events stream in the background."""
+        if self._events_thread and self._events_thread.is_alive():
+            return
+        self._events_stop.clear()
+        self._events_thread = threading.Thread(
+            target=self._watch_events, name="colama-docker-events", daemon=True
+        )
+        self._events_thread.start()
+
+    def stop_watching(self) -> None:
+        """Stop following the events stream."""
+        self._events_stop.set()
+        self._events_wakeup.set()
+        self.stats.stop_all()
+        stream = self._events_stream
+        if stream is not None:
+            stream.close()
+
+    def shutdown(self) -> None:
+        """Release the executor without waiting on in-flight daemon calls."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._action_executor.shutdown(wait=False, cancel_futures=True)
+        if self.client:
+            self.client.close()
+            self.client = None
+
+    async def resync(self) -> bool:
+        """Reconcile the container table with a full listing from the daemon."""
+        if not await self.is_docker_running():
+            return False
+        try:
+            containers = await self._call(lambda: self._list_containers(self._get_client()),
+                                          name="resync")
+            self._replace_containers(containers)
+            return True
+        except Exception as e:
+            console.print(f"[red]Error resyncing containers: {e}[/red]")
+            return False
+
+    def _replace_containers(self, containers: List[ContainerInfo]) -> None:
+        table = {c.container_id: c for c in containers}
+        self.incidents.retain(table)
+        with self._containers_lock:
+            changed = not self._synced or table != self._containers
+            self._containers = table
+            self._synced = True
+        if changed:
+            self._notify_listeners()
+
+    def _watch_events(self) -> None:
+        """Follow /events, resyncing the table on every (re)connect."""
+        delay = self.EVENTS_RETRY_MIN
+        while not self._events_stop.is_set():
+            client = None
+            try:
+                client = self._connect()
+                # Subscribe before listing so nothing falls in the gap between them
+                stream = self._events_stream = client.events(
+                    decode=True, filters={"type": ["container", "image"]}
+                )
+                if self._events_stop.is_set():
+                    # stop_watching() ran while we were connecting
+                    stream.close()
+                    break
+                self._invalidate_images()
+                self._replace_containers(self._list_containers(client))
+                delay = self.EVENTS_RETRY_MIN
+                for event in stream:
+                    metrics.increment("docker_events")
+                    with metrics.timed("docker.handle_event"):
+                        self._handle_event(client, event)
+            except Exception:
+                metrics.increment("docker_event_stream_errors")
+            finally:
+                self._events_stream = None
+                if client is not None:
+                    client.close()
+
+            if self._synced:
+                # Stream dropped: the table can no longer be trusted
+                with self._containers_lock:
+                    self._containers = {}
+                    self._synced = False
+                self._notify_listeners()
+
+            self._events_wakeup.wait(delay)
+            self._events_wakeup.clear()
+            delay = min(delay * 2, self.EVENTS_RETRY_MAX)
+
+    def _handle_event(self, client: "docker.DockerClient", event: dict) -> None:
+        """Apply a single container or image event to the table."""
+        if event.get("Type") == "image":
+            self._invalidate_images()
+            return
+
+        action = event.get("Action", event.get("status", ""))
+        container_id = event.get("id", "")[:12]
+        if not container_id:
+            return
+
+        if action == "die":
+            self._report(self.incidents.record_death(container_id), event)
+        elif action.startswith("health_status:"):
+            health = action.split(":", 1)[1].strip()
+            self._report(self.incidents.record_health(container_id, health), event)
+
+        if action == "destroy":
+            self.incidents.forget(container_id)
+            with self._containers_lock:
+                removed = self._containers.pop(container_id, None)
+            if removed is not None:
+                self._notify_listeners()
+            return
+
+        if action.split(":", 1)[0] not in CONTAINER_STATE_ACTIONS:
+            return
+
+        found = self._list_containers(client, filters={"id": container_id})
+        if not found:
+            return
+        info = found[0]
+        with self._containers_lock:
+            changed = self._containers.get(container_id) != info
+            self._containers[container_id] = info
+        if changed:
+            self._notify_listeners()
+
+    def tail_logs(self, container_id: str, max_lines: Optional[int] = None,
+                  follow: bool = True) -> LogTail:
+        """Start reading a container's logs; call stop() on the result when done."""
+        return LogTail(
+            lambda: self._connect(max_pool_size=1, timeout=self.LOG_READ_TIMEOUT),
+            container_id,
+            max_lines or self.LOG_LINES,
+            follow,
+        ).start()
 
     async def start_container(self, container_id: str) -> bool:
         """Start a specific container."""
-        if not self.is_docker_running():
+        if not await self.is_docker_running():
             return False
         
         try:
-            container = self.client.containers.get(container_id)
-            container.start()
+            await self._call(
+                lambda: self._get_client().api.start(container_id),
+                name="start_container",
+                executor=self._action_executor,
+            )
             return True
         except Exception as e:
             console.print(f"[red]Error starting container: {e}[/red]")
@@ -111,25 +691,328 @@ class DockerService:
 
     async def stop_container(self, container_id: str) -> bool:
         """Stop a specific container."""
-        if not self.is_docker_running():
+        if not await self.is_docker_running():
             return False
         
         try:
-            container = self.client.containers.get(container_id)
-            container.stop()
+            await self._call(
+                lambda: self._get_client().api.stop(container_id, timeout=self.STOP_TIMEOUT),
+                name="stop_container",
+                timeout=self.CALL_TIMEOUT + self.STOP_TIMEOUT,
+                executor=self._action_executor,
+            )
             return True
         except Exception as e:
             console.print(f"[red]Error stopping container: {e}[/red]")
             return False
 
+    async def restart_container(self, container_id: str) -> bool:
+        """Restart a specific container."""
+        if not await self.is_docker_running():
+            return False
+        
+        try:
+            await self._call(
+                lambda: self._get_client().api.restart(container_id, timeout=self.STOP_TIMEOUT),
+                name="restart_container",
+                timeout=self.CALL_TIMEOUT + self.STOP_TIMEOUT,
+                executor=self._action_executor,
+            )
+            return True
+        except Exception as e:
+            console.print(f"[red]Error restarting container: {e}[/red]")
+            return False
+
+    async def bulk_action(self, action: str, container_ids: List[str],
+                          progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, bool]:
+        """Start, stop or restart many containers concurrently.
+
+        At most MAX_CONCURRENT_ACTIONS run at once, so wall-clock time tracks
+        the slowest container rather than the sum. `progress(done, total)` is
+        called on the event loop after each container finishes.
+        """
+        handler = {
+            "start": self.start_container,
+            "stop": self.stop_container,
+            "restart": self.restart_container,
+        }[action]
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_ACTIONS)
+        total = len(container_ids)
+        done = 0
+
+        async def run(container_id: str) -> bool:
+            nonlocal done
+            async with semaphore:
+                success = await handler(container_id)
+            done += 1
+            if progress:
+                progress(done, total)
+            return success
+
+        results = await asyncio.gather(*(run(container_id) for container_id in container_ids))
+        return dict(zip(container_ids, results))
+
+    def add_pull_listener(self, callback: Callable[[PullProgress], None]) -> None:
+        """Call `callback(progress)` on the event loop as image pulls progress
+        (throttled to PULL_PROGRESS_INTERVAL) and once more when they are done."""
+        self._pull_listeners.append(callback)
+
+    def _notify_pull_listeners(self, progress: PullProgress) -> None:
+        for callback in self._pull_listeners:
+            try:
+                callback(progress)
+            except Exception as e:
+                console.print(f"[red]Error in pull listener: {e}[/red]")
+
+    def _start_prewarm(self) -> None:
+        """Pull the configured images in the background, unless already pulling."""
+        images = configured_images()
+        if images and (self.prewarm_task is None or self.prewarm_task.done()):
+            self.prewarm_task = asyncio.ensure_future(self.pull_images(images))
+
+    @metrics.instrument("docker.pull_images")
+    async def pull_images(self, refs: List[str]) -> PullProgress:
+        """Pull images, MAX_CONCURRENT_PULLS at a time, skipping those already current.
+
+        An image is current when its digest is present locally: the pinned
+        digest for "name@sha256:..." references, otherwise the digest the
+        registry has for the tag (the local copy is kept if the registry
+        cannot be reached). The streamed layer progress is folded into
+        `pull_progress` for the pull listeners.
+        """
+        progress = self.pull_progress = PullProgress.for_images(refs)
+        if not refs:
+            return progress
+        loop = asyncio.get_running_loop()
+        workers = min(len(refs), self.MAX_CONCURRENT_PULLS)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="colama-pull")
+        semaphore = asyncio.Semaphore(workers)
+        last_notified = 0.0
+
+        def update() -> None:
+            if not progress.finished:  # the final state is reported once, below
+                self._notify_pull_listeners(progress)
+
+        def changed(force: bool = False) -> None:
+            # Called from the pull threads; listeners run on the event loop
+            nonlocal last_notified
+            now = time.monotonic()
+            if force or now - last_notified >= self.PULL_PROGRESS_INTERVAL:
+                last_notified = now
+                loop.call_soon_threadsafe(update)
+
+        def pull(client: "docker.DockerClient", image: ImagePull) -> None:
+            image.state = "checking"
+            if self._image_is_current(client, image.ref):
+                image.state = "present"
+                return
+            image.state = "pulling"
+            changed(force=True)
+            for event in client.api.pull(image.ref, stream=True, decode=True):
+                image.feed(event)
+                if image.state == "failed":
+                    return
+                changed()
+            image.state = "pulled"
+
+        async def run(client: "docker.DockerClient", image: ImagePull) -> None:
+            async with semaphore:
+                try:
+                    await self._call(pull, client, image, name="pull_image",
+                                     timeout=self.PULL_TIMEOUT, executor=executor)
+                except Exception as e:
+                    image.state, image.error = "failed", str(e) or type(e).__name__
+                if image.state == "failed":
+                    console.print(f"[red]Error pulling {image.ref}: {image.error}[/red]")
+            changed(force=True)
+
+        try:
+            # Own client: pulls hold their connection for minutes
+            client = await loop.run_in_executor(
+                executor, functools.partial(self._connect, workers, self.SLOW_CALL_TIMEOUT)
+            )
+        except Exception as e:
+            console.print(f"[red]Error pulling images: {e}[/red]")
+            for image in progress.pulls.values():
+                image.state, image.error = "failed", str(e)
+            self._notify_pull_listeners(progress)
+            return progress
+        try:
+            await asyncio.gather(*(run(client, image) for image in progress.pulls.values()))
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            client.close()
+        self._notify_pull_listeners(progress)
+        return progress
+
+    @staticmethod
+    def _image_is_current(client: "docker.DockerClient", ref: str) -> bool:
+        """Whether the image's digest is already present (blocking)."""
+        import docker
+        _, digest = split_digest(ref)
+        try:
+            local = client.api.inspect_image(ref)
+        except docker.errors.NotFound:
+            return False
+        if digest:
+            return True
+        try:
+            remote = client.api.inspect_distribution(ref)["Descriptor"]["digest"]
+        except Exception:
+            return True
+        return any(d.split("@", 1)[-1] == remote for d in local.get("RepoDigests") or [])
+
+    async def get_projects(self) -> Dict[str, Project]:
+        """Compose projects (and colama.group groups) by name."""
+        return index_projects(await self.get_containers())
+
+    async def project_action(self, name: str, action: str,
+                             progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, bool]:
+        """Start, stop or restart a whole project in dependency order.
+
+        Services start level by level (see Project.levels), each level
+        concurrently through bulk_action; stopping walks the levels in
+        reverse. A service whose dependency must be service_healthy waits
+        for it up to HEALTHY_TIMEOUT and is not started if it never gets
+        there. Restart stops the running containers, then starts them again.
+        """
+        project = (await self.get_projects()).get(name)
+        if project is None:
+            return {}
+        service_levels = project.levels()
+        levels = [[c for service in level for c in project.services[service]]
+                  for level in service_levels]
+        to_stop = [[c.container_id for c in level if c.is_running]
+                   for level in reversed(levels)] if action in ("stop", "restart") else []
+        if action == "start":
+            to_start = [[c.container_id for c in level if not c.is_running] for level in levels]
+        elif action == "restart":
+            to_start = [[c.container_id for c in level if c.is_running] for level in levels]
+        else:
+            to_start = []
+
+        results: Dict[str, bool] = {}
+        total = sum(map(len, to_stop)) + sum(map(len, to_start))
+        finished = 0
+
+        def level_progress(done: int, _: int):
+            if progress:
+                progress(finished + done, total)
+
+        for ids in to_stop:
+            if ids:
+                results.update(await self.bulk_action("stop", ids, level_progress))
+                finished += len(ids)
+        for services, ids in zip(service_levels, to_start):
+            if not ids:
+                continue
+            if not await self._dependencies_healthy(project, services):
+                console.print(f"[red]Error starting {', '.join(services)}: "
+                              f"a dependency did not become healthy[/red]")
+                results.update(dict.fromkeys(ids, False))
+            else:
+                results.update(await self.bulk_action("start", ids, level_progress))
+            finished += len(ids)
+        return results
+
+    async def _dependencies_healthy(self, project: Project, services: List[str]) -> bool:
+        """Wait until the service_healthy dependencies of `services` report healthy."""
+        needed = {dependency for service in services
+                  for dependency, condition in project.depends_on.get(service, {}).items()
+                  if condition == "service_healthy" and dependency in project.services}
+        if not needed:
+            return True
+        ids = {c.container_id for dependency in needed for c in project.services[dependency]}
+        deadline = time.monotonic() + self.HEALTHY_TIMEOUT
+        while True:
+            containers = [c for c in await self.get_containers() if c.container_id in ids]
+            if containers and all(c.is_running and c.health in ("healthy", "")
+                                  for c in containers):
+                return True
+            if time.monotonic() > deadline:
+                return False
+            await asyncio.sleep(1.0)
+
     async def remove_stopped_containers(self) -> bool:
         """Remove all stopped containers."""
-        if not self.is_docker_running():
+        if not await self.is_docker_running():
             return False
         
         try:
-            self.client.containers.prune()
+            await self._call(lambda: self._get_client().api.prune_containers(),
+                             name="prune_containers")
             return True
         except Exception as e:
             console.print(f"[red]Error removing containers: {e}[/red]")
             return False
+
+    def _slow_request(self, func: Callable[["docker.DockerClient"], Any]) -> Any:
+        """Run a long request on a throwaway client with SLOW_CALL_TIMEOUT (blocking)."""
+        client = self._connect(max_pool_size=1, timeout=self.SLOW_CALL_TIMEOUT)
+        try:
+            return func(client)
+        finally:
+            client.close()
+
+    @property
+    def disk_usage(self) -> Optional[DiskUsage]:
+        """The last fetched disk usage, however old."""
+        return self._disk_usage
+
+    async def get_disk_usage(self, max_age: Optional[float] = None) -> Optional[DiskUsage]:
+        """Return cached disk usage, refetching it if older than `max_age` seconds."""
+        usage = self._disk_usage
+        if usage is not None and usage.age < (max_age if max_age is not None else self.DISK_USAGE_MAX_AGE):
+            return usage
+        return await self.refresh_disk_usage()
+
+    async def refresh_disk_usage(self) -> Optional[DiskUsage]:
+        """Fetch system/df; callers arriving meanwhile share the same request."""
+        if self._df_future is None:
+            self._df_future = asyncio.ensure_future(self._fetch_disk_usage())
+        future = self._df_future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._df_future is future and future.done():
+                self._df_future = None
+
+    async def _fetch_disk_usage(self) -> Optional[DiskUsage]:
+        if not await self.is_docker_running():
+            return None
+        try:
+            df = await self._call(
+                self._slow_request, lambda client: client.api.df(),
+                name="disk_usage", timeout=self.SLOW_CALL_TIMEOUT, executor=self._action_executor,
+            )
+            self._disk_usage = DiskUsage.from_df(df)
+            return self._disk_usage
+        except Exception as e:
+            console.print(f"[red]Error getting disk usage: {e}[/red]")
+            return None
+
+    async def prune(self, target: str) -> Optional[int]:
+        """Prune one of PRUNE_TARGETS; returns bytes reclaimed, or None on failure."""
+        request = {
+            "dangling-images": lambda client: client.api.prune_images(filters={"dangling": True}),
+            "unused-images": lambda client: client.api.prune_images(filters={"dangling": False}),
+            # Without all=true, API 1.42+ only prunes anonymous volumes
+            "volumes": lambda client: client.api.prune_volumes(filters={"all": True}),
+            "build-cache": lambda client: client.api.prune_builds(),
+        }[target]
+        if not await self.is_docker_running():
+            return None
+        try:
+            result = await self._call(
+                self._slow_request, request,
+                name=f"prune_{target.replace('-', '_')}", timeout=self.SLOW_CALL_TIMEOUT,
+                executor=self._action_executor,
+            )
+            return (result or {}).get("SpaceReclaimed") or 0
+        except Exception as e:
+            console.print(f"[red]Error pruning {PRUNE_TARGETS[target].lower()}: {e}[/red]")
+            return None
+        finally:
+            self._disk_usage = None
+            if target.endswith("images"):
+                self._invalidate_images()
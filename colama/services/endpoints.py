@@ -0,0 +1,156 @@
+"""
+Several Docker endpoints (contexts, Colima profiles, daemon URLs) queried at once
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+import asyncio
+import json
+import os
+from .colima import profile_socket
+from .docker_service import ContainerInfo, DockerService
+from .metrics import metrics
+from .paths import config_entries
+from ..console import console
+
+# One endpoint spec per line in config_dir()/endpoints, or comma-separated in COLAMA_ENDPOINTS
+ENDPOINTS_FILE = "endpoints"
+ENDPOINTS_ENV = "COLAMA_ENDPOINTS"
+URL_SCHEMES = ("unix://", "tcp://", "ssh://", "http://", "https://")
+# Name of the tray's own daemon (see EndpointFanout.add_service); not available to endpoints
+LOCAL_ENDPOINT = "local"
+
+@dataclass(frozen=True)
+class Endpoint:
+    name: str
+    host: str
+
+def docker_contexts() -> Dict[str, str]:
+    """Docker CLI contexts by name, mapped to their daemon URL."""
+    config = os.environ.get("DOCKER_CONFIG") or os.path.expanduser("~/.docker")
+    meta_dir = os.path.join(config, "contexts", "meta")
+    contexts: Dict[str, str] = {}
+    try:
+        entries = os.listdir(meta_dir)
+    except OSError:
+        return contexts
+    for entry in entries:
+        try:
+            with open(os.path.join(meta_dir, entry, "meta.json")) as f:
+                meta = json.load(f)
+            contexts[meta["Name"]] = meta["Endpoints"]["docker"]["Host"]
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+    return contexts
+
+def parse_endpoint(spec: str, contexts: Optional[Dict[str, str]] = None) -> Endpoint:
+    """Parse "[name=]target" where target is a URL, "profile:NAME" or "context:NAME"."""
+    name, target = "", spec.strip()
+    if "=" in target.split("://", 1)[0]:
+        name, target = target.split("=", 1)
+    if target.startswith("profile:"):
+        profile = target[len("profile:"):]
+        return Endpoint(name or profile, f"unix://{profile_socket(profile)}")
+    if target.startswith("context:"):
+        context = target[len("context:"):]
+        hosts = docker_contexts() if contexts is None else contexts
+        if context not in hosts:
+            raise ValueError(f"no such Docker context: {context}")
+        return Endpoint(name or context, hosts[context])
+    if target.startswith("unix://"):
+        # Default name: the directory holding the socket (a Colima profile's name)
+        return Endpoint(name or os.path.basename(os.path.dirname(target[len("unix://"):])), target)
+    if target.startswith(URL_SCHEMES):
+        return Endpoint(name or target.split("://", 1)[1].split("/", 1)[0], target)
+    raise ValueError(f"not an endpoint: {spec!r} (expected a URL, profile:NAME or context:NAME)")
+
+def configured_endpoints(specs: Iterable[str] = ()) -> List[Endpoint]:
+    """Endpoints from the endpoints file, COLAMA_ENDPOINTS and `specs`, in that order."""
+    endpoints: Dict[str, Endpoint] = {}
+    contexts = None
+    for line in config_entries(ENDPOINTS_FILE, ENDPOINTS_ENV, specs):
+        if contexts is None and "context:" in line:
+            contexts = docker_contexts()
+        try:
+            endpoint = parse_endpoint(line, contexts)
+        except ValueError as e:
+            console.print(f"[red]Error in endpoint configuration: {e}[/red]")
+            continue
+        if endpoint.name == LOCAL_ENDPOINT:
+            console.print(f"[red]Error in endpoint configuration: {line!r}: the name "
+                          f"{LOCAL_ENDPOINT!r} is taken by the local daemon, "
+                          f"pick another with NAME=...[/red]")
+            continue
+        endpoints[endpoint.name.replace("/", "-")] = endpoint
+    return [Endpoint(name, endpoint.host) for name, endpoint in endpoints.items()]
+
+class EndpointFanout:
+    """One DockerService per endpoint, listed concurrently.
+
+    Every endpoint gets its own `timeout`, so a slow or unreachable host
+    only costs its own entry: results are handed out in the order the
+    endpoints answer, and a host that times out is reported as None.
+    """
+
+    TIMEOUT = 5.0
+
+    def __init__(self, endpoints: List[Endpoint], timeout: Optional[float] = None):
+        self.endpoints = endpoints
+        self.timeout = timeout or self.TIMEOUT
+        self._services: Dict[str, DockerService] = {}
+        self._extra: Dict[str, DockerService] = {}
+
+    def add_service(self, name: str, service: DockerService) -> None:
+        """Include an already-connected service (e.g. the tray's local one)."""
+        self._extra[name] = service
+
+    def service(self, name: str) -> DockerService:
+        if name in self._extra:
+            return self._extra[name]
+        if name not in self._services:
+            host = next(e.host for e in self.endpoints if e.name == name)
+            service = DockerService(host=host)
+            # Bounds every socket operation too, so no request outlives the deadline by much
+            service.CALL_TIMEOUT = self.timeout
+            self._services[name] = service
+        return self._services[name]
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._extra) + [e.name for e in self.endpoints if e.name not in self._extra]
+
+    async def _list(self, name: str) -> Optional[List[ContainerInfo]]:
+        service = self.service(name)
+
+        async def containers() -> Optional[List[ContainerInfo]]:
+            if not await service.is_docker_running():
+                return None
+            return await service.get_containers()
+
+        try:
+            with metrics.timed("endpoint.list"):
+                return await asyncio.wait_for(containers(), self.timeout)
+        except asyncio.TimeoutError:
+            console.print(f"[red]Error listing {name}: no answer in {self.timeout:g}s[/red]")
+            return None
+
+    async def get_containers(
+        self, on_result: Optional[Callable[[str, Optional[List[ContainerInfo]]], None]] = None,
+    ) -> Dict[str, Optional[List[ContainerInfo]]]:
+        """List every endpoint at once; `on_result(name, containers)` fires as each answers.
+
+        Containers are None for endpoints that are down or did not answer in time.
+        """
+        async def query(name: str):
+            return name, await self._list(name)
+
+        results: Dict[str, Optional[List[ContainerInfo]]] = {}
+        for future in asyncio.as_completed([query(name) for name in self.names]):
+            name, containers = await future
+            results[name] = containers
+            if on_result:
+                on_result(name, containers)
+        return results
+
+    def shutdown(self) -> None:
+        for service in self._services.values():
+            service.shutdown()
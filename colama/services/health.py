@@ -0,0 +1,111 @@
+"""
+Daemon liveness caching and circuit breaking
+"""
+from typing import Optional, Tuple
+import http.client
+import os
+import socket
+import time
+
+def docker_socket_path() -> Optional[str]:
+    """Return the unix socket docker-py will connect to, if it is one."""
+    host = os.environ.get("DOCKER_HOST", "unix:///var/run/docker.sock")
+    if host.startswith("unix://"):
+        return host[len("unix://"):]
+    return None
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+def ping_socket(path: str, timeout: float = 2.0) -> bool:
+    """GET /_ping over a unix socket using only the standard library."""
+    connection = _UnixHTTPConnection(path, timeout)
+    try:
+        connection.request("GET", "/_ping")
+        return connection.getresponse().status == 200
+    except OSError:
+        return False
+    finally:
+        connection.close()
+
+def _socket_signature(path: Optional[str]) -> Optional[Tuple[int, float]]:
+    """Identify a socket file so a recreated socket can be told apart."""
+    if path is None:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime)
+
+class DaemonHealth:
+    """Short-lived liveness cache in front of an exponential-backoff circuit breaker.
+
+    While the daemon answers, results are reused for `ttl` seconds. After a
+    failure the breaker opens and probes are refused for a delay that doubles
+    with each consecutive failure, up to `max_delay`. The breaker closes early
+    as soon as the daemon's unix socket (re)appears.
+    """
+
+    def __init__(self, ttl: float = 2.0, base_delay: float = 1.0, max_delay: float = 60.0,
+                 socket_path: Optional[str] = None):
+        self.ttl = ttl
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.socket_path = socket_path if socket_path is not None else docker_socket_path()
+
+        self._alive: Optional[bool] = None
+        self._checked_at = 0.0
+        self._failures = 0
+        self._open_until = 0.0
+        self._socket_at_failure: Optional[Tuple[int, float]] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the breaker is currently refusing probes."""
+        return self._failures > 0 and time.monotonic() < self._open_until
+
+    def cached(self) -> Optional[bool]:
+        """Return the last liveness result if it is still fresh."""
+        if self._alive is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._alive
+        return None
+
+    def should_probe(self) -> bool:
+        """Whether a real ping is allowed now."""
+        if not self.is_open:
+            return True
+        signature = _socket_signature(self.socket_path)
+        if signature is not None and signature != self._socket_at_failure:
+            # The socket came back (or was recreated): try straight away
+            self.reset()
+            return True
+        return False
+
+    def record(self, alive: bool) -> bool:
+        """Record a probe result; returns True if the daemon just came back."""
+        recovered = alive and self._alive is False
+        self._alive = alive
+        self._checked_at = time.monotonic()
+        if alive:
+            self._failures = 0
+            self._open_until = 0.0
+        else:
+            self._failures += 1
+            delay = min(self.base_delay * 2 ** (self._failures - 1), self.max_delay)
+            self._open_until = self._checked_at + delay
+            self._socket_at_failure = _socket_signature(self.socket_path)
+        return recovered
+
+    def reset(self) -> None:
+        """Forget cached state and close the breaker."""
+        self._checked_at = 0.0
+        self._failures = 0
+        self._open_until = 0.0
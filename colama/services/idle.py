@@ -0,0 +1,120 @@
+"""
+Suspending an idle Colima VM and bringing it back with its containers
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+import json
+import os
+import time
+from .colima import VMResources
+from .docker_service import DockerService
+from .metrics import write_json_atomic
+from .paths import cache_dir
+from ..console import console
+
+class IdlePolicy:
+    """Tracks how long the VM has been quiet.
+
+    Activity is any container state change (mark_active) or aggregate
+    container CPU above CPU_THRESHOLD percent of one core (observe). The VM
+    counts as idle once nothing happened for `quiet_period` seconds.
+    """
+
+    CPU_THRESHOLD = 5.0
+
+    def __init__(self, quiet_period: float, cpu_threshold: Optional[float] = None):
+        self.quiet_period = quiet_period
+        self.cpu_threshold = self.CPU_THRESHOLD if cpu_threshold is None else cpu_threshold
+        self._last_active = time.monotonic()
+
+    def mark_active(self) -> None:
+        self._last_active = time.monotonic()
+
+    def observe(self, cpu: Optional[float]) -> None:
+        """Feed one aggregate CPU reading (None: not known, ignored)."""
+        if cpu is not None and cpu > self.cpu_threshold:
+            self.mark_active()
+
+    @property
+    def idle_for(self) -> float:
+        return time.monotonic() - self._last_active
+
+    @property
+    def is_idle(self) -> bool:
+        return self.idle_for >= self.quiet_period
+
+@dataclass
+class SuspendRecord:
+    """What was running when the VM was suspended (or stopped)."""
+
+    containers: List[str]  # container IDs
+    suspended_at: float = field(default_factory=time.time)
+    reason: str = "suspend"  # "suspend" (idle or resize) or "stop"
+
+def suspend_path(profile: Optional[str]) -> str:
+    return os.path.join(cache_dir(), f"suspended-{profile or 'default'}.json")
+
+class Suspender:
+    """Stops Colima remembering the running containers, and restarts both.
+
+    The record is kept on disk, so a resume after quitting the app (or
+    from `colama start`) still brings the containers back. Plain stops go
+    through here too: stopping the containers ahead of the VM marks them
+    as stopped by hand, so `restart: unless-stopped` alone would not.
+    """
+
+    def __init__(self, service: DockerService):
+        self.service = service
+        self.path = suspend_path(service.profile)
+
+    @property
+    def record(self) -> Optional[SuspendRecord]:
+        try:
+            with open(self.path) as f:
+                return SuspendRecord(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _clear(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    async def suspend(self, progress: Optional[Callable[[str], None]] = None,
+                      timeout: Optional[float] = None, reason: str = "suspend") -> bool:
+        """Stop Colima; returns False (and keeps it running) if the stop failed.
+
+        `progress` and `timeout` are passed on to DockerService.stop_colima.
+        """
+        if not await self.service.is_docker_running():
+            # Nothing to remember, and a record from an earlier suspend must stay
+            return await self.service.stop_colima(progress, timeout)
+        running = [c.container_id for c in await self.service.get_containers() if c.is_running]
+        try:
+            write_json_atomic(self.path, asdict(SuspendRecord(running, reason=reason)))
+        except OSError as e:
+            console.print(f"[red]Error saving suspended state: {e}[/red]")
+            return False
+        if not await self.service.stop_colima(progress, timeout):
+            self._clear()
+            return False
+        return True
+
+    async def resume(self, on_phase: Optional[Callable[[str, str], None]] = None,
+                     resources: Optional[VMResources] = None) -> Optional[Dict[str, bool]]:
+        """Start Colima and the containers that were running at suspend time.
+
+        Returns the per-container start results, or None if Colima did not start.
+        Containers that are gone since are skipped. `resources` resizes the VM.
+        """
+        record = self.record
+        if not await self.service.start_colima(on_phase, resources):
+            return None
+        self._clear()
+        if record is None:
+            return {}
+        existing = {c.container_id for c in await self.service.get_containers()}
+        return await self.service.bulk_action(
+            "start", [c for c in record.containers if c in existing]
+        )
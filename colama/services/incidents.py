@@ -0,0 +1,144 @@
+"""
+Container health and restart-loop tracking from the events stream
+"""
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+import re
+import threading
+import time
+
+# The health part of a containers/json Status, e.g. "Up 5 minutes (unhealthy)"
+HEALTH_PATTERN = re.compile(r"\((healthy|unhealthy|health: starting)\)")
+
+def parse_health(status: str) -> str:
+    """Return "healthy", "unhealthy", "starting" or "" (no healthcheck)."""
+    match = HEALTH_PATTERN.search(status or "")
+    if match is None:
+        return ""
+    return "starting" if match.group(1) == "health: starting" else match.group(1)
+
+class WindowCounter:
+    """Event count over the last `window` seconds in fixed-size time buckets.
+
+    Memory is constant and add() is O(1); total() looks at every bucket,
+    which is also constant. Old buckets are reset lazily when reused.
+    """
+
+    def __init__(self, window: float, buckets: int = 10):
+        self.window = window
+        self.width = window / buckets
+        self._counts = array("I", bytes(4 * buckets))
+        self._epochs = array("q", [-1] * buckets)  # which time slice each bucket holds
+
+    def add(self, now: Optional[float] = None) -> None:
+        epoch = int((time.monotonic() if now is None else now) // self.width)
+        slot = epoch % len(self._counts)
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self._counts[slot] = 0
+        self._counts[slot] += 1
+
+    def total(self, now: Optional[float] = None) -> int:
+        epoch = int((time.monotonic() if now is None else now) // self.width)
+        oldest = epoch - len(self._counts) + 1
+        return sum(count for count, e in zip(self._counts, self._epochs) if e >= oldest)
+
+@dataclass
+class _ContainerRecord:
+    deaths: WindowCounter
+    flapping: bool = False
+    unhealthy: bool = False
+    # When each kind of incident was last reported, for throttling
+    notified: Dict[str, float] = field(default_factory=dict)
+
+@dataclass
+class Incident:
+    container_id: str
+    kind: str  # "flapping" or "unhealthy"
+    detail: str
+    name: str = ""
+
+class IncidentTracker:
+    """Per-container health and restart-loop state, fed one event at a time.
+
+    A container is flapping once it died FLAP_DEATHS times within
+    FLAP_WINDOW seconds, and stops flapping when the window holds fewer.
+    Each incident is reported once when it starts, and a container that
+    keeps re-entering the same incident is reported at most once per
+    NOTIFY_INTERVAL. Records are dropped when the container is destroyed.
+    Safe to call from any thread.
+    """
+
+    FLAP_WINDOW = 300.0
+    FLAP_DEATHS = 3
+    NOTIFY_INTERVAL = 600.0
+
+    def __init__(self):
+        self._records: Dict[str, _ContainerRecord] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, container_id: str) -> _ContainerRecord:
+        record = self._records.get(container_id)
+        if record is None:
+            record = self._records[container_id] = _ContainerRecord(WindowCounter(self.FLAP_WINDOW))
+        return record
+
+    def record_death(self, container_id: str, now: Optional[float] = None) -> Optional[Incident]:
+        """A die event; returns an Incident if this starts a restart loop."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            record = self._record(container_id)
+            record.deaths.add(now)
+            deaths = record.deaths.total(now)
+            was_flapping, record.flapping = record.flapping, deaths >= self.FLAP_DEATHS
+            if record.flapping and not was_flapping:
+                minutes = int(self.FLAP_WINDOW // 60)
+                return self._incident(record, container_id, "flapping",
+                                      f"exited {deaths} times in {minutes} minutes", now)
+        return None
+
+    def record_health(self, container_id: str, health: str,
+                      now: Optional[float] = None) -> Optional[Incident]:
+        """A health_status event; returns an Incident when it turns unhealthy."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            record = self._record(container_id)
+            was_unhealthy, record.unhealthy = record.unhealthy, health == "unhealthy"
+            if record.unhealthy and not was_unhealthy:
+                return self._incident(record, container_id, "unhealthy",
+                                      "healthcheck is failing", now)
+        return None
+
+    def _incident(self, record: _ContainerRecord, container_id: str, kind: str,
+                  detail: str, now: float) -> Optional[Incident]:
+        last = record.notified.get(kind)
+        if last is not None and now - last < self.NOTIFY_INTERVAL:
+            return None
+        record.notified[kind] = now
+        return Incident(container_id, kind, detail)
+
+    def is_flapping(self, container_id: str, now: Optional[float] = None) -> bool:
+        with self._lock:
+            record = self._records.get(container_id)
+            if record is None or not record.flapping:
+                return False
+            # Calm for a whole window: the loop is over
+            record.flapping = record.deaths.total(now) >= self.FLAP_DEATHS
+            return record.flapping
+
+    def recent_deaths(self, container_id: str) -> int:
+        with self._lock:
+            record = self._records.get(container_id)
+            return record.deaths.total() if record else 0
+
+    def forget(self, container_id: str) -> None:
+        with self._lock:
+            self._records.pop(container_id, None)
+
+    def retain(self, container_ids: Iterable[str]) -> None:
+        """Drop records of containers that no longer exist."""
+        keep = set(container_ids)
+        with self._lock:
+            for container_id in [c for c in self._records if c not in keep]:
+                del self._records[container_id]
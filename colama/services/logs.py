@@ -0,0 +1,98 @@
+"""
+Following container logs into a bounded buffer
+"""
+from collections import deque
+from typing import TYPE_CHECKING, Callable, List, Optional
+import threading
+
+if TYPE_CHECKING:
+    import docker
+
+class LogTail:
+    """Follow one container's logs on a background thread.
+
+    The reader never waits for the consumer: lines queue in a buffer capped
+    at `max_lines`, and when the consumer falls behind the oldest are
+    dropped and counted in `dropped`. Consumers pull with drain() at their
+    own pace, in batches, so a chatty container cannot flood them.
+    """
+
+    # A line without a newline is cut here so one endless line can't grow unbounded
+    MAX_LINE_BYTES = 64 * 1024
+
+    def __init__(self, connect: Callable[[], "docker.DockerClient"], container_id: str,
+                 max_lines: int = 5000, follow: bool = True):
+        self.container_id = container_id
+        self.max_lines = max_lines
+        self.follow = follow
+        self.dropped = 0
+        self.error: Optional[str] = None
+        self._connect = connect
+        self._pending: deque = deque(maxlen=max_lines)
+        self._lock = threading.Lock()
+        self._stream = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "LogTail":
+        """Start with the last `max_lines` lines, then follow if asked to."""
+        self._thread = threading.Thread(
+            target=self._read, name=f"colama-logs-{self.container_id}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        stream = self._stream
+        if stream is not None:
+            stream.close()
+
+    def drain(self, limit: Optional[int] = None) -> List[str]:
+        """Take up to `limit` queued lines, oldest first."""
+        with self._lock:
+            count = len(self._pending) if limit is None else min(limit, len(self._pending))
+            return [self._pending.popleft() for _ in range(count)]
+
+    @property
+    def backlog(self) -> int:
+        return len(self._pending)
+
+    def _push(self, lines: List[bytes]) -> None:
+        decoded = [line.decode("utf-8", "replace").rstrip("\r") for line in lines]
+        with self._lock:
+            self.dropped += max(0, len(self._pending) + len(decoded) - self.max_lines)
+            self._pending.extend(decoded)
+
+    def _read(self) -> None:
+        client = None
+        try:
+            client = self._connect()
+            stream = self._stream = client.api.logs(
+                self.container_id, stream=True, follow=self.follow, tail=self.max_lines
+            )
+            if self._stop.is_set():
+                stream.close()
+                return
+            partial = b""
+            for chunk in stream:
+                partial += chunk
+                *complete, partial = partial.split(b"\n")
+                if len(partial) > self.MAX_LINE_BYTES:
+                    complete.append(partial)
+                    partial = b""
+                if complete:
+                    self._push(complete)
+            if partial:
+                self._push([partial])
+        except Exception as e:
+            if not self._stop.is_set():
+                self.error = str(e)
+        finally:
+            self._stream = None
+            if client is not None:
+                client.close()
@@ -0,0 +1,345 @@
+"""
+In-process instrumentation and its export surfaces
+
+Every DockerService call and UI refresh path records its latency, call count
+and errors here. The numbers can be scraped in Prometheus text format from a
+localhost endpoint, dumped periodically as JSON, or both. SessionProfiler adds
+cProfile and tracemalloc snapshots for one session.
+"""
+from bisect import bisect_left
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import functools
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+
+if TYPE_CHECKING:
+    from cProfile import Profile
+    from http.server import ThreadingHTTPServer
+
+# Upper bounds in seconds, from a cheap cache hit to a slow container stop
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    """Fixed-bucket latency histogram, cumulative like Prometheus'."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Return (le, count) pairs including +Inf."""
+        pairs, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            pairs.append(("+Inf" if bound == float("inf") else repr(bound), total))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank, total = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            if total >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+        }
+
+class Metrics:
+    """Thread-safe registry of call histograms, error counts and counters."""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Histogram] = {}
+        self._errors: Counter = Counter()
+        self._counters: Counter = Counter()
+        self._loop_lag = Histogram(buckets)
+
+    def observe(self, name: str, seconds: float, error: bool = False) -> None:
+        """Record one call's latency, and whether it failed."""
+        with self._lock:
+            histogram = self._calls.get(name)
+            if histogram is None:
+                histogram = self._calls[name] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if error:
+                self._errors[name] += 1
+
+    def error(self, name: str) -> None:
+        """Count a failure that did not raise (e.g. a ping that returned False)."""
+        with self._lock:
+            self._errors[name] += 1
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += value
+
+    def observe_loop_lag(self, seconds: float) -> None:
+        with self._lock:
+            self._loop_lag.observe(seconds)
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Time a block; an exception counts as an error and is re-raised."""
+        started = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.observe(name, time.perf_counter() - started, error=True)
+            raise
+        self.observe(name, time.perf_counter() - started)
+
+    def instrument(self, name: str) -> Callable[[Callable], Callable]:
+        """Decorator form of timed() for plain and async functions."""
+        def decorator(func: Callable) -> Callable:
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.timed(name):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timed(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self) -> dict:
+        """Return every metric as plain data, for the JSON dump."""
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "timestamp": time.time(),
+                "calls": {
+                    name: dict(histogram.as_dict(), errors=self._errors[name])
+                    for name, histogram in sorted(self._calls.items())
+                },
+                "errors": dict(self._errors),
+                "counters": dict(self._counters),
+                "event_loop_lag": self._loop_lag.as_dict(),
+            }
+
+    def render_prometheus(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += [
+                "# HELP colama_call_duration_seconds Latency of Docker calls and UI refreshes.",
+                "# TYPE colama_call_duration_seconds histogram",
+            ]
+            for name, histogram in sorted(self._calls.items()):
+                lines += _histogram_lines("colama_call_duration_seconds", histogram,
+                                         f'call="{_escape(name)}"')
+
+            lines += [
+                "# HELP colama_call_errors_total Calls that raised or reported failure.",
+                "# TYPE colama_call_errors_total counter",
+            ]
+            for name in sorted(self._calls.keys() | self._errors.keys()):
+                lines.append(f'colama_call_errors_total{{call="{_escape(name)}"}} {self._errors[name]}')
+
+            lines += [
+                "# HELP colama_event_loop_lag_seconds Delay of a timer on the UI event loop.",
+                "# TYPE colama_event_loop_lag_seconds histogram",
+            ]
+            lines += _histogram_lines("colama_event_loop_lag_seconds", self._loop_lag)
+
+            for name, value in sorted(self._counters.items()):
+                lines += [f"# TYPE colama_{name}_total counter", f"colama_{name}_total {value}"]
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _histogram_lines(family: str, histogram: Histogram, labels: str = "") -> List[str]:
+    prefix = labels + "," if labels else ""
+    suffix = f"{{{labels}}}" if labels else ""
+    lines = [f'{family}_bucket{{{prefix}le="{le}"}} {total}' for le, total in histogram.cumulative()]
+    lines.append(f"{family}_sum{suffix} {histogram.sum}")
+    lines.append(f"{family}_count{suffix} {histogram.count}")
+    return lines
+
+# Process-wide registry used by the services and the UI
+metrics = Metrics()
+
+class MetricsServer:
+    """Serve /metrics (Prometheus text) and /metrics.json on localhost."""
+
+    def __init__(self, registry: Metrics, port: int, host: str = "127.0.0.1"):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: Optional["ThreadingHTTPServer"] = None
+
+    def start(self) -> "MetricsServer":
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/metrics":
+                    body = registry.render_prometheus().encode()
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(registry.snapshot()).encode()
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        server = self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        server.daemon_threads = True
+        self.port = server.server_address[1]
+        threading.Thread(target=server.serve_forever, name="colama-metrics", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+def write_json_atomic(path: str, data, indent: Optional[int] = 2) -> None:
+    """Write JSON next to `path` and rename it over, so readers never see half a file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".colama-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent, separators=None if indent else (",", ":"))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+class JsonDumper:
+    """Write a metrics snapshot to a file every `interval` seconds, and once on stop."""
+
+    def __init__(self, registry: Metrics, path: str, interval: float = 60.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "JsonDumper":
+        self._thread = threading.Thread(target=self._run, name="colama-metrics-dump", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def dump(self) -> None:
+        try:
+            write_json_atomic(self.path, self.registry.snapshot())
+        except OSError as e:
+            from ..console import console
+            console.print(f"[red]Error writing metrics: {e}[/red]")
+
+    def stop(self) -> None:
+        if self._thread is not None and not self._stop.is_set():
+            self._stop.set()
+            self.dump()
+
+class LoopLagMonitor:
+    """Measure how late a periodic timer fires on an asyncio loop."""
+
+    def __init__(self, registry: Metrics, interval: float = 0.5):
+        self.registry = registry
+        self.interval = interval
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> "LoopLagMonitor":
+        self._loop = loop
+        self._schedule()
+        return self
+
+    def _schedule(self) -> None:
+        if self._loop is None:
+            return
+        expected = self._loop.time() + self.interval
+        self._handle = self._loop.call_at(expected, self._tick, self._loop, expected)
+
+    def _tick(self, loop: asyncio.AbstractEventLoop, expected: float) -> None:
+        self.registry.observe_loop_lag(max(0.0, loop.time() - expected))
+        self._schedule()
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+class SessionProfiler:
+    """cProfile the main thread and trace allocations until stop(), then write both.
+
+    Produces `<dir>/colama-<timestamp>.prof` (for pstats or snakeviz) and
+    `<dir>/colama-<timestamp>.tracemalloc` (tracemalloc.Snapshot.load).
+    """
+
+    def __init__(self, directory: str, frames: int = 25):
+        self.directory = directory
+        self.frames = frames
+        self._profiler: Optional["Profile"] = None
+
+    def start(self) -> "SessionProfiler":
+        import cProfile
+        import tracemalloc
+        os.makedirs(self.directory, exist_ok=True)
+        tracemalloc.start(self.frames)
+        profiler = self._profiler = cProfile.Profile()
+        profiler.enable()
+        return self
+
+    def stop(self) -> List[str]:
+        """Stop profiling and return the written paths."""
+        import tracemalloc
+        if self._profiler is None:
+            return []
+        self._profiler.disable()
+        base = os.path.join(self.directory, time.strftime("colama-%Y%m%d-%H%M%S"))
+        self._profiler.dump_stats(base + ".prof")
+        self._profiler = None
+        tracemalloc.take_snapshot().dump(base + ".tracemalloc")
+        tracemalloc.stop()
+        return [base + ".prof", base + ".tracemalloc"]
@@ -0,0 +1,39 @@
+"""
+Where Colama keeps its cache and reads its configuration
+"""
+from typing import Iterable, List
+import os
+import re
+import sys
+
+# "#" starts a comment at the beginning of a line or after whitespace
+COMMENT = re.compile(r"(^|\s)#.*$")
+
+def cache_dir() -> str:
+    """Where Colama keeps files it can always rebuild."""
+    if os.environ.get("COLAMA_CACHE_DIR"):
+        return os.environ["COLAMA_CACHE_DIR"]
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/co-lama")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "colama")
+
+def config_dir() -> str:
+    """Where Colama reads user configuration (~/.config/colama)."""
+    return os.path.join(os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config"), "colama")
+
+def config_entries(name: str, env: str, extra: Iterable[str] = ()) -> List[str]:
+    """Entries of a list setting, from all the places it can be given, in order.
+
+    First the file `name` in config_dir() (one entry per line, # comments),
+    then the comma-separated environment variable `env`, then `extra`
+    (command line flags). Blank entries are dropped, duplicates kept.
+    """
+    entries: List[str] = []
+    try:
+        with open(os.path.join(config_dir(), name)) as f:
+            entries += [COMMENT.sub("", line) for line in f.read().splitlines()]
+    except OSError:
+        pass
+    entries += os.environ.get(env, "").split(",")
+    entries += list(extra)
+    return [entry.strip() for entry in entries if entry.strip()]
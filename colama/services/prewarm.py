@@ -0,0 +1,129 @@
+"""
+Images pulled ahead of time into a freshly started VM, and pull progress
+"""
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+import threading
+from .paths import config_entries
+from .stats import format_bytes
+
+# One image per line in config_dir()/prewarm, or comma-separated in COLAMA_PREWARM
+PREWARM_FILE = "prewarm"
+PREWARM_ENV = "COLAMA_PREWARM"
+
+def configured_images(extra: Iterable[str] = ()) -> List[str]:
+    """Images from the prewarm file, COLAMA_PREWARM and `extra`, without duplicates."""
+    return list(dict.fromkeys(config_entries(PREWARM_FILE, PREWARM_ENV, extra)))
+
+def split_digest(ref: str) -> Tuple[str, str]:
+    """"name@sha256:..." -> ("name", "sha256:..."); ("ref", "") when not pinned."""
+    name, _, digest = ref.partition("@")
+    return name, digest
+
+DOWNLOAD_SHARE = 0.9
+
+# Layer statuses after which a layer's download is complete
+LAYER_DONE = {"Download complete", "Verifying Checksum", "Extracting", "Pull complete", "Already exists"}
+
+@dataclass
+class ImagePull:
+    """One image's pull, folded from the daemon's JSON progress stream.
+
+    feed() runs on a pull thread while the event loop reads the totals, so
+    `layers` is only touched under `_lock`.
+    """
+    ref: str
+    state: str = "waiting"  # waiting, checking, pulling, then pulled, present or failed
+    error: str = ""
+    layers: Dict[str, Tuple[int, int]] = field(default_factory=dict)  # id -> (downloaded, size)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def feed(self, event: dict) -> None:
+        if event.get("error"):
+            self.state, self.error = "failed", event["error"]
+            return
+        layer, status = event.get("id"), event.get("status", "")
+        if not layer or status.startswith(("Pulling from", "Digest:", "Status:")):
+            return  # image-level lines
+        detail = event.get("progressDetail") or {}
+        with self._lock:
+            size = self.layers.get(layer, (0, 0))[1]
+            if status == "Downloading" and detail.get("total"):
+                self.layers[layer] = (detail.get("current", 0), detail["total"])
+            elif status in LAYER_DONE:
+                self.layers[layer] = (size, size)
+            elif layer not in self.layers:
+                self.layers[layer] = (0, 0)  # "Pulling fs layer", "Waiting": size not known yet
+
+    def layer_totals(self) -> Tuple[int, int]:
+        """(downloaded, size) in bytes over the layers seen so far."""
+        with self._lock:
+            progress = list(self.layers.values())
+        return sum(done for done, _ in progress), sum(size for _, size in progress)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("pulled", "present", "failed")
+
+    @property
+    def downloaded(self) -> int:
+        return self.layer_totals()[0]
+
+    @property
+    def size(self) -> int:
+        return self.layer_totals()[1]
+
+@dataclass
+class PullProgress:
+    """Every pull of one pre-warm run, for a single progress line."""
+    pulls: Dict[str, ImagePull]
+
+    @classmethod
+    def for_images(cls, refs: Iterable[str]) -> "PullProgress":
+        return cls({ref: ImagePull(ref) for ref in refs})
+
+    @property
+    def finished(self) -> bool:
+        return all(pull.finished for pull in self.pulls.values())
+
+    def count(self, *states: str) -> int:
+        return sum(pull.state in states for pull in self.pulls.values())
+
+    @property
+    def fraction(self) -> float:
+        """Share of the work done: finished images plus the bytes of running pulls.
+
+        Downloading counts for DOWNLOAD_SHARE of an image, extracting it for the rest.
+        """
+        if not self.pulls:
+            return 1.0
+        done = 0.0
+        for pull in self.pulls.values():
+            if pull.finished:
+                done += 1
+                continue
+            downloaded, size = pull.layer_totals()
+            if size:
+                done += DOWNLOAD_SHARE * downloaded / size
+        return done / len(self.pulls)
+
+    def summary(self) -> str:
+        finished = self.count("pulled", "present", "failed")
+        line = f"Pulling images {finished}/{len(self.pulls)} ({self.fraction:.0%})"
+        active = [pull.layer_totals() for pull in self.pulls.values() if pull.state == "pulling"]
+        active = [(downloaded, size) for downloaded, size in active if size]
+        if active:
+            downloaded = sum(done for done, _ in active)
+            line += f" · {format_bytes(downloaded)} of {format_bytes(sum(size for _, size in active))}"
+        return line
+
+    def report(self) -> str:
+        """Outcome once finished, e.g. "3 pulled · 2 already present · 1 failed"."""
+        parts = [f"{self.count(state)} {label}"
+                 for state, label in (("pulled", "pulled"), ("present", "already present"),
+                                      ("failed", "failed"))
+                 if self.count(state)]
+        return " · ".join(parts) or "nothing to pull"
+
+    def results(self) -> Dict[str, str]:
+        return {ref: pull.state for ref, pull in self.pulls.items()}
@@ -0,0 +1,63 @@
+"""
+Multi-profile Colima management
+"""
+from typing import Callable, Dict, Iterable, List, Optional
+import asyncio
+from .colima import DEFAULT_PROFILE, ColimaProfile, list_profiles
+from .docker_service import DockerService
+from ..console import console
+
+class ProfileManager:
+    """Discovers Colima profiles and keeps one DockerService per profile.
+
+    Services are created on first use and kept, so switching between
+    profiles reuses their already-connected clients.
+    """
+
+    def __init__(self, default_service: Optional[DockerService] = None):
+        self.profiles: List[ColimaProfile] = []
+        self._services: Dict[str, DockerService] = {}
+        if default_service is not None:
+            self._services[default_service.profile or DEFAULT_PROFILE] = default_service
+
+    async def refresh(self) -> List[ColimaProfile]:
+        """Re-read the profile list from Colima."""
+        try:
+            self.profiles = await list_profiles()
+        except Exception as e:
+            console.print(f"[red]Error listing Colima profiles: {e}[/red]")
+        return self.profiles
+
+    def service(self, profile: str) -> DockerService:
+        """Return the DockerService bound to a profile's socket."""
+        if profile not in self._services:
+            self._services[profile] = DockerService(profile=profile)
+        return self._services[profile]
+
+    def services(self) -> Dict[str, DockerService]:
+        return dict(self._services)
+
+    async def start_profiles(self, names: Iterable[str],
+                             on_phase: Optional[Callable[[str, str, str], None]] = None) -> Dict[str, bool]:
+        """Start several profiles concurrently; on_phase gets (profile, phase, message)."""
+        names = list(names)
+
+        async def start(name: str) -> bool:
+            callback = (lambda phase, message: on_phase(name, phase, message)) if on_phase else None
+            return await self.service(name).start_colima(callback)
+
+        results = await asyncio.gather(*(start(name) for name in names))
+        await self.refresh()
+        return dict(zip(names, results))
+
+    async def stop_profiles(self, names: Iterable[str]) -> Dict[str, bool]:
+        """Stop several profiles concurrently."""
+        names = list(names)
+        results = await asyncio.gather(*(self.service(name).stop_colima() for name in names))
+        await self.refresh()
+        return dict(zip(names, results))
+
+    def shutdown(self) -> None:
+        for service in self._services.values():
+            service.stop_watching()
+            service.shutdown()
@@ -0,0 +1,140 @@
+"""
+Adaptive, coalescing refresh scheduling
+"""
+from typing import Awaitable, Callable, List, Optional
+import asyncio
+import time
+from .metrics import metrics
+from ..console import console
+
+class RefreshScheduler:
+    """Runs a refresh coroutine on an adaptive interval, never two at once.
+
+    Requests made while a refresh is in flight are coalesced into a single
+    follow-up run. Polling speeds up for a while after user actions, daemon
+    up/down transitions and system wake-ups, slows down while the menu sits
+    unused, backs off while the daemon is down, and stops entirely after a
+    long time unused until touch() is called again.
+
+    `refresh` returns whether the daemon is up (or None if unknown).
+    """
+
+    FAST_INTERVAL = 2.0
+    NORMAL_INTERVAL = 15.0
+    IDLE_INTERVAL = 60.0
+    DOWN_INTERVAL_MAX = 120.0
+    # How long polling stays fast after a user action or state transition
+    FAST_PERIOD = 30.0
+    # Menu unused for this long: poll at IDLE_INTERVAL, then stop polling
+    IDLE_AFTER = 300.0
+    PAUSE_AFTER = 1800.0
+    # Wall-clock time running ahead of monotonic time by this much means the machine slept
+    SLEEP_GAP = 30.0
+
+    def __init__(self, refresh: Callable[[], Awaitable[Optional[bool]]]):
+        self._refresh = refresh
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._waiters: List[asyncio.Future] = []
+        self._fast_until = 0.0
+        self._last_used = time.monotonic()
+        self._alive: Optional[bool] = None
+        self._down_runs = 0
+        self.in_flight = False
+
+    def start(self) -> None:
+        """Start the scheduling loop on the running event loop."""
+        if self._task is None:
+            wakeup = self._wakeup = asyncio.Event()
+            self._task = asyncio.ensure_future(self._run(wakeup))
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for waiter in self._waiters:
+            waiter.cancel()
+        self._waiters = []
+
+    @property
+    def paused(self) -> bool:
+        return time.monotonic() - self._last_used > self.PAUSE_AFTER
+
+    def touch(self) -> None:
+        """Note that the user looked at the menu; resumes polling if it was paused."""
+        was_paused = self.paused
+        self._last_used = time.monotonic()
+        if was_paused:
+            self.request()
+
+    def request(self, fast: bool = False) -> None:
+        """Ask for a refresh soon; `fast` also marks a user action."""
+        if fast:
+            self._last_used = time.monotonic()
+            self._fast_until = self._last_used + self.FAST_PERIOD
+        if self.in_flight:
+            metrics.increment("refresh_coalesced")
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def refresh(self, fast: bool = True) -> None:
+        """Request a refresh and wait for one that started after this call to finish."""
+        if self._task is None:
+            await self._refresh()
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.request(fast)
+        await waiter
+
+    def interval(self) -> Optional[float]:
+        """Seconds until the next scheduled refresh, or None while paused."""
+        now = time.monotonic()
+        unused = now - self._last_used
+        if unused > self.PAUSE_AFTER:
+            return None
+        if now < self._fast_until:
+            return self.FAST_INTERVAL
+        if self._alive is False:
+            return min(self.NORMAL_INTERVAL * 2 ** self._down_runs, self.DOWN_INTERVAL_MAX)
+        if unused > self.IDLE_AFTER:
+            return self.IDLE_INTERVAL
+        return self.NORMAL_INTERVAL
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        while True:
+            mono, wall = time.monotonic(), time.time()
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.interval())
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+
+            if (time.time() - wall) - (time.monotonic() - mono) > self.SLEEP_GAP:
+                # Just woke up: the VM may have died or the clock jumped, look closely
+                self._fast_until = time.monotonic() + self.FAST_PERIOD
+            elif self.paused and not self._waiters:
+                continue
+
+            waiters, self._waiters = self._waiters, []
+            self.in_flight = True
+            alive = None
+            try:
+                alive = await self._refresh()
+            except Exception as e:
+                console.print(f"[red]Error refreshing: {e}[/red]")
+            finally:
+                self.in_flight = False
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_result(None)
+            self._record(alive)
+
+    def _record(self, alive: Optional[bool]) -> None:
+        if alive is None:
+            return
+        if self._alive is not None and alive != self._alive:
+            # Daemon came up or went away: follow the transition closely
+            self._fast_until = time.monotonic() + self.FAST_PERIOD
+        self._down_runs = 0 if alive else self._down_runs + 1
+        self._alive = alive
@@ -0,0 +1,248 @@
+"""
+VM right-sizing: rolling usage history and recommended Colima resources
+"""
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import asyncio
+import json
+import math
+import os
+import time
+from .colima import GIB, VMResources, profile_args
+from .docker_service import DockerService
+from .idle import Suspender
+from .metrics import write_json_atomic
+from .paths import cache_dir
+from .stats import RingBuffer
+from ..console import console
+
+# One shell round trip for everything the VM itself knows about its load
+VM_PROBE = "cat /proc/loadavg /proc/meminfo; df -Pk /var/lib/docker"
+
+MIN_SAMPLES = 60  # an hour of per-minute samples
+HEADROOM = 1.25
+MIN_CPUS = 2  # Colima's defaults
+MIN_MEMORY = 2  # GiB
+HOST_MEMORY_SHARE = 0.75
+DISK_HEADROOM = 1.5
+DISK_STEP = 10  # GiB
+
+def history_path(profile: Optional[str]) -> str:
+    return os.path.join(cache_dir(), f"usage-{profile or 'default'}.json")
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of the known (non-NaN) values."""
+    known = sorted(v for v in values if not math.isnan(v))
+    if not known:
+        return None
+    return known[min(len(known) - 1, max(0, math.ceil(q / 100 * len(known)) - 1))]
+
+def parse_vm_probe(output: str) -> Dict[str, float]:
+    """Load average, used memory and used disk (bytes) from VM_PROBE output."""
+    usage: Dict[str, float] = {}
+    meminfo: Dict[str, float] = {}
+    lines = output.splitlines()
+    for line in lines:
+        fields = line.split()
+        if len(fields) >= 5 and "/" in fields[3] and "load" not in usage:
+            usage["load"] = float(fields[0])  # /proc/loadavg: 1-minute average first
+        elif len(fields) >= 2 and fields[0].endswith(":"):
+            meminfo[fields[0][:-1]] = float(fields[1]) * 1024  # kB
+    if "MemTotal" in meminfo and "MemAvailable" in meminfo:
+        usage["memory"] = meminfo["MemTotal"] - meminfo["MemAvailable"]
+    # df -P: a "Filesystem" header, then one line per filesystem whose first
+    # field may be a device, "overlay" or anything else; the third is used 1K blocks
+    header = next((i for i, line in enumerate(lines) if line.startswith("Filesystem")), None)
+    if header is not None:
+        for line in reversed(lines[header + 1:]):
+            fields = line.split()
+            if len(fields) >= 3 and fields[2].isdigit():
+                usage["disk"] = float(fields[2]) * 1024
+                break
+    return usage
+
+async def probe_vm(profile: Optional[str]) -> Dict[str, float]:
+    """Ask the Colima VM for its own load, memory and disk; {} if it cannot be reached."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "colima", "ssh", *profile_args(profile), "--", "sh", "-c", VM_PROBE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+    except Exception as e:
+        console.print(f"[red]Error probing the Colima VM: {e}[/red]")
+        return {}
+    if process.returncode != 0:
+        return {}
+    return parse_vm_probe(stdout.decode(errors="replace"))
+
+class UsageHistory:
+    """What the VM used, one sample per interval, in fixed-size buffers.
+
+    CPU is in busy cores, memory and disk in GiB; NaN marks a value that
+    could not be measured. A day of per-minute samples is about 35 KiB.
+    """
+
+    FIELDS = ("cpu", "memory", "disk")
+
+    def __init__(self, capacity: int = 1440):
+        self.capacity = capacity
+        self.buffers = {name: RingBuffer(capacity) for name in self.FIELDS}
+        self.updated_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self.buffers["cpu"])
+
+    def add(self, cpu: Optional[float], memory: Optional[float], disk: Optional[float]) -> None:
+        for name, value in zip(self.FIELDS, (cpu, memory, disk)):
+            self.buffers[name].append(math.nan if value is None else value)
+        self.updated_at = time.time()
+
+    def values(self, name: str) -> List[float]:
+        return self.buffers[name].values()
+
+    def to_dict(self) -> dict:
+        # Rounded and without indentation: this is rewritten every few minutes
+        return {
+            "updated_at": self.updated_at,
+            **{name: [None if math.isnan(v) else round(v, 2) for v in self.values(name)]
+               for name in self.FIELDS},
+        }
+
+    def save(self, path: str) -> None:
+        write_json_atomic(path, self.to_dict(), indent=None)
+
+    @classmethod
+    def load(cls, path: str, capacity: int = 1440) -> "UsageHistory":
+        """Read a saved history; a missing or unreadable file gives an empty one."""
+        history = cls(capacity)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            columns = [data[name] for name in cls.FIELDS]
+            for row in zip(*columns):
+                history.add(*row)
+            history.updated_at = float(data.get("updated_at", 0.0))
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return history
+
+class UsageSampler:
+    """Adds one sample to a history: the VM's own view where it can be
+    reached, otherwise the containers' stats (which miss the daemon and
+    kernel, so memory gets a fixed allowance for those)."""
+
+    DAEMON_MEMORY = 0.5  # GiB
+    PROBE_INTERVAL = 300  # seconds; each probe is a `colima ssh` round trip
+
+    def __init__(self, service: DockerService, history: Optional[UsageHistory] = None):
+        self.service = service
+        self.path = history_path(service.profile)
+        self.history = history if history is not None else UsageHistory.load(self.path)
+        self._vm: Dict[str, float] = {}
+        self._probed_at: Optional[float] = None
+
+    async def _probe(self) -> Dict[str, float]:
+        """The VM's own view, reused between probes (a failed probe is cached too)."""
+        now = time.monotonic()
+        if self._probed_at is None or now - self._probed_at >= self.PROBE_INTERVAL:
+            self._vm = await probe_vm(self.service.profile)
+            self._probed_at = now
+        return self._vm
+
+    async def sample(self) -> None:
+        vm = await self._probe() if not self.service.host else {}
+        cpu = self.service.aggregate_cpu(60)
+        cores = None if cpu is None else cpu / 100
+        if "load" in vm:
+            cores = max(vm["load"], cores or 0.0)
+        memory = self.service.aggregate_memory()
+        memory_gib: Optional[float]
+        if "memory" in vm:
+            memory_gib = vm["memory"] / GIB
+        else:
+            memory_gib = None if memory is None else memory / GIB + self.DAEMON_MEMORY
+        disk = vm.get("disk")
+        self.history.add(cores, memory_gib, None if disk is None else disk / GIB)
+
+    def save(self) -> None:
+        try:
+            self.history.save(self.path)
+        except OSError as e:
+            console.print(f"[red]Error saving usage history: {e}[/red]")
+
+@dataclass
+class Recommendation:
+    current: VMResources
+    recommended: VMResources
+    samples: int
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.recommended != self.current
+
+def host_resources() -> VMResources:
+    """CPUs and memory of this machine; disk is not bounded here."""
+    try:
+        memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // GIB
+    except (ValueError, OSError, AttributeError):
+        memory = 0
+    return VMResources(os.cpu_count() or 1, memory, 0)
+
+def recommend(history: UsageHistory, current: VMResources,
+              host: Optional[VMResources] = None) -> Optional[Recommendation]:
+    """Size the VM for the 95th percentile of what it used, plus headroom.
+
+    Returns None until MIN_SAMPLES were taken. CPU and memory follow usage
+    both ways, within what the host can give (CPUs, HOST_MEMORY_SHARE of
+    its memory). Colima disks cannot shrink, so disk only ever grows, in
+    DISK_STEP GiB steps once usage plus headroom outgrows it.
+    """
+    if len(history) < MIN_SAMPLES:
+        return None
+    host = host or host_resources()
+    reasons: List[str] = []
+
+    cpus = current.cpus
+    cpu = percentile(history.values("cpu"), 95)
+    if cpu is not None:
+        wanted = max(MIN_CPUS, math.ceil(cpu * HEADROOM))
+        cpus = max(1, min(host.cpus, wanted))
+        if cpus != current.cpus:
+            reasons.append(f"CPU: 95% of the time at most {cpu:.1f} cores busy"
+                           + (f" (host has {host.cpus})" if cpus < wanted else ""))
+
+    memory = current.memory
+    used = percentile(history.values("memory"), 95)
+    if used is not None:
+        limit = max(MIN_MEMORY, int(host.memory * HOST_MEMORY_SHARE)) if host.memory else None
+        wanted = max(MIN_MEMORY, math.ceil(used * HEADROOM))
+        memory = wanted if limit is None else min(limit, wanted)
+        if memory != current.memory:
+            reasons.append(f"Memory: 95% of the time at most {used:.1f} GiB in use"
+                           + (f" (capped at {limit} GiB of the host's {host.memory})"
+                              if memory < wanted else ""))
+
+    disk = current.disk
+    disk_values = [v for v in history.values("disk") if not math.isnan(v)]
+    if disk_values:
+        needed = max(disk_values) * DISK_HEADROOM
+        if needed > current.disk:
+            disk = math.ceil(needed / DISK_STEP) * DISK_STEP
+            reasons.append(f"Disk: up to {max(disk_values):.0f} GiB used")
+
+    return Recommendation(current, VMResources(cpus, memory, disk), len(history), reasons)
+
+async def resize(service: DockerService, resources: VMResources,
+                 on_phase: Optional[Callable[[str, str], None]] = None) -> Optional[Dict[str, bool]]:
+    """Restart Colima with `resources`, bringing the running containers back.
+
+    Returns the per-container start results, or None if the VM did not
+    come back up.
+    """
+    suspender = Suspender(service)
+    if await service.is_docker_running() and not await suspender.suspend():
+        return None
+    return await suspender.resume(on_phase, resources)
@@ -0,0 +1,70 @@
+"""
+Last-known daemon state, saved so the menu can be drawn before the daemon answers
+"""
+from dataclasses import dataclass, field, fields
+from typing import List, Optional
+import json
+import os
+import time
+from .docker_service import ContainerInfo
+from .metrics import write_json_atomic
+from .paths import cache_dir
+
+# Bump when the file layout changes; older files are ignored
+SNAPSHOT_VERSION = 2
+
+# Every ContainerInfo field, in the order rows are written
+CONTAINER_COLUMNS = [f.name for f in fields(ContainerInfo)]
+
+def snapshot_path(profile: Optional[str]) -> str:
+    return os.path.join(cache_dir(), f"state-{profile or 'default'}.json")
+
+@dataclass
+class StateSnapshot:
+    """What the menu showed last time: daemon status and the container list."""
+
+    docker_running: bool
+    containers: List[ContainerInfo]
+    saved_at: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        # Containers as rows rather than objects keeps the file small with thousands of them;
+        # the column names are stored once, so rows are read back by name
+        return {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": self.saved_at,
+            "docker_running": self.docker_running,
+            "columns": CONTAINER_COLUMNS,
+            "containers": [[getattr(c, column) for column in CONTAINER_COLUMNS]
+                           for c in self.containers],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StateSnapshot":
+        # Columns this version doesn't know are dropped; missing ones keep their defaults
+        columns = [(i, name) for i, name in enumerate(data["columns"]) if name in CONTAINER_COLUMNS]
+        return cls(
+            docker_running=bool(data["docker_running"]),
+            containers=[ContainerInfo(**{name: row[i] for i, name in columns})
+                        for row in data["containers"]],
+            saved_at=data["saved_at"],
+        )
+
+    def save(self, path: str) -> None:
+        write_json_atomic(path, self.to_dict(), indent=None)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["StateSnapshot"]:
+        """The saved snapshot, or None if there is none or it can't be used."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get("version") != SNAPSHOT_VERSION:
+                return None
+            return cls.from_dict(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.saved_at
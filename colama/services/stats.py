@@ -0,0 +1,184 @@
+"""
+Live container resource statistics
+"""
+from array import array
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional
+import threading
+from ..console import console
+
+if TYPE_CHECKING:
+    import docker
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+class RingBuffer:
+    """Fixed-capacity history of floats backed by a preallocated array."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, value: float) -> None:
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def last(self) -> Optional[float]:
+        if not self._size:
+            return None
+        return self._data[self._next - 1]
+
+    def values(self) -> List[float]:
+        """Return the buffered values, oldest first."""
+        start = (self._next - self._size) % self.capacity
+        return [self._data[(start + i) % self.capacity] for i in range(self._size)]
+
+def sparkline(values: List[float], maximum: Optional[float] = None) -> str:
+    """Render values as a row of block characters."""
+    if not values:
+        return ""
+    top = maximum if maximum else max(values)
+    if top <= 0:
+        return SPARK_CHARS[0] * len(values)
+    scale = len(SPARK_CHARS) - 1
+    return "".join(SPARK_CHARS[min(scale, max(0, round(v / top * scale)))] for v in values)
+
+def format_bytes(value: float) -> str:
+    """Format a byte count with binary units."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TiB"
+
+class ContainerStats:
+    """Rolling resource history for one container."""
+
+    def __init__(self, history: int):
+        self.cpu_percent = RingBuffer(history)
+        self.memory = RingBuffer(history)
+        self.net_rx = RingBuffer(history)  # bytes per sample interval
+        self.net_tx = RingBuffer(history)
+        self.memory_limit = 0.0
+        self._last_rx: Optional[float] = None
+        self._last_tx: Optional[float] = None
+
+    def add_sample(self, sample: dict) -> None:
+        """Fold one decoded sample from the stats stream into the history."""
+        cpu = sample.get("cpu_stats") or {}
+        precpu = sample.get("precpu_stats") or {}
+        cpu_delta = (cpu.get("cpu_usage", {}).get("total_usage", 0)
+                     - precpu.get("cpu_usage", {}).get("total_usage", 0))
+        system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+        online = cpu.get("online_cpus") or len(cpu.get("cpu_usage", {}).get("percpu_usage") or []) or 1
+        self.cpu_percent.append(
+            cpu_delta / system_delta * online * 100.0 if cpu_delta > 0 and system_delta > 0 else 0.0
+        )
+
+        memory = sample.get("memory_stats") or {}
+        detail = memory.get("stats") or {}
+        # Match `docker stats`: page cache is not counted as used memory
+        cache = detail.get("inactive_file", detail.get("total_inactive_file", detail.get("cache", 0)))
+        self.memory.append(max(0.0, float(memory.get("usage", 0) - cache)))
+        self.memory_limit = float(memory.get("limit", 0))
+
+        networks = (sample.get("networks") or {}).values()
+        rx = float(sum(n.get("rx_bytes", 0) for n in networks))
+        tx = float(sum(n.get("tx_bytes", 0) for n in networks))
+        if self._last_rx is not None and self._last_tx is not None:
+            self.net_rx.append(max(0.0, rx - self._last_rx))
+            self.net_tx.append(max(0.0, tx - self._last_tx))
+        self._last_rx, self._last_tx = rx, tx
+
+    def summary(self) -> str:
+        """Multi-line text with current values and sparklines."""
+        if not len(self.cpu_percent):
+            return "Collecting stats..."
+        cpu = self.cpu_percent.values()
+        memory = self.memory.values()
+        lines = [
+            f"CPU {cpu[-1]:.1f}%  {sparkline(cpu)}",
+            f"Mem {format_bytes(memory[-1])}"
+            + (f" / {format_bytes(self.memory_limit)}" if self.memory_limit else "")
+            + f"  {sparkline(memory, self.memory_limit or None)}",
+        ]
+        rx, tx = self.net_rx.last(), self.net_tx.last()
+        if rx is not None and tx is not None:
+            lines.append(f"Net ↓ {format_bytes(rx)}/s  ↑ {format_bytes(tx)}/s")
+        return "\n".join(lines)
+
+class StatsCollector:
+    """Runs one streaming stats reader per running container.
+
+    Readers are started and stopped by `sync()` as containers change state,
+    and feed fixed-size histories so memory stays flat over long uptimes.
+    """
+
+    def __init__(self, connect: Callable[[], "docker.DockerClient"], history: int = 60,
+                 max_streams: int = 64):
+        self._connect = connect
+        self.history = history
+        self.max_streams = max_streams
+        self._client: Optional["docker.DockerClient"] = None
+        self._stats: Dict[str, ContainerStats] = {}
+        self._readers: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._client_lock = threading.Lock()
+
+    def get(self, container_id: str) -> Optional[ContainerStats]:
+        return self._stats.get(container_id)
+
+    def sync(self, running: Iterable[str], known: Iterable[str]) -> None:
+        """Match readers to the running containers and drop stats for removed ones."""
+        running = set(running)
+        known = set(known) | running
+        with self._lock:
+            for container_id in list(self._readers):
+                if container_id not in running:
+                    self._readers.pop(container_id).set()
+            for container_id in list(self._stats):
+                if container_id not in known:
+                    del self._stats[container_id]
+            for container_id in running - self._readers.keys():
+                if len(self._readers) >= self.max_streams:
+                    break
+                stop = threading.Event()
+                self._readers[container_id] = stop
+                self._stats.setdefault(container_id, ContainerStats(self.history))
+                threading.Thread(
+                    target=self._read, args=(container_id, stop),
+                    name=f"colama-stats-{container_id}", daemon=True
+                ).start()
+
+    def stop_all(self) -> None:
+        with self._lock:
+            for stop in self._readers.values():
+                stop.set()
+            self._readers.clear()
+
+    def _read(self, container_id: str, stop: threading.Event) -> None:
+        try:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._connect()
+            stream = self._client.api.stats(container_id, stream=True, decode=True)
+            for sample in stream:
+                # Samples arrive about once a second, which bounds shutdown latency
+                if stop.is_set():
+                    break
+                stats = self._stats.get(container_id)
+                if stats is None:
+                    break
+                stats.add_sample(sample)
+        except Exception as e:
+            if not stop.is_set():
+                console.print(f"[red]Error reading stats for {container_id}: {e}[/red]")
+        finally:
+            with self._lock:
+                if self._readers.get(container_id) is stop:
+                    del self._readers[container_id]
@@ -0,0 +1,235 @@
+"""
+Containers submenu that scales to thousands of containers
+"""
+from typing import Callable, Dict, Iterator, List, Optional
+from PySide6.QtWidgets import QLineEdit, QMenu, QWidgetAction
+from PySide6.QtGui import QAction, QIcon
+from PySide6.QtCore import Qt, Slot
+from ..services.docker_service import ContainerInfo
+
+class ContainerRow(QAction):
+    """One container's row; update_row keeps the fields its actions read current."""
+
+    def __init__(self, container_id: str, parent: QMenu):
+        super().__init__(parent)
+        self.container_id = container_id
+        self.container_name = ""
+        self.is_running = False
+        self.warning = ""  # "unhealthy", "restarting" or ""
+        # Rows of other endpoints: the endpoint's name and the ID on that daemon
+        self.endpoint: Optional[str] = None
+        self.target_id = container_id
+
+class ContainerListMenu(QMenu):
+    """Container rows, grouped into submenus that are only built when opened.
+
+    set_containers() just stores the list. Qt actions are created or updated
+    when the menu is about to show (or straight away if it is open), at most
+    MAX_ROWS rows and MAX_ROWS groups are materialized, and stopped
+    containers collapse into a "Stopped (N)" submenu, so the cost of a
+    refresh depends on what is visible rather than on the container count.
+    """
+
+    MAX_ROWS = 50
+
+    def __init__(self, title: str, update_row: Callable[[ContainerRow, ContainerInfo], None],
+                 state_icon: Callable[[bool], QIcon],
+                 on_select: Optional[Callable[[ContainerRow], None]] = None,
+                 row_menu: Optional[Callable[[ContainerRow, QMenu], QMenu]] = None,
+                 group_header: Optional[Callable[[str, QMenu], None]] = None,
+                 parent: Optional[QMenu] = None, grouped: bool = False, collapse_exited: bool = True):
+        super().__init__(title, parent)
+        self._update_row = update_row
+        self._state_icon = state_icon
+        self._on_select = on_select
+        self._row_menu = row_menu  # builds the per-container submenu of a new row
+        self._group_header = group_header  # adds actions above a new group's rows
+        self._grouped = grouped
+        self._collapse_exited = collapse_exited
+
+        self._containers: List[ContainerInfo] = []
+        self._dirty = False
+        self._filter = ""
+        self._search: Optional[QLineEdit] = None
+        self._jumped = False
+
+        # Actions currently laid out after the header, in order
+        self._items: List[QAction] = []
+        self._rows: Dict[str, ContainerRow] = {}
+        self._row_snapshot: Dict[str, ContainerInfo] = {}
+        self._groups: Dict[str, "ContainerListMenu"] = {}
+        self._stopped: Optional["ContainerListMenu"] = None
+        self._overflow = QAction(self)
+        self._overflow.setEnabled(False)
+
+        self.setToolTipsVisible(True)
+        self.aboutToShow.connect(self._refresh_if_dirty)
+
+    def _child(self, title: str, grouped: bool = False, collapse_exited: bool = True) -> "ContainerListMenu":
+        return ContainerListMenu(title, self._update_row, self._state_icon, self._on_select,
+                                 self._row_menu, self._group_header, parent=self,
+                                 grouped=grouped, collapse_exited=collapse_exited)
+
+    def rows(self, visible_only: bool = False) -> Iterator[ContainerRow]:
+        """Yield the container rows built so far in this menu and its submenus."""
+        if visible_only and not self.isVisible():
+            return
+        yield from self._rows.values()
+        for menu in list(self._groups.values()) + ([self._stopped] if self._stopped else []):
+            yield from menu.rows(visible_only)
+
+    def set_containers(self, containers: List[ContainerInfo]):
+        """Store the new list; rows are rebuilt now only if the menu is open."""
+        self._containers = containers
+        self._dirty = True
+        if self.isVisible():
+            self.refresh()
+
+    def add_search_field(self, placeholder: str = "Search containers...") -> QLineEdit:
+        """Add a type-to-filter field at the current end of the header."""
+        self._search = QLineEdit()
+        self._search.setPlaceholderText(placeholder)
+        self._search.setClearButtonEnabled(True)
+        self._search.textChanged.connect(self._set_filter)
+        self._search.returnPressed.connect(self._jump_to_first_match)
+        action = QWidgetAction(self)
+        action.setDefaultWidget(self._search)
+        self.addAction(action)
+        self.aboutToHide.connect(self._search.clear)
+        return self._search
+
+    @Slot(str)
+    def _set_filter(self, text: str):
+        self._filter = text.strip().lower()
+        self.refresh()
+
+    @Slot()
+    def _jump_to_first_match(self):
+        row = next((a for a in self._items if isinstance(a, ContainerRow)), None)
+        if row is not None:
+            self.setFocus()
+            self.setActiveAction(row)
+            # QLineEdit passes Return on to the menu, which would trigger the row
+            self._jumped = True
+
+    def keyPressEvent(self, event):
+        if self._jumped and event.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            self._jumped = False
+            return
+        self._jumped = False
+        # Start typing anywhere in the menu to search
+        if self._search is not None:
+            text = event.text()
+            if text.isprintable() and text.strip():
+                self._search.insert(text)
+                return
+            if event.key() == Qt.Key.Key_Backspace and self._search.text():
+                self._search.backspace()
+                return
+        super().keyPressEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        # Ctrl/Cmd-click selects a container instead of opening its submenu
+        if self._on_select and event.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            action = self.actionAt(event.position().toPoint())
+            if isinstance(action, ContainerRow):
+                self._on_select(action)
+                return  # keep the menu open while selecting
+        super().mouseReleaseEvent(event)
+
+    @Slot()
+    def _refresh_if_dirty(self):
+        if self._dirty:
+            self.refresh()
+
+    def refresh(self):
+        """Bring the visible rows and groups in line with the stored list."""
+        self._dirty = False
+        groups: Dict[str, List[ContainerInfo]] = {}
+        rows: List[ContainerInfo] = []
+        stopped: List[ContainerInfo] = []
+        if self._filter:
+            rows = [c for c in self._containers if self._matches(c)]
+        else:
+            for c in self._containers:
+                if self._grouped and c.group:
+                    groups.setdefault(c.group, []).append(c)
+                elif self._collapse_exited and not c.is_running:
+                    stopped.append(c)
+                else:
+                    rows.append(c)
+
+        items: List[QAction] = []
+        names = sorted(groups)
+        items += self._sync_groups({name: groups[name] for name in names[:self.MAX_ROWS]})
+        items += self._sync_rows(rows[:self.MAX_ROWS])
+
+        hidden = max(0, len(names) - self.MAX_ROWS) + max(0, len(rows) - self.MAX_ROWS)
+        if hidden:
+            self._overflow.setText(f"{hidden} more - type to search")
+            items.append(self._overflow)
+
+        if stopped:
+            if self._stopped is None:
+                self._stopped = self._child("Stopped", collapse_exited=False)
+            self._stopped.setTitle(f"Stopped ({len(stopped)})")
+            self._stopped.set_containers(stopped)
+            items.append(self._stopped.menuAction())
+        elif self._stopped is not None:
+            self._stopped.set_containers([])
+
+        if items != self._items:
+            for action in self._items:
+                self.removeAction(action)
+            self.addActions(items)
+            self._items = items
+
+    def _matches(self, container: ContainerInfo) -> bool:
+        text = self._filter
+        # Rows from other endpoints are keyed "endpoint/container ID"
+        container_id = container.container_id.rpartition("/")[2]
+        return (text in container.name.lower() or text in container.image.lower()
+                or text in container.group.lower() or container_id.startswith(text))
+
+    def _sync_groups(self, groups: Dict[str, List[ContainerInfo]]) -> List[QAction]:
+        for name in self._groups.keys() - groups.keys():
+            self._groups.pop(name).deleteLater()
+
+        items = []
+        for name, containers in groups.items():
+            menu = self._groups.get(name)
+            if menu is None:
+                menu = self._groups[name] = self._child(name)
+                if self._group_header is not None:
+                    self._group_header(name, menu)
+            running = sum(c.is_running for c in containers)
+            title = f"{name} ({running}/{len(containers)} running)"
+            if menu.title() != title:
+                menu.setTitle(title)
+                menu.setIcon(self._state_icon(running > 0))
+            menu.set_containers(containers)
+            items.append(menu.menuAction())
+        return items
+
+    def _sync_rows(self, containers: List[ContainerInfo]) -> List[QAction]:
+        current = {c.container_id: c for c in containers}
+        for container_id in self._row_snapshot.keys() - current.keys():
+            removed = self._rows.pop(container_id)
+            if removed.menu() is not None:
+                removed.menu().deleteLater()
+            removed.deleteLater()
+
+        items: List[QAction] = []
+        for container in containers:
+            action = self._rows.get(container.container_id)
+            if action is None:
+                action = ContainerRow(container.container_id, self)
+                self._rows[container.container_id] = action
+                if self._row_menu is not None:
+                    action.setMenu(self._row_menu(action, self))
+                self._update_row(action, container)
+            elif self._row_snapshot[container.container_id] != container:
+                self._update_row(action, container)
+            items.append(action)
+        self._row_snapshot = current
+        return items
@@ -0,0 +1,86 @@
+"""
+Disk usage submenu: totals, largest consumers and prune actions
+"""
+from typing import Dict, Optional
+from PySide6.QtWidgets import QMenu
+from PySide6.QtGui import QAction
+from PySide6.QtCore import Signal
+from ..services.disk_usage import PRUNE_TARGETS, DiskUsage
+from ..services.stats import format_bytes
+
+KIND_LABELS = {
+    "image": "Images",
+    "container": "Containers",
+    "volume": "Volumes",
+    "build-cache": "Build cache",
+}
+
+class DiskUsageMenu(QMenu):
+    """Shows the last system/df result; the owner fetches it and performs prunes.
+
+    All actions are created once and only relabelled, so showing the menu
+    never waits on the (slow) df call.
+    """
+
+    prune_requested = Signal(str)  # a PRUNE_TARGETS key
+    refresh_requested = Signal()
+
+    TOP = 10
+
+    def __init__(self, parent: Optional[QMenu] = None):
+        super().__init__("Disk usage", parent)
+        self._totals: Dict[str, QAction] = {}
+        for kind in KIND_LABELS:
+            self._totals[kind] = self._label("")
+
+        self.addSeparator()
+        self._label("Largest")
+        self._top = [self._label("") for _ in range(self.TOP)]
+
+        self.addSeparator()
+        self._prune: Dict[str, QAction] = {}
+        for target in PRUNE_TARGETS:
+            action = self.addAction("")
+            action.triggered.connect(lambda checked=False, t=target: self.prune_requested.emit(t))
+            self._prune[target] = action
+
+        self.addSeparator()
+        self._updated = self._label("")
+        self.refresh_action = self.addAction("Refresh now")
+        self.refresh_action.triggered.connect(self.refresh_requested.emit)
+        self.show_usage(None)
+
+    def _label(self, text: str) -> QAction:
+        action = self.addAction(text)
+        action.setEnabled(False)
+        return action
+
+    def show_usage(self, usage: Optional[DiskUsage], refreshing: bool = False):
+        """Relabel every row from `usage` (None: nothing fetched yet)."""
+        for kind, action in self._totals.items():
+            size = usage.totals.get(kind) if usage else None
+            action.setText(f"{KIND_LABELS[kind]}: {format_bytes(size) if size is not None else '-'}")
+
+        top = usage.top(self.TOP) if usage else []
+        for i, action in enumerate(self._top):
+            action.setVisible(i < len(top))
+            if i < len(top):
+                item = top[i]
+                kind = item.kind.replace("-", " ")
+                action.setText(f"{format_bytes(item.size)}  {item.name} ({kind}"
+                               + (")" if item.in_use else ", unused)"))
+
+        for target, action in self._prune.items():
+            estimate = usage.reclaimable[target] if usage else None
+            action.setText(f"Remove {PRUNE_TARGETS[target].lower()}"
+                           + (f" (~{format_bytes(estimate)})" if estimate is not None else ""))
+            action.setEnabled(estimate is not None and estimate > 0)
+
+        if refreshing:
+            self._updated.setText("Calculating...")
+        elif usage is None:
+            self._updated.setText("Not calculated yet")
+        else:
+            minutes = int(usage.age // 60)
+            self._updated.setText("Updated just now" if minutes == 0 else f"Updated {minutes} min ago")
+        self.refresh_action.setEnabled(not refreshing)
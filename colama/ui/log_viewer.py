@@ -0,0 +1,138 @@
+"""
+Lightweight log viewer window for one container
+"""
+from typing import Optional
+from PySide6.QtWidgets import (
+    QApplication, QCheckBox, QHBoxLayout, QLabel, QLineEdit, QPlainTextEdit, QVBoxLayout, QWidget,
+)
+from PySide6.QtGui import QFontDatabase, QTextCursor, QTextDocument
+from PySide6.QtCore import Qt, QTimer, Slot
+from ..services.logs import LogTail
+
+class LogViewer(QWidget):
+    """Shows a LogTail, following new lines until the user scrolls away.
+
+    Lines are pulled on a timer in batches of at most BATCH_LINES, so a
+    container writing thousands of lines per second costs one text insert
+    per tick. The view keeps the tail's line limit; anything the reader had
+    to drop while the view caught up is reported in the status line.
+    """
+
+    POLL_INTERVAL = 100  # milliseconds
+    BATCH_LINES = 2000
+
+    def __init__(self, tail: LogTail, title: str):
+        super().__init__()
+        self.tail = tail
+        self.setWindowTitle(f"Logs - {title}")
+        self.resize(900, 500)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        self.text.setMaximumBlockCount(tail.max_lines)
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.text.verticalScrollBar().valueChanged.connect(self._scrolled)
+
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Search (Enter: next, Shift+Enter: previous)")
+        self.search.setClearButtonEnabled(True)
+        self.search.textChanged.connect(lambda: self._find(from_start=True, backward=False))
+        self.search.returnPressed.connect(lambda: self._find())
+
+        self.follow = QCheckBox("Follow")
+        self.follow.setChecked(True)
+        self.follow.toggled.connect(self._follow_toggled)
+        self.status = QLabel()
+        self._appending = False
+
+        bar = QHBoxLayout()
+        bar.addWidget(self.search, 1)
+        bar.addWidget(self.follow)
+        layout = QVBoxLayout(self)
+        layout.addLayout(bar)
+        layout.addWidget(self.text, 1)
+        layout.addWidget(self.status)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.POLL_INTERVAL)
+        self.timer.timeout.connect(self._poll)
+        self.timer.start()
+
+    @Slot()
+    def _poll(self):
+        lines = self.tail.drain(self.BATCH_LINES)
+        if lines:
+            bar = self.text.verticalScrollBar()
+            position = bar.value()
+            # One insert per batch; scrolling caused by it is not the user's
+            self._appending = True
+            try:
+                self.text.appendPlainText("\n".join(lines))
+                bar.setValue(bar.maximum() if self.follow.isChecked() else position)
+            finally:
+                self._appending = False
+        self._update_status()
+        if not self.tail.running and not self.tail.backlog:
+            self.timer.stop()
+            self._update_status()
+
+    def _update_status(self):
+        parts = [f"{self.text.blockCount()} lines"]
+        if self.tail.backlog:
+            parts.append(f"{self.tail.backlog} queued")
+        if self.tail.dropped:
+            parts.append(f"{self.tail.dropped} skipped to keep up")
+        if self.tail.error:
+            parts.append(f"error: {self.tail.error}")
+        elif not self.tail.running:
+            parts.append("stream ended")
+        self.status.setText(" - ".join(parts))
+
+    @Slot(int)
+    def _scrolled(self, value: int):
+        # Scrolling up pauses following; scrolling back to the bottom resumes it
+        if self._appending:
+            return
+        at_bottom = value >= self.text.verticalScrollBar().maximum()
+        if self.follow.isChecked() != at_bottom:
+            self.follow.blockSignals(True)
+            self.follow.setChecked(at_bottom)
+            self.follow.blockSignals(False)
+
+    @Slot(bool)
+    def _follow_toggled(self, checked: bool):
+        if checked:
+            bar = self.text.verticalScrollBar()
+            bar.setValue(bar.maximum())
+
+    def _find(self, from_start: bool = False, backward: Optional[bool] = None):
+        """Incremental search; Shift+Enter searches backwards, wrapping around."""
+        needle = self.search.text()
+        if not needle:
+            return
+        if backward is None:
+            backward = bool(QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier)
+        flags = QTextDocument.FindFlag.FindBackward if backward else QTextDocument.FindFlag(0)
+        cursor = self.text.textCursor()
+        if from_start:
+            cursor.setPosition(cursor.selectionStart())
+        match = self.text.document().find(needle, cursor, flags)
+        if match.isNull():
+            wrap = QTextCursor(self.text.document())
+            if backward:
+                wrap.movePosition(QTextCursor.MoveOperation.End)
+            match = self.text.document().find(needle, wrap, flags)
+        if match.isNull():
+            self.search.setStyleSheet("color: #c0392b")
+            return
+        self.search.setStyleSheet("")
+        self.follow.setChecked(False)
+        self.text.setTextCursor(match)
+        self.text.centerCursor()
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.tail.stop()
+        super().closeEvent(event)
@@ -1,43 +1,86 @@
 import asyncio
+import dataclasses
+import functools
 import sys
 import os
-from typing import Optional
-from PySide6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QWidget
-from PySide6.QtGui import QIcon, QAction, QCursor
-from PySide6.QtCore import QTimer, Signal, QObject, Slot, Qt
+from typing import Dict, Iterable, List, Optional, Set
+from PySide6.QtWidgets import QApplication, QSystemTrayIcon, QMenu, QMessageBox, QWidget
+from PySide6.QtGui import QIcon, QAction
+from PySide6.QtCore import QTimer, Signal, QObject, Slot
 import qasync
+from ..console import console
+from ..services.colima import PHASE_LABELS
+from ..services.disk_usage import PRUNE_TARGETS
 from ..services.docker_service import DockerService, ContainerInfo
+from ..services.endpoints import LOCAL_ENDPOINT, EndpointFanout, configured_endpoints
+from ..services.idle import IdlePolicy, Suspender
+from ..services.incidents import Incident, IncidentTracker
+from ..services.metrics import metrics
+from ..services.prewarm import PullProgress
+from ..services.profiles import ProfileManager
+from ..services.scheduler import RefreshScheduler
+from ..services.sizing import Recommendation, UsageSampler, recommend, resize
+from ..services.snapshot import StateSnapshot, snapshot_path
+from ..services.stats import format_bytes
+from .containers_menu import ContainerListMenu, ContainerRow
+from .disk_menu import DiskUsageMenu
+from .log_viewer import LogViewer
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HOMEBREW_PREFIX = os.path.dirname(os.path.dirname(os.path.dirname(sys.executable)))  # /opt/homebrew/Cellar/co-lama/0.1.0
+
+@functools.lru_cache(maxsize=None)
+def resource_path(name: str) -> Optional[str]:
+    """Find a resource file, searched once per process."""
+    paths = [
+        os.path.join(BASE_DIR, 'resources', name),  # Development
+        os.path.join(HOMEBREW_PREFIX, 'resources', name),  # Homebrew installation
+        os.path.join(HOMEBREW_PREFIX, 'libexec', 'resources', name),  # Homebrew installation (libexec)
+    ]
+    path = next((path for path in paths if os.path.exists(path)), None)
+    if path is None:
+        print(f"Warning: Could not find {name}. Tried: {paths}")
+    return path
+
+@functools.lru_cache(maxsize=None)
+def load_icon(name: str) -> QIcon:
+    """Load a resource icon, shared by every action that uses it."""
+    path = resource_path(name)
+    return QIcon(path) if path else QIcon()
 
 class SignalEmitter(QObject):
     notify = Signal(str, str, str)  # title, message, info
+    containers_changed = Signal()  # emitted from the Docker events thread
+    progress = Signal(str)  # status line text for long-running operations
 
 class ColamaMenuBar(QSystemTrayIcon):
-    def __init__(self):
+    IDLE_SUSPEND_MINUTES = 30  # offered in the menu when --idle-suspend is not given
+
+    def __init__(self, profile: Optional[str] = None, endpoints: Iterable[str] = (),
+                 idle_suspend: Optional[float] = None):
         super().__init__()
         
         # Setup services and signals
-        self.docker_service = DockerService()
+        self.docker_service = DockerService(profile=profile)
+        self.suspender = Suspender(self.docker_service)
+        self.idle_minutes = idle_suspend or self.IDLE_SUSPEND_MINUTES
+        self._idle_suspend = idle_suspend is not None
+        self.idle_policy = IdlePolicy(self.idle_minutes * 60)
+        self.profiles = ProfileManager(self.docker_service)
+        self.active_profile = self.docker_service.profile or "default"
         self.signal_emitter = SignalEmitter()
         self.signal_emitter.notify.connect(self.show_notification)
+        self.signal_emitter.containers_changed.connect(self._schedule_containers_update)
+        self.signal_emitter.progress.connect(self._show_progress)
         
-        # Try to find the resource files in different locations
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        homebrew_prefix = os.path.dirname(os.path.dirname(os.path.dirname(sys.executable)))  # /opt/homebrew/Cellar/co-lama/0.1.0
-        
-        # Try to find the icon file in different locations
-        icon_paths = [
-            os.path.join(base_dir, 'resources', 'lama.icns'),  # Development
-            os.path.join(homebrew_prefix, 'resources', 'lama.icns'),  # Homebrew installation
-            os.path.join(homebrew_prefix, 'libexec', 'resources', 'lama.icns'),  # Homebrew installation (libexec)
-        ]
-        
-        icon_path = next((path for path in icon_paths if os.path.exists(path)), None)
-        if icon_path is None:
-            print(f"Warning: Could not find icon file. Tried: {icon_paths}")
-            return
+        # Extra daemons (contexts, other VMs, remote hosts) shown side by side
+        configured = configured_endpoints(endpoints)
+        self.endpoints = EndpointFanout(configured) if configured else None
         
         # Setup UI with proper icon path
-        self.setIcon(QIcon(icon_path))
+        if resource_path('lama.icns') is None:
+            return
+        self.setIcon(load_icon('lama.icns'))
         
         # Create menu
         self.menu = QMenu()
@@ -48,14 +91,50 @@ class ColamaMenuBar(QSystemTrayIcon):
         # Handle icon clicks
         self.activated.connect(self._handle_activation)
         
-        # Setup timers for updates
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self._update_docker_status)
-        self.status_timer.start(15000)  # 15 seconds
+        # Last known state is saved at most every few seconds, off the UI thread
+        self._docker_running = False
+        self._stale = False
+        self._saved_state: Optional[dict] = None
+        self.snapshot_timer = QTimer()
+        self.snapshot_timer.setSingleShot(True)
+        self.snapshot_timer.setInterval(5000)
+        self.snapshot_timer.timeout.connect(self._save_snapshot)
+        # Draw what we knew last time right away; the first refresh replaces it
+        self._restore_snapshot()
+        
+        # One status + containers refresh at a time, on an adaptive interval
+        self.scheduler = RefreshScheduler(self._refresh)
+        self.menu.aboutToShow.connect(self.scheduler.touch)
+        
+        # Coalesce bursts of container events (e.g. compose up) into one refresh
+        self.containers_debounce = QTimer()
+        self.containers_debounce.setSingleShot(True)
+        self.containers_debounce.setInterval(200)
+        self.containers_debounce.timeout.connect(self._update_containers)
+        
+        # The events stream keeps containers current; this is only a safety net
+        self.reconcile_timer = QTimer()
+        self.reconcile_timer.timeout.connect(self._reconcile_containers)
+        self.reconcile_timer.start(300000)  # 5 minutes
         
-        self.containers_timer = QTimer()
-        self.containers_timer.timeout.connect(self._update_containers)
-        self.containers_timer.start(10000)  # 10 seconds
+        self._watched_services: Set[int] = set()
+        self._watch_service(self.docker_service)
+        
+        # Start, stop, suspend or resize in progress: it owns the status line
+        # and keeps Start/Stop disabled until it is done
+        self._busy: Optional[str] = None
+        
+        # Idle check once a minute; cheap, it only reads the stats already collected
+        self.idle_timer = QTimer()
+        self.idle_timer.timeout.connect(self._check_idle)
+        self.idle_timer.start(60000)
+        
+        # VM usage history for right-sizing, one sample a minute, saved every few
+        self.sampler = UsageSampler(self.docker_service)
+        self._samples_unsaved = 0
+        self.usage_timer = QTimer()
+        self.usage_timer.timeout.connect(self._sample_usage_wrapper)
+        self.usage_timer.start(60000)
 
     def _handle_activation(self, reason):
         """Handle tray icon activation."""
@@ -70,6 +149,12 @@ class ColamaMenuBar(QSystemTrayIcon):
         self.status_action.setEnabled(False)
         self.menu.addAction(self.status_action)
         
+        # Pre-warm pulls after a start; only shown while they run
+        self.pull_action = QAction("")
+        self.pull_action.setEnabled(False)
+        self.pull_action.setVisible(False)
+        self.menu.addAction(self.pull_action)
+        
         self.menu.addSeparator()
         
         # Start Docker
@@ -82,12 +167,101 @@ class ColamaMenuBar(QSystemTrayIcon):
         self.stop_action.triggered.connect(self._stop_docker_wrapper)
         self.menu.addAction(self.stop_action)
         
+        # Cancel a slow start; only shown while Colima is starting
+        self.cancel_start_action = QAction("Cancel start")
+        self.cancel_start_action.triggered.connect(self._cancel_start_wrapper)
+        self.cancel_start_action.setVisible(False)
+        self.menu.addAction(self.cancel_start_action)
+        
+        # Stop the VM after a quiet period; Start/Resume brings the containers back
+        self.idle_action = QAction(f"Suspend when idle ({self.idle_minutes:g} min)")
+        self.idle_action.setCheckable(True)
+        self.idle_action.setChecked(self._idle_suspend)
+        self.idle_action.toggled.connect(lambda _: self.idle_policy.mark_active())
+        self.menu.addAction(self.idle_action)
+        
+        # Offered once enough usage history says the VM is too small or too big
+        self.resize_action = QAction("Resize VM")
+        self.resize_action.triggered.connect(self._resize_vm_wrapper)
+        self.resize_action.setVisible(False)
+        self.menu.addAction(self.resize_action)
+        self._recommendation: Optional[Recommendation] = None
+        
+        # Colima profiles, refreshed from `colima list` whenever the menu opens
+        self.profiles_menu = self.menu.addMenu("Profiles")
+        self.profiles_menu.aboutToShow.connect(self._refresh_profiles_wrapper)
+        self.start_profiles_action = QAction("Start all stopped profiles")
+        self.start_profiles_action.triggered.connect(self._start_stopped_profiles_wrapper)
+        self.profiles_menu.addAction(self.start_profiles_action)
+        self.profiles_separator = self.profiles_menu.addSeparator()
+        self._profile_menus: Dict[str, QMenu] = {}
+        
         self.menu.addSeparator()
         
-        # Create containers menu but don't add it yet
-        self.containers_menu = QMenu("Containers")
+        # Create containers menu but don't add it yet; rows are built lazily,
+        # grouped by Compose project, with stopped containers collapsed
+        self.containers_menu = ContainerListMenu(
+            "Containers", self._update_container_action, self._state_icon,
+            on_select=self._toggle_selection, row_menu=self._container_row_menu,
+            group_header=self._project_header, grouped=True,
+        )
         self.containers_menu_action = None  # Will be added/removed dynamically
         
+        self.cleanup_action = QAction("Remove stopped containers")
+        self.cleanup_action.triggered.connect(self._remove_stopped_containers_wrapper)
+        self.containers_menu.addAction(self.cleanup_action)
+        
+        # Disk usage from system/df: shown from cache, refetched in the background
+        self.disk_menu = DiskUsageMenu(self.containers_menu)
+        self.containers_menu.addMenu(self.disk_menu)
+        self.disk_menu.aboutToShow.connect(lambda: self._disk_usage_wrapper(False))
+        self.disk_menu.refresh_requested.connect(lambda: self._disk_usage_wrapper(True))
+        self.disk_menu.prune_requested.connect(self._prune_wrapper)
+        
+        # Bulk actions; Ctrl/Cmd-click containers to select them
+        self.bulk_menu = self.containers_menu.addMenu("Bulk actions")
+        self.start_all_action = self.bulk_menu.addAction("Start all stopped")
+        self.start_all_action.triggered.connect(lambda: self._bulk_action_wrapper("start", False))
+        self.stop_all_action = self.bulk_menu.addAction("Stop all running")
+        self.stop_all_action.triggered.connect(lambda: self._bulk_action_wrapper("stop", True))
+        self.bulk_menu.addSeparator()
+        self.restart_selection_action = self.bulk_menu.addAction("Restart selection")
+        self.restart_selection_action.triggered.connect(lambda: self._bulk_action_wrapper("restart"))
+        self.clear_selection_action = self.bulk_menu.addAction("Clear selection")
+        self.clear_selection_action.triggered.connect(self._clear_selection)
+        self._selection: Set[str] = set()
+        self._update_selection_actions()
+        
+        self.containers_menu.add_search_field()
+        self.containers_menu.addSeparator()
+        
+        # Stats are shown as tooltips, refreshed only while the submenu is open
+        self.containers_menu.aboutToShow.connect(self._start_stats_refresh)
+        self.containers_menu.aboutToHide.connect(self._stop_stats_refresh)
+        self.stats_timer = QTimer()
+        self.stats_timer.setInterval(1000)
+        self.stats_timer.timeout.connect(self._refresh_container_stats)
+        
+        # Every endpoint's containers in one list; rows are keyed "endpoint/container ID"
+        if self.endpoints is not None:
+            self.endpoints_menu = ContainerListMenu(
+                "All endpoints", self._update_endpoint_row, self._state_icon,
+                row_menu=self._container_row_menu, grouped=True,
+            )
+            self.endpoints_menu.aboutToShow.connect(self._refresh_endpoints_wrapper)
+            self._endpoint_status: Dict[str, QAction] = {}
+            self._endpoint_results: Dict[str, List[ContainerInfo]] = {}
+            self._endpoints_task: Optional[asyncio.Task] = None
+            self._endpoints_header = self.endpoints_menu.addSeparator()
+            self.endpoints_menu.add_search_field()
+            self.endpoints_menu.addSeparator()
+            self.menu.addMenu(self.endpoints_menu)
+        
+        # Latest container list, keyed by container ID
+        self._container_snapshot: Dict[str, ContainerInfo] = {}
+        # Open log windows, keyed by container ID
+        self._log_viewers: Dict[str, LogViewer] = {}
+        
         self.menu.addSeparator()
         
         # Quit action - make sure it's always visible
@@ -96,10 +270,53 @@ class ColamaMenuBar(QSystemTrayIcon):
         self.quit_action.setShortcut("Ctrl+Q")
         self.menu.addAction(self.quit_action)
 
+    def _restore_snapshot(self):
+        """Show the saved state of the active profile, marked as stale."""
+        snapshot = StateSnapshot.load(snapshot_path(self.active_profile))
+        if snapshot is None:
+            return
+        self._stale = True
+        self._saved_state = None
+        self.status_action.setText(" Docker was running, checking..." if snapshot.docker_running
+                                   else " Docker was not running, checking...")
+        self._show_containers_menu(snapshot.docker_running)
+        self.containers_menu.setTitle("Containers (last known)")
+        self._reconcile_container_actions(snapshot.containers)
+
+    def _snapshot_changed(self):
+        # Throttled rather than restarted, so constant refreshes still get saved
+        if not self.snapshot_timer.isActive():
+            self.snapshot_timer.start()
+
+    def _save_snapshot(self, blocking: bool = False):
+        snapshot = StateSnapshot(self._docker_running, list(self._container_snapshot.values()))
+        state = snapshot.to_dict()
+        del state["saved_at"]
+        if state == self._saved_state:
+            return
+        self._saved_state = state
+        path = snapshot_path(self.active_profile)
+        if blocking:
+            self._write_snapshot(snapshot, path)
+        else:
+            asyncio.get_running_loop().run_in_executor(None, self._write_snapshot, snapshot, path)
+
+    @staticmethod
+    def _write_snapshot(snapshot: StateSnapshot, path: str):
+        try:
+            snapshot.save(path)
+        except OSError as e:
+            console.print(f"[red]Error saving state: {e}[/red]")
+
+    def _flush_snapshot(self):
+        if self.snapshot_timer.isActive():
+            self.snapshot_timer.stop()
+            self._save_snapshot(blocking=True)
+
     async def initial_update(self):
         """Run initial updates when the app starts."""
-        await self._async_update_docker_status()
-        await self._async_update_containers()
+        self.scheduler.start()
+        await self.scheduler.refresh(fast=False)
 
     def show_notification(self, title: str, message: str, info: str = ""):
         """Show a system notification."""
@@ -108,97 +325,531 @@ class ColamaMenuBar(QSystemTrayIcon):
     @Slot()
     def _quit_app(self):
         """Quit the application properly."""
+        self.scheduler.stop()
+        self._flush_snapshot()
+        if self._samples_unsaved:
+            self.sampler.save()
+        for viewer in list(self._log_viewers.values()):
+            viewer.close()
+        self.profiles.shutdown()
+        if self.endpoints is not None:
+            self.endpoints.shutdown()
         QApplication.quit()
         sys.exit(0)
 
-    @Slot()
-    def _update_docker_status(self):
-        asyncio.create_task(self._async_update_docker_status())
+    @metrics.instrument("ui.refresh")
+    async def _refresh(self) -> bool:
+        """Status then containers; only ever run by the scheduler, one at a time."""
+        is_running = await self._async_update_docker_status()
+        await self._async_update_containers()
+        if self._stale:
+            self._stale = False
+            self.containers_menu.setTitle("Containers")
+        self._docker_running = is_running
+        self._snapshot_changed()
+        return is_running
 
-    async def _async_update_docker_status(self):
+    @metrics.instrument("ui.update_status")
+    async def _async_update_docker_status(self) -> bool:
         """Update the Docker status in the menu bar."""
-        is_running = self.docker_service.is_docker_running()
-        self.status_action.setText(" Docker is up and running" if is_running else " Not running")
+        is_running = await self.docker_service.is_docker_running()
+        if self.docker_service.is_colima_starting or self._busy:
+            return is_running  # the start progress or operation owns the status line
+        record = None if is_running else self.suspender.record
+        suspended = record is not None and record.reason == "suspend"
+        to_restore = len(record.containers) if record is not None else 0
+        if suspended:
+            self.status_action.setText(f" Suspended ({to_restore} containers to restore)")
+        elif to_restore:
+            self.status_action.setText(f" Not running ({to_restore} containers to restart)")
+        else:
+            self.status_action.setText(" Docker is up and running" if is_running else " Not running")
+        self.start_action.setText("Resume Docker" if suspended else "Start Docker")
         self.start_action.setEnabled(not is_running)
         self.stop_action.setEnabled(is_running)
         
-        # Show/hide containers menu based on Docker status
-        if is_running and not self.containers_menu_action:
+        self._show_containers_menu(is_running)
+        return is_running
+
+    def _show_containers_menu(self, visible: bool):
+        """Show/hide containers menu based on Docker status."""
+        if visible and not self.containers_menu_action:
             # Add containers menu before the last separator
             actions = self.menu.actions()
             before_quit = actions[-2]  # The separator before Quit
             self.containers_menu_action = self.menu.insertMenu(before_quit, self.containers_menu)
-            await self._async_update_containers()
-        elif not is_running and self.containers_menu_action:
+        elif not visible and self.containers_menu_action:
             # Remove containers menu
             self.menu.removeAction(self.containers_menu_action)
             self.containers_menu_action = None
 
+    def _begin_operation(self, name: str, status: str) -> bool:
+        """Claim the status line and Start/Stop for one operation; False if one runs."""
+        if self._busy:
+            return False
+        self._busy = name
+        self.status_action.setText(status)
+        self.start_action.setEnabled(False)
+        self.stop_action.setEnabled(False)
+        return True
+
+    @Slot()
+    def _schedule_containers_update(self):
+        self.idle_policy.mark_active()
+        self.containers_debounce.start()
+
+    @Slot()
+    def _check_idle(self):
+        if not self.idle_action.isChecked() or self._busy:
+            return
+        if not self._docker_running or self.docker_service.is_colima_starting:
+            # The quiet period starts over once the VM is (back) up
+            self.idle_policy.mark_active()
+            return
+        self.idle_policy.observe(self.docker_service.aggregate_cpu())
+        if self.idle_policy.is_idle:
+            asyncio.create_task(self._suspend_idle())
+
+    @Slot()
+    def _sample_usage_wrapper(self):
+        if (self._docker_running and not self._busy
+                and not self.docker_service.is_colima_starting):
+            asyncio.create_task(self._sample_usage())
+
+    @metrics.instrument("ui.sample_usage")
+    async def _sample_usage(self):
+        sampler = self.sampler
+        await sampler.sample()
+        if sampler is not self.sampler:
+            return  # the profile changed meanwhile
+        self._samples_unsaved += 1
+        if self._samples_unsaved >= 10:
+            self._samples_unsaved = 0
+            asyncio.get_running_loop().run_in_executor(None, sampler.save)
+        
+        if not any(p.name == self.active_profile for p in self.profiles.profiles):
+            await self.profiles.refresh()
+        profile = next((p for p in self.profiles.profiles if p.name == self.active_profile), None)
+        if profile is not None and profile.cpus:
+            self._show_recommendation(recommend(sampler.history, profile.resources))
+
+    def _show_recommendation(self, recommendation: Optional[Recommendation]):
+        self._recommendation = recommendation
+        if recommendation is None or not recommendation.changed:
+            self.resize_action.setVisible(False)
+            return
+        self.resize_action.setText(f"Resize VM to {recommendation.recommended}")
+        self.resize_action.setToolTip("\n".join(recommendation.reasons))
+        self.resize_action.setVisible(True)
+
+    @Slot()
+    def _resize_vm_wrapper(self):
+        asyncio.create_task(self._resize_vm())
+
+    async def _resize_vm(self):
+        """Restart Colima at the recommended size, keeping the running containers."""
+        recommendation = self._recommendation
+        if recommendation is None:
+            return
+        answer = QMessageBox.question(
+            None, "Co-lama",
+            f"Restart Colima with {recommendation.recommended}?\n"
+            f"Now: {recommendation.current}\n"
+            + "\n".join(recommendation.reasons)
+            + "\nRunning containers are stopped and started again.",
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        if not self._begin_operation("resize", " Resizing VM..."):
+            return
+        
+        self._show_recommendation(None)
+        
+        def on_phase(phase: str, message: str):
+            self.signal_emitter.progress.emit(f" {PHASE_LABELS[phase]}: {message}")
+        
+        try:
+            restored = await resize(self.docker_service, recommendation.recommended, on_phase)
+        finally:
+            self._busy = None
+            self.idle_policy.mark_active()
+        await self.profiles.refresh()
+        await self.scheduler.refresh()
+        if restored is not None:
+            self.signal_emitter.notify.emit(
+                "Docker Status",
+                "VM resized",
+                f"Now {recommendation.recommended}; restarted {sum(restored.values())}/{len(restored)} containers"
+            )
+        else:
+            self.signal_emitter.notify.emit(
+                "Error",
+                "Failed to resize the VM",
+                "Please check the logs"
+            )
+
+    async def _suspend_idle(self):
+        """Stop the idle VM, remembering which containers to bring back."""
+        if not self._begin_operation("suspend", " Suspending (idle)..."):
+            return
+        try:
+            success = await self.suspender.suspend()
+        finally:
+            self._busy = None
+            self.idle_policy.mark_active()
+        await self.scheduler.refresh()
+        if success:
+            record = self.suspender.record
+            self.signal_emitter.notify.emit(
+                "Docker Status",
+                "Colima suspended",
+                f"Idle for {self.idle_minutes:g} minutes; "
+                f"{len(record.containers) if record else 0} containers will be restored on resume"
+            )
+
     @Slot()
     def _update_containers(self):
-        asyncio.create_task(self._async_update_containers())
+        # Coalesced with any refresh already in flight
+        self.scheduler.request()
+
+    @Slot()
+    def _reconcile_containers(self):
+        # Listeners fire on change, which schedules the menu refresh
+        asyncio.create_task(self.docker_service.resync())
 
+    @metrics.instrument("ui.update_containers")
     async def _async_update_containers(self):
         """Update the containers submenu."""
-        if not self.docker_service.is_docker_running():
-            self.containers_menu.clear()
+        if not await self.docker_service.is_docker_running():
+            self._reconcile_container_actions([])
             return
             
-        containers = self.docker_service.get_containers()
+        containers = await self.docker_service.get_containers()
+        self._reconcile_container_actions(containers)
+
+    @metrics.instrument("ui.reconcile_containers")
+    def _reconcile_container_actions(self, containers: List[ContainerInfo]):
+        """Hand the new list to the submenu; it only rebuilds rows that are shown."""
+        self._container_snapshot = {c.container_id: c for c in containers}
+        self._selection &= self._container_snapshot.keys()
+        self.containers_menu.set_containers(containers)
+        self._update_selection_actions()
+
+    def _update_container_action(self, action: ContainerRow, container: ContainerInfo):
+        warning = ("restarting" if container.flapping
+                   else "unhealthy" if container.health == "unhealthy" else "")
+        action.setText(f"{container.name} ({container.image})" + (f" ⚠ {warning}" if warning else ""))
+        action.setIcon(self._state_icon(container.is_running))
+        action.is_running = container.is_running
+        action.container_name = container.name
+        action.warning = warning
+        selected = container.container_id in self._selection
+        if selected or action.isCheckable():
+            action.setCheckable(selected)
+            action.setChecked(selected)
+        self._update_container_tooltip(action)
+
+    def _container_row_menu(self, row: ContainerRow, parent: QMenu) -> QMenu:
+        """Per-container submenu, filled in the first time it opens."""
+        menu = QMenu(parent)
+        menu.aboutToShow.connect(lambda: self._fill_container_menu(menu, row))
+        return menu
+
+    def _project_header(self, name: str, menu: QMenu):
+        """Whole-project actions at the top of a group submenu."""
+        for action in ("start", "stop", "restart"):
+            menu.addAction(f"{action.capitalize()} project").triggered.connect(
+                lambda checked=False, a=action: self._project_action_wrapper(name, a))
+        menu.addSeparator()
+
+    def _update_endpoint_row(self, action: ContainerRow, container: ContainerInfo):
+        action.endpoint, action.target_id = container.container_id.split("/", 1)
+        action.setText(f"{container.name} ({container.image}) @ {action.endpoint}")
+        action.setIcon(self._state_icon(container.is_running))
+        action.is_running = container.is_running
+        action.container_name = f"{container.name} @ {action.endpoint}"
+        action.warning = ""
+
+    def _row_target(self, row: ContainerRow):
+        """The service and container ID a row (of any container menu) acts on."""
+        if row.endpoint is not None and self.endpoints is not None:
+            return self.endpoints.service(row.endpoint), row.target_id
+        return self.docker_service, row.container_id
+
+    @Slot()
+    def _refresh_endpoints_wrapper(self):
+        if self._endpoints_task is None or self._endpoints_task.done():
+            self._endpoints_task = asyncio.create_task(self._refresh_endpoints())
+
+    @metrics.instrument("ui.refresh_endpoints")
+    async def _refresh_endpoints(self):
+        """List every endpoint at once; each one's rows appear as soon as it answers."""
+        self.endpoints.add_service(LOCAL_ENDPOINT, self.docker_service)
+        for name in self.endpoints.names:
+            status = self._endpoint_status.get(name)
+            if status is None:
+                status = self._endpoint_status[name] = QAction(self.endpoints_menu)
+                status.setEnabled(False)
+                self.endpoints_menu.insertAction(self._endpoints_header, status)
+            status.setText(f"{name}: checking...")
+        
+        def on_result(name: str, containers: Optional[List[ContainerInfo]]):
+            if containers is None:
+                self._endpoint_status[name].setText(f"{name}: not reachable")
+                self._endpoint_status[name].setIcon(self._state_icon(False))
+                self._endpoint_results.pop(name, None)
+            else:
+                running = sum(c.is_running for c in containers)
+                self._endpoint_status[name].setText(
+                    f"{name}: {running}/{len(containers)} running")
+                self._endpoint_status[name].setIcon(self._state_icon(True))
+                self._endpoint_results[name] = [
+                    dataclasses.replace(c, container_id=f"{name}/{c.container_id}", group=name)
+                    for c in containers
+                ]
+            self.endpoints_menu.set_containers(
+                [c for results in self._endpoint_results.values() for c in results])
         
-        # Store menu visibility state
-        was_visible = self.menu.isVisible()
+        await self.endpoints.get_containers(on_result)
+
+    def _fill_container_menu(self, menu: QMenu, row: ContainerRow):
+        if not menu.actions():
+            menu.addAction("").triggered.connect(lambda: self._container_action_wrapper(row))
+            menu.addAction("Restart").triggered.connect(
+                lambda: asyncio.create_task(self._restart_container(row)))
+            menu.addAction("Logs").triggered.connect(lambda: self._open_logs(row))
+        toggle, restart, _ = menu.actions()
+        toggle.setText("Stop" if row.is_running else "Start")
+        restart.setEnabled(row.is_running)
+
+    def _open_logs(self, row: ContainerRow):
+        """Open (or raise) the log window for a container."""
+        container_id = row.container_id
+        viewer = self._log_viewers.get(container_id)
+        if viewer is None:
+            service, target_id = self._row_target(row)
+            viewer = LogViewer(service.tail_logs(target_id), row.container_name)
+            viewer.destroyed.connect(lambda: self._log_viewers.pop(container_id, None))
+            self._log_viewers[container_id] = viewer
+        viewer.show()
+        viewer.raise_()
+        viewer.activateWindow()
+
+    def _state_icon(self, running: bool) -> QIcon:
+        return load_icon("green.png" if running else "red.png")
+
+    def _update_container_tooltip(self, action: ContainerRow):
+        stats = self.docker_service.get_stats(action.container_id) if action.is_running else None
+        lines = [stats.summary()] if stats else []
+        if action.warning == "restarting":
+            deaths = self.docker_service.incidents.recent_deaths(action.container_id)
+            minutes = int(IncidentTracker.FLAP_WINDOW // 60)
+            lines.append(f"Exited {deaths} times in the last {minutes} minutes")
+        elif action.warning:
+            lines.append("Healthcheck is failing")
+        action.setToolTip("\n".join(lines))
+
+    def _toggle_selection(self, action: ContainerRow):
+        """Ctrl/Cmd-click on a container row: add it to or drop it from the selection."""
+        selected = action.container_id not in self._selection
+        if selected:
+            self._selection.add(action.container_id)
+        else:
+            self._selection.discard(action.container_id)
+        # The same container can have a row in its group and in search results
+        for row in self.containers_menu.rows():
+            if row.container_id == action.container_id:
+                row.setCheckable(selected)
+                row.setChecked(selected)
+        self._update_selection_actions()
+
+    @Slot()
+    def _clear_selection(self):
+        for action in self.containers_menu.rows():
+            if action.container_id in self._selection:
+                action.setChecked(False)
+                action.setCheckable(False)
+        self._selection.clear()
+        self._update_selection_actions()
+
+    def _update_selection_actions(self):
+        count = len(self._selection)
+        self.restart_selection_action.setText(
+            f"Restart selection ({count})" if count else "Restart selection (Ctrl/Cmd-click to select)"
+        )
+        self.restart_selection_action.setEnabled(bool(count))
+        self.clear_selection_action.setEnabled(bool(count))
+
+    def _watch_service(self, service: DockerService):
+        """Follow a service's events; only the active service drives the menu."""
+        if id(service) not in self._watched_services:
+            self._watched_services.add(id(service))
+
+            def changed():
+                if service is self.docker_service:
+                    self.signal_emitter.containers_changed.emit()
+            service.add_listener(changed)
+            # Incidents are reported for every profile, already throttled per container
+            service.add_incident_listener(lambda incident: self._notify_incident(service, incident))
+            service.add_pull_listener(lambda progress: self._show_pull_progress(service, progress))
+        service.enable_stats()
+        service.start_watching()
+
+    def _notify_incident(self, service: DockerService, incident: Incident):
+        """Called from the events thread; the notification is queued to the UI thread."""
+        self.signal_emitter.notify.emit(
+            "Container restarting" if incident.kind == "flapping" else "Container unhealthy",
+            f"{incident.name or incident.container_id} {incident.detail}",
+            "" if service is self.docker_service else f"Profile: {service.profile or 'default'}",
+        )
+
+    def _show_pull_progress(self, service: DockerService, progress: PullProgress):
+        """Called on the event loop as pre-warm pulls progress."""
+        if progress.finished:
+            if service is self.docker_service:
+                self.pull_action.setVisible(False)
+            if not progress.count("pulled", "failed"):
+                return  # everything was already there
+            failed = [ref for ref, state in progress.results().items() if state == "failed"]
+            self.signal_emitter.notify.emit(
+                "Images ready" if not failed else "Some images failed to pull",
+                progress.report(),
+                ", ".join(failed) if failed
+                else "" if service is self.docker_service else f"Profile: {service.profile or 'default'}",
+            )
+            return
+        if service is self.docker_service:
+            self.pull_action.setText(f" {progress.summary()}")
+            self.pull_action.setToolTip("\n".join(
+                f"{ref}: {state}" for ref, state in progress.results().items()
+            ))
+            self.pull_action.setVisible(True)
+
+    def _switch_profile(self, name: str):
+        """Point the Containers menu at another profile's daemon."""
+        service = self.profiles.service(name)
+        if service is not self.docker_service:
+            # Keep the old profile's events stream so switching back is instant
+            self.docker_service.disable_stats()
+            self._clear_selection()
+            self._flush_snapshot()
+            self.docker_service = service
+            self.suspender = Suspender(service)
+            if self._samples_unsaved:
+                self.sampler.save()
+            self.sampler = UsageSampler(service)
+            self._samples_unsaved = 0
+            self._show_recommendation(None)
+            self.pull_action.setVisible(False)
+            self.idle_policy.mark_active()
+            self._watch_service(service)
+            # Before the restore: the snapshot file is per profile
+            self.active_profile = name
+            self._restore_snapshot()
+        self.scheduler.request(fast=True)
+        asyncio.create_task(self._refresh_profiles())
+
+    @Slot()
+    def _refresh_profiles_wrapper(self):
+        asyncio.create_task(self._refresh_profiles())
+
+    @metrics.instrument("ui.refresh_profiles")
+    async def _refresh_profiles(self):
+        """Sync the Profiles submenu with `colama list`."""
+        profiles = await self.profiles.refresh()
+        names = {p.name for p in profiles}
+        for name in list(self._profile_menus.keys() - names):
+            menu = self._profile_menus.pop(name)
+            self.profiles_menu.removeAction(menu.menuAction())
+            menu.deleteLater()
         
-        # Clear existing menu
-        self.containers_menu.clear()
+        for profile in profiles:
+            menu = self._profile_menus.get(profile.name)
+            if menu is None:
+                menu = QMenu(profile.name, self.profiles_menu)
+                use_action = menu.addAction("Use for containers")
+                use_action.setCheckable(True)
+                use_action.triggered.connect(lambda checked=False, n=profile.name: self._switch_profile(n))
+                menu.addSeparator()
+                menu.addAction("Start").triggered.connect(
+                    lambda checked=False, n=profile.name: self._profiles_action_wrapper("start", [n]))
+                menu.addAction("Stop").triggered.connect(
+                    lambda checked=False, n=profile.name: self._profiles_action_wrapper("stop", [n]))
+                self.profiles_menu.addMenu(menu)
+                self._profile_menus[profile.name] = menu
+            active = profile.name == self.active_profile
+            menu.setTitle(f"{profile.name} ({profile.status})" + (" - active" if active else ""))
+            menu.setIcon(load_icon("green.png" if profile.is_running else "red.png"))
+            use_action, _, start_action, stop_action = menu.actions()
+            use_action.setChecked(active)
+            start_action.setEnabled(not profile.is_running)
+            stop_action.setEnabled(profile.is_running)
         
-        # Add cleanup option
-        cleanup_action = QAction("Remove stopped containers")
-        cleanup_action.triggered.connect(self._remove_stopped_containers_wrapper)
-        self.containers_menu.addAction(cleanup_action)
+        self.start_profiles_action.setEnabled(any(not p.is_running for p in profiles))
+        self.profiles_separator.setVisible(bool(profiles))
+
+    @Slot()
+    def _start_stopped_profiles_wrapper(self):
+        names = [p.name for p in self.profiles.profiles if not p.is_running]
+        self._profiles_action_wrapper("start", names)
+
+    def _profiles_action_wrapper(self, action: str, names: List[str]):
+        asyncio.create_task(self._profiles_action(action, names))
+
+    async def _profiles_action(self, action: str, names: List[str]):
+        """Start or stop several Colima profiles at once."""
+        if not names:
+            return
+        if action == "start":
+            def on_phase(profile: str, phase: str, message: str):
+                self.signal_emitter.progress.emit(f" {profile}: {PHASE_LABELS[phase]}")
+            self.signal_emitter.progress.emit(f" Starting {', '.join(names)}...")
+            results = await self.profiles.start_profiles(names, on_phase)
+        else:
+            self.signal_emitter.progress.emit(f" Stopping {', '.join(names)}...")
+            results = await self.profiles.stop_profiles(names)
         
-        if containers:
-            self.containers_menu.addSeparator()
-            
-            # Add container items
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            icon_paths = [
-                os.path.join(base_dir, 'resources', "green.png"),  # Development
-                os.path.join(homebrew_prefix, 'resources', "green.png"),  # Homebrew installation
-                os.path.join(homebrew_prefix, 'libexec', 'resources', "green.png"),  # Homebrew installation (libexec)
-            ]
-            green_icon_path = next((path for path in icon_paths if os.path.exists(path)), None)
-            if green_icon_path is None:
-                print(f"Warning: Could not find green icon file. Tried: {icon_paths}")
-                return
-            
-            icon_paths = [
-                os.path.join(base_dir, 'resources', "red.png"),  # Development
-                os.path.join(homebrew_prefix, 'resources', "red.png"),  # Homebrew installation
-                os.path.join(homebrew_prefix, 'libexec', 'resources', "red.png"),  # Homebrew installation (libexec)
-            ]
-            red_icon_path = next((path for path in icon_paths if os.path.exists(path)), None)
-            if red_icon_path is None:
-                print(f"Warning: Could not find red icon file. Tried: {icon_paths}")
-                return
-            
-            for container in containers:
-                icon_path = green_icon_path if container.is_running else red_icon_path
-                icon = QIcon(icon_path)
-                action = QAction(icon, f"{container.name} ({container.image})")
-                action.container_id = container.container_id
-                action.is_running = container.is_running
-                action.triggered.connect(lambda checked=False, a=action: self._container_action_wrapper(a))
-                self.containers_menu.addAction(action)
-        
-        # Restore menu visibility if it was visible
-        if was_visible:
-            self.menu.popup(QCursor.pos())
+        failed = [name for name, ok in results.items() if not ok]
+        past = "started" if action == "start" else "stopped"
+        if failed:
+            self.signal_emitter.notify.emit(
+                "Colima profiles",
+                f"{len(results) - len(failed)} of {len(results)} profiles {past}",
+                "Failed: " + ", ".join(failed)
+            )
+        else:
+            self.signal_emitter.notify.emit("Colima profiles", f"{', '.join(names)} {past}", "")
+        await self.scheduler.refresh()
+        await self._refresh_profiles()
+
+    @Slot(str)
+    def _show_progress(self, text: str):
+        self.status_action.setText(text)
+
+    @Slot()
+    def _start_stats_refresh(self):
+        self._refresh_container_stats()
+        self.stats_timer.start()
+
+    @Slot()
+    def _stop_stats_refresh(self):
+        self.stats_timer.stop()
+
+    @Slot()
+    @metrics.instrument("ui.refresh_stats")
+    def _refresh_container_stats(self):
+        for action in self.containers_menu.rows(visible_only=True):
+            if action.is_running:
+                self._update_container_tooltip(action)
 
     @Slot()
     def _start_docker_wrapper(self):
         asyncio.create_task(self.start_docker())
 
+    @Slot()
+    def _cancel_start_wrapper(self):
+        asyncio.create_task(self.docker_service.cancel_colima_start())
+
     @Slot()
     def _stop_docker_wrapper(self):
         asyncio.create_task(self.stop_docker())
@@ -207,14 +858,115 @@ class ColamaMenuBar(QSystemTrayIcon):
     def _container_action_wrapper(self, action):
         asyncio.create_task(self._container_action(action))
 
+    def _bulk_action_wrapper(self, action: str, running: Optional[bool] = None):
+        if running is None:
+            container_ids = list(self._selection)
+        else:
+            container_ids = [c.container_id for c in self._container_snapshot.values()
+                             if c.is_running == running]
+        asyncio.create_task(self._bulk_action(action, container_ids))
+
+    async def _bulk_action(self, action: str, container_ids: List[str]):
+        """Run one action over many containers and report a single summary."""
+        verb = {"start": "Starting", "stop": "Stopping", "restart": "Restarting"}[action]
+        if not container_ids:
+            self.signal_emitter.notify.emit("Containers", "No containers to act on", "")
+            return
+        
+        def progress(done: int, total: int):
+            self.signal_emitter.progress.emit(f" {verb} containers {done}/{total}...")
+        
+        progress(0, len(container_ids))
+        results = await self.docker_service.bulk_action(action, container_ids, progress)
+        self._report_results("Containers", action, results)
+        if action == "restart":
+            self._clear_selection()
+        await self.scheduler.refresh()
+
+    def _project_action_wrapper(self, name: str, action: str):
+        asyncio.create_task(self._project_action(name, action))
+
+    async def _project_action(self, name: str, action: str):
+        """Start, stop or restart a Compose project in dependency order."""
+        verb = {"start": "Starting", "stop": "Stopping", "restart": "Restarting"}[action]
+        
+        def progress(done: int, total: int):
+            self.signal_emitter.progress.emit(f" {verb} {name} {done}/{total}...")
+        
+        self.signal_emitter.progress.emit(f" {verb} {name}...")
+        results = await self.docker_service.project_action(name, action, progress)
+        if results:
+            self._report_results(name, action, results)
+        else:
+            self.signal_emitter.notify.emit(name, "Nothing to do", "")
+        await self.scheduler.refresh()
+
+    def _report_results(self, title: str, action: str, results: Dict[str, bool]):
+        failed = [self._container_snapshot[cid].name for cid, ok in results.items()
+                  if not ok and cid in self._container_snapshot]
+        succeeded = len(results) - len(failed)
+        
+        past = {"start": "started", "stop": "stopped", "restart": "restarted"}[action]
+        if failed:
+            self.signal_emitter.notify.emit(
+                title,
+                f"{succeeded} of {len(results)} containers {past}",
+                "Failed: " + ", ".join(failed[:5]) + ("..." if len(failed) > 5 else "")
+            )
+        else:
+            self.signal_emitter.notify.emit(
+                title,
+                f"{succeeded} containers {past}",
+                ""
+            )
+
     @Slot()
     def _remove_stopped_containers_wrapper(self):
         asyncio.create_task(self._remove_stopped_containers())
 
+    def _disk_usage_wrapper(self, force: bool):
+        asyncio.create_task(self._refresh_disk_usage(force))
+
+    async def _refresh_disk_usage(self, force: bool = False):
+        """Show cached disk usage at once and refetch it if stale (or forced)."""
+        service = self.docker_service
+        usage = service.disk_usage
+        stale = force or usage is None or usage.age > service.DISK_USAGE_MAX_AGE
+        self.disk_menu.show_usage(usage, refreshing=stale)
+        if stale:
+            usage = await service.refresh_disk_usage()
+            if service is self.docker_service:
+                self.disk_menu.show_usage(usage or service.disk_usage)
+
+    @Slot(str)
+    def _prune_wrapper(self, target: str):
+        asyncio.create_task(self._prune(target))
+
+    async def _prune(self, target: str):
+        """Confirm with the dry-run estimate, prune, then refetch disk usage."""
+        label = PRUNE_TARGETS[target]
+        usage = self.docker_service.disk_usage
+        estimate = f"About {format_bytes(usage.reclaimable[target])} would be freed." if usage else ""
+        answer = QMessageBox.question(
+            None, "Co-lama", f"Remove {label.lower()} from the Colima VM?\n{estimate}",
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            return
+        
+        self.signal_emitter.progress.emit(f" Removing {label.lower()}...")
+        reclaimed = await self.docker_service.prune(target)
+        if reclaimed is not None:
+            self.signal_emitter.notify.emit("Cleanup", f"{label} removed", f"Freed {format_bytes(reclaimed)}")
+        else:
+            self.signal_emitter.notify.emit("Error", f"Failed to remove {label.lower()}", "Please check the logs")
+        await self.scheduler.refresh()
+        await self._refresh_disk_usage(force=True)
+
     async def _container_action(self, action):
         """Handle container start/stop actions."""
+        service, container_id = self._row_target(action)
         if action.is_running:
-            success = await self.docker_service.stop_container(action.container_id)
+            success = await service.stop_container(container_id)
             if success:
                 self.signal_emitter.notify.emit(
                     "Container stopped",
@@ -222,7 +974,7 @@ class ColamaMenuBar(QSystemTrayIcon):
                     ""
                 )
         else:
-            success = await self.docker_service.start_container(action.container_id)
+            success = await service.start_container(container_id)
             if success:
                 self.signal_emitter.notify.emit(
                     "Container started",
@@ -230,11 +982,26 @@ class ColamaMenuBar(QSystemTrayIcon):
                     ""
                 )
         
-        await self._async_update_containers()
+        await self._refresh_after(action)
+
+    async def _restart_container(self, action):
+        service, container_id = self._row_target(action)
+        if await service.restart_container(container_id):
+            self.signal_emitter.notify.emit(
+                "Container restarted",
+                "Container has been restarted successfully",
+                ""
+            )
+        await self._refresh_after(action)
+
+    async def _refresh_after(self, action: ContainerRow):
+        if action.endpoint is not None:
+            self._refresh_endpoints_wrapper()
+        await self.scheduler.refresh()
 
     async def start_docker(self):
         """Start Docker using Colima."""
-        if self.docker_service.is_docker_running():
+        if await self.docker_service.is_docker_running():
             self.signal_emitter.notify.emit(
                 "Docker Status",
                 "Docker is already running",
@@ -242,20 +1009,41 @@ class ColamaMenuBar(QSystemTrayIcon):
             )
             return
         
-        self.status_action.setText(" Starting...")
+        if not self._begin_operation("start", " Starting..."):
+            return
+        self.cancel_start_action.setVisible(True)
         self.signal_emitter.notify.emit(
             "Docker Status",
             "Starting Docker",
             "Please wait..."
         )
         
-        success = await self.docker_service.start_colima()
-        if success:
-            await self._async_update_docker_status()
+        def on_phase(phase: str, message: str):
+            self.signal_emitter.progress.emit(f" {PHASE_LABELS[phase]}: {message}")
+        
+        try:
+            # Also restarts the containers a stop or idle suspend took down
+            restored = await self.suspender.resume(on_phase)
+        finally:
+            self._busy = None
+            self.cancel_start_action.setVisible(False)
+        report = self.docker_service.last_start_report
+        self.idle_policy.mark_active()
+        await self.scheduler.refresh()
+        if restored is not None:
+            summary = report.summary() if report else "Docker is now running"
+            if restored:
+                summary += f"; restored {sum(restored.values())}/{len(restored)} containers"
             self.signal_emitter.notify.emit(
                 "Docker Status",
                 "Docker Started",
-                "Docker is now running"
+                summary
+            )
+        elif report and report.cancelled:
+            self.signal_emitter.notify.emit(
+                "Docker Status",
+                "Start cancelled",
+                "Colima start was aborted"
             )
         else:
             self.signal_emitter.notify.emit(
@@ -266,7 +1054,7 @@ class ColamaMenuBar(QSystemTrayIcon):
 
     async def stop_docker(self):
         """Stop Docker using Colima."""
-        if not self.docker_service.is_docker_running():
+        if not await self.docker_service.is_docker_running():
             self.signal_emitter.notify.emit(
                 "Docker Status",
                 "Docker is not running",
@@ -274,14 +1062,24 @@ class ColamaMenuBar(QSystemTrayIcon):
             )
             return
         
-        self.status_action.setText(" Stopping...")
-        success = await self.docker_service.stop_colima()
+        if not self._begin_operation("stop", " Stopping..."):
+            return
+        
+        def on_progress(message: str):
+            self.signal_emitter.progress.emit(f" {message}...")
+        
+        try:
+            # Remembers the running containers, so Start brings them back
+            success = await self.suspender.suspend(on_progress, reason="stop")
+        finally:
+            self._busy = None
+        report = self.docker_service.last_stop_report
+        await self.scheduler.refresh()
         if success:
-            await self._async_update_docker_status()
             self.signal_emitter.notify.emit(
                 "Docker Status",
                 "Docker Stopped",
-                "Docker has been stopped"
+                report.summary() if report else "Docker has been stopped"
             )
         else:
             self.signal_emitter.notify.emit(
@@ -292,7 +1090,7 @@ class ColamaMenuBar(QSystemTrayIcon):
 
     async def _remove_stopped_containers(self):
         """Remove all stopped containers."""
-        if not self.docker_service.is_docker_running():
+        if not await self.docker_service.is_docker_running():
             self.signal_emitter.notify.emit(
                 "Error",
                 "Docker is not running",
@@ -307,7 +1105,7 @@ class ColamaMenuBar(QSystemTrayIcon):
                 "Containers removed",
                 "Stopped containers have been removed"
             )
-            await self._async_update_containers()
+            await self.scheduler.refresh()
         else:
             self.signal_emitter.notify.emit(
                 "Error",
@@ -0,0 +1,40 @@
+import os
+import shutil
+import stat
+import tempfile
+
+import pytest
+
+from benchmarks.fake_daemon import FakeDockerDaemon
+from colama.services.docker_service import DockerService
+
+
+@pytest.fixture
+def daemon():
+    # Not tmp_path: unix socket paths are limited to about 100 characters
+    directory = tempfile.mkdtemp(prefix="colama-test-")
+    with FakeDockerDaemon(os.path.join(directory, "docker.sock"), containers=6) as daemon:
+        yield daemon
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def service(daemon):
+    service = DockerService(host=f"unix://{daemon.socket_path}")
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def colima(monkeypatch, tmp_path):
+    """A `colima` on PATH that succeeds at everything; returns the file its calls go to."""
+    calls = tmp_path / "colima-calls"
+    script = tmp_path / "bin" / "colima"
+    script.parent.mkdir()
+    script.write_text(f'#!/bin/sh\necho "$*" >> "{calls}"\n')
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{script.parent}{os.pathsep}{os.environ['PATH']}")
+    # Keep suspend records and configuration out of the real home directory
+    monkeypatch.setenv("COLAMA_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    return calls
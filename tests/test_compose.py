@@ -0,0 +1,114 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from colama.services.compose import Project, index_projects, parse_depends_on
+from colama.services.docker_service import ContainerInfo, DockerService
+
+
+def container(name: str, group: str = "app", service: str = "", depends_on: str = "",
+              running: bool = False, health: str = "") -> ContainerInfo:
+    return ContainerInfo(name, name, "example/app:latest", "", running, group=group,
+                         health=health, service=service or name, depends_on=depends_on)
+
+
+def project(**depends_on: str) -> Project:
+    """A project with one container per service; values are depends_on labels."""
+    return index_projects([container(service, depends_on=label)
+                           for service, label in depends_on.items()])["app"]
+
+
+def test_parse_depends_on():
+    assert parse_depends_on("db:service_healthy:false,cache:service_started:false") == {
+        "db": "service_healthy", "cache": "service_started",
+    }
+    assert parse_depends_on(" db , init:service_completed_successfully") == {
+        "db": "service_started", "init": "service_completed_successfully",
+    }
+    assert parse_depends_on("") == {}
+
+
+def test_levels_follow_dependencies():
+    app = project(web="api,cache", api="db:service_healthy:false", db="", cache="")
+    assert app.levels() == [["cache", "db"], ["api"], ["web"]]
+
+
+def test_levels_ignore_services_without_containers():
+    app = project(web="db,queue", db="")
+    assert app.levels() == [["db"], ["web"]]
+
+
+def test_levels_put_a_cycle_last():
+    app = project(a="b", b="a", c="", d="a")
+    assert app.levels() == [["c"], ["a", "b", "d"]]
+
+
+def test_index_projects():
+    containers = [
+        container("web-1", service="web", depends_on="db:service_started:false"),
+        container("web-2", service="web"),  # a replica without the label keeps web's
+        container("db"),
+        container("lone", group=""),
+        container("worker", group="jobs", service=""),
+    ]
+    projects = index_projects(containers)
+    assert sorted(projects) == ["app", "jobs"]
+    app = projects["app"]
+    assert [c.name for c in app.services["web"]] == ["web-1", "web-2"]
+    assert app.depends_on == {"web": {"db": "service_started"}, "db": {}}
+    assert list(projects["jobs"].services) == ["worker"]
+
+
+class FakeService(DockerService):
+    """Containers held in memory; bulk actions are recorded and applied to them."""
+
+    def __init__(self, containers: List[ContainerInfo]):
+        super().__init__()
+        self.containers = {c.container_id: c for c in containers}
+        self.calls: List[tuple] = []
+
+    async def get_containers(self) -> List[ContainerInfo]:
+        return list(self.containers.values())
+
+    async def bulk_action(self, action: str, ids: List[str], progress=None) -> Dict[str, bool]:
+        self.calls.append((action, sorted(ids)))
+        for container_id in ids:
+            c = self.containers[container_id]
+            self.containers[container_id] = ContainerInfo(
+                c.container_id, c.name, c.image, c.status, action == "start", c.group,
+                "healthy" if action == "start" and c.health else c.health,
+                service=c.service, depends_on=c.depends_on)
+        return dict.fromkeys(ids, True)
+
+
+@pytest.fixture
+def stack():
+    service = FakeService([
+        container("web", depends_on="api:service_started:false"),
+        container("api", depends_on="db:service_healthy:false"),
+        container("db", health="starting"),
+    ])
+    yield service
+    service.shutdown()
+
+
+def test_project_start_in_dependency_order(stack):
+    results = asyncio.run(stack.project_action("app", "start"))
+    assert stack.calls == [("start", ["db"]), ("start", ["api"]), ("start", ["web"])]
+    assert all(results.values())
+
+
+def test_project_stop_in_reverse_order(stack):
+    asyncio.run(stack.project_action("app", "start"))
+    stack.calls.clear()
+    asyncio.run(stack.project_action("app", "stop"))
+    assert stack.calls == [("stop", ["web"]), ("stop", ["api"]), ("stop", ["db"])]
+
+
+def test_project_start_waits_for_healthy_dependency(stack):
+    stack.containers["db"] = container("db", running=True, health="unhealthy")
+    stack.HEALTHY_TIMEOUT = -1  # give up on the first check
+    results = asyncio.run(stack.project_action("app", "start"))
+    assert ("start", ["api"]) not in stack.calls
+    assert results["api"] is False
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtGui import QIcon  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from colama.services.docker_service import ContainerInfo  # noqa: E402
+from colama.ui.containers_menu import ContainerListMenu, ContainerRow  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def container(container_id: str, name: str, running: bool = True, group: str = "",
+              image: str = "example/app:latest") -> ContainerInfo:
+    return ContainerInfo(container_id, name, image, "", running, group=group)
+
+
+def update_row(row: ContainerRow, container: ContainerInfo) -> None:
+    row.setText(container.name)
+    row.container_name = container.name
+    row.is_running = container.is_running
+
+
+@pytest.fixture
+def menu(app):
+    menu = ContainerListMenu("Containers", update_row, lambda running: QIcon(), grouped=True)
+    menu.set_containers([
+        container("aaa111", "web", group="shop"),
+        container("bbb222", "db", running=False, group="shop"),
+        container("ccc333", "redis"),
+        container("ddd444", "old-job", running=False),
+        container("work/eee555", "other", image="example/other:1"),
+    ])
+    menu.refresh()
+    yield menu
+    menu.deleteLater()
+
+
+def titles(menu: ContainerListMenu):
+    return [a.menu().title() if a.menu() else a.text() for a in menu.actions()]
+
+
+def test_groups_projects_and_collapses_stopped_containers(menu):
+    assert titles(menu) == ["shop (1/2 running)", "redis", "other", "Stopped (1)"]
+    shop = menu.actions()[0].menu()
+    shop.refresh()  # built when opened
+    assert titles(shop) == ["web", "Stopped (1)"]
+    assert sorted(row.container_name for row in menu.rows()) == ["other", "redis", "web"]
+
+
+def test_filter_flattens_the_matches(menu):
+    menu._set_filter("shop")  # the project name
+    assert titles(menu) == ["web", "db"]
+    menu._set_filter("EXAMPLE/OTHER")
+    assert titles(menu) == ["other"]
+    menu._set_filter("eee")  # ID prefix of a row from another endpoint
+    assert titles(menu) == ["other"]
+    menu._set_filter("work")  # the endpoint part of the key is not an ID
+    assert titles(menu) == []
+    menu._set_filter("")
+    assert titles(menu)[0] == "shop (1/2 running)"
+
+
+def test_rows_are_reused_and_dropped(menu):
+    redis = next(row for row in menu.rows() if row.container_name == "redis")
+    menu.set_containers([container("ccc333", "redis", running=True)])
+    menu.refresh()
+    assert list(menu.rows()) == [redis]
+
+
+def test_overflow_row(app):
+    menu = ContainerListMenu("Containers", update_row, lambda running: QIcon())
+    menu.MAX_ROWS = 3
+    menu.set_containers([container(f"{i:06x}", f"c{i}") for i in range(5)])
+    menu.refresh()
+    assert titles(menu) == ["c0", "c1", "c2", "2 more - type to search"]
+    menu.deleteLater()
@@ -0,0 +1,52 @@
+from colama.services.disk_usage import DiskUsage
+
+DF = {
+    "LayersSize": 250,
+    "Images": [
+        {"Id": "sha256:aaaaaaaaaaaaaaaaaaaa", "RepoTags": ["web:latest"], "Size": 100,
+         "SharedSize": 40, "Containers": 1},
+        {"Id": "sha256:bbbbbbbbbbbbbbbbbbbb", "RepoTags": ["old:1"], "Size": 80,
+         "SharedSize": 30, "Containers": 0},
+        {"Id": "sha256:cccccccccccccccccccc", "RepoTags": ["<none>:<none>"], "Size": 50,
+         "SharedSize": -1, "Containers": 0},
+        {"Id": "sha256:dddddddddddddddddddd", "RepoTags": ["unknown:1"], "Size": 20,
+         "Containers": -1},
+    ],
+    "Containers": [{"Names": ["/web"], "SizeRw": 7, "State": "running"}],
+    "Volumes": [
+        {"Name": "data", "UsageData": {"Size": 300, "RefCount": 1}},
+        {"Name": "stale", "UsageData": {"Size": 60, "RefCount": 0}},
+        {"Name": "unknown", "UsageData": {"Size": -1, "RefCount": 0}},
+    ],
+    "BuildCache": [
+        {"ID": "1", "Description": "RUN make", "Size": 25, "InUse": False, "Shared": False},
+        {"ID": "2", "Size": 15, "InUse": False, "Shared": True},
+        {"ID": "3", "Size": 5, "InUse": True, "Shared": False},
+    ],
+}
+
+
+def test_reclaimable():
+    usage = DiskUsage.from_df(DF)
+    assert usage.reclaimable == {
+        "dangling-images": 50,
+        "unused-images": 50 + 50,  # without the layers shared with other images
+        "volumes": 60,
+        "build-cache": 25,
+    }
+
+
+def test_items_and_totals():
+    usage = DiskUsage.from_df(DF)
+    names = {item.name: item for item in usage.items}
+    assert names["cccccccccccc"].kind == "image"  # untagged: short ID
+    assert names["unknown:1"].in_use  # usage not computed: assumed in use
+    assert names["web"].in_use and names["web"].size == 7
+    assert names["RUN make"].kind == "build-cache"
+    assert usage.totals == {"image": 250, "container": 7, "volume": 360, "build-cache": 45}
+    assert usage.top(1)[0].name == "data"
+
+
+def test_empty_response():
+    usage = DiskUsage.from_df({"Images": None, "Volumes": None})
+    assert usage.items == [] and not any(usage.reclaimable.values())
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from colama.services.colima import profile_socket
+from colama.services.endpoints import (
+    Endpoint, EndpointFanout, configured_endpoints, parse_endpoint,
+)
+
+CONTEXTS = {"remote": "ssh://me@build-box"}
+
+
+@pytest.mark.parametrize("spec, expected", [
+    ("profile:work", Endpoint("work", f"unix://{profile_socket('work')}")),
+    ("ci=context:remote", Endpoint("ci", "ssh://me@build-box")),
+    ("context:remote", Endpoint("remote", "ssh://me@build-box")),
+    ("unix:///home/me/.colima/dev/docker.sock", Endpoint("dev", "unix:///home/me/.colima/dev/docker.sock")),
+    (" tcp://10.0.0.5:2375 ", Endpoint("10.0.0.5:2375", "tcp://10.0.0.5:2375")),
+    ("box=ssh://me@host?x=1", Endpoint("box", "ssh://me@host?x=1")),
+])
+def test_parse_endpoint(spec, expected):
+    assert parse_endpoint(spec, CONTEXTS) == expected
+
+
+@pytest.mark.parametrize("spec", ["context:missing", "work", "ftp://host"])
+def test_parse_endpoint_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_endpoint(spec, CONTEXTS)
+
+
+@pytest.fixture
+def config(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    monkeypatch.setenv("DOCKER_CONFIG", str(tmp_path / "docker"))
+    monkeypatch.delenv("COLAMA_ENDPOINTS", raising=False)
+    (tmp_path / "colama").mkdir()
+    return tmp_path / "colama" / "endpoints"
+
+
+def test_configured_endpoints_in_order(config, monkeypatch):
+    config.write_text("# build hosts\nci=tcp://ci:2375  # shared\n\nstaging=tcp://old:2375\n")
+    monkeypatch.setenv("COLAMA_ENDPOINTS", "staging=tcp://staging:2375,a/b=tcp://x:2375")
+    endpoints = configured_endpoints(["profile:work"])
+    assert [(e.name, e.host) for e in endpoints] == [
+        ("ci", "tcp://ci:2375"),
+        ("staging", "tcp://staging:2375"),  # the later entry wins
+        ("a-b", "tcp://x:2375"),  # "/" separates endpoint and container in row keys
+        ("work", f"unix://{profile_socket('work')}"),
+    ]
+
+
+def test_configured_endpoints_skip_bad_entries(config):
+    config.write_text("nonsense\ncontext:missing\nlocal=tcp://x:2375\nok=tcp://ok:2375\n")
+    assert configured_endpoints() == [Endpoint("ok", "tcp://ok:2375")]
+
+
+def test_fanout_reports_unreachable_hosts_as_none(daemon, tmp_path):
+    fanout = EndpointFanout([Endpoint("fake", f"unix://{daemon.socket_path}"),
+                             Endpoint("gone", f"unix://{tmp_path}/missing.sock")], timeout=2.0)
+    answered = []
+    try:
+        results = asyncio.run(fanout.get_containers(lambda name, _: answered.append(name)))
+    finally:
+        fanout.shutdown()
+    assert len(results["fake"]) == len(daemon.containers)
+    assert results["gone"] is None
+    assert sorted(answered) == ["fake", "gone"]
@@ -0,0 +1,76 @@
+import os
+import socket
+
+import pytest
+
+from colama.services import health
+from colama.services.health import DaemonHealth
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(health.time, "monotonic", clock)
+    return clock
+
+
+def test_result_is_cached_for_the_ttl(clock):
+    state = DaemonHealth(ttl=2.0, socket_path="/nonexistent")
+    assert state.cached() is None
+    state.record(True)
+    clock.now += 1.9
+    assert state.cached() is True
+    clock.now += 0.2
+    assert state.cached() is None
+    assert state.should_probe()
+
+
+def test_failures_back_off_exponentially(clock):
+    state = DaemonHealth(base_delay=1.0, max_delay=4.0, socket_path="/nonexistent")
+    for delay in (1.0, 2.0, 4.0, 4.0):
+        state.record(False)
+        assert not state.should_probe()
+        clock.now += delay - 0.01
+        assert not state.should_probe()
+        clock.now += 0.02
+        assert state.should_probe()
+
+
+def test_recovery_closes_the_breaker(clock):
+    state = DaemonHealth(socket_path="/nonexistent")
+    assert state.record(False) is False
+    assert state.is_open
+    clock.now += 1.0
+    assert state.record(True) is True  # back after a failure
+    assert not state.is_open
+    assert state.record(True) is False
+
+
+def test_new_socket_closes_the_breaker_early(clock, tmp_path):
+    path = str(tmp_path / "docker.sock")
+    state = DaemonHealth(socket_path=path)
+    state.record(False)  # no socket yet
+    assert not state.should_probe()
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(path)
+        assert state.should_probe()
+        assert not state.is_open
+    finally:
+        server.close()
+        os.unlink(path)
+
+
+def test_reset_forgets_the_cached_result(clock):
+    state = DaemonHealth(socket_path="/nonexistent")
+    state.record(True)
+    state.reset()
+    assert state.cached() is None
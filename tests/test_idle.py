@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from colama.services import idle
+from colama.services.idle import IdlePolicy, Suspender
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(idle.time, "monotonic", clock)
+    return clock
+
+
+def test_idle_after_the_quiet_period(clock):
+    policy = IdlePolicy(quiet_period=60)
+    clock.now += 59
+    assert not policy.is_idle
+    policy.observe(None)  # unknown CPU is no activity
+    policy.observe(policy.CPU_THRESHOLD)  # nor is CPU at the threshold
+    clock.now += 1
+    assert policy.is_idle and policy.idle_for == 60
+
+
+def test_activity_restarts_the_quiet_period(clock):
+    policy = IdlePolicy(quiet_period=60, cpu_threshold=10.0)
+    clock.now += 100
+    policy.observe(12.0)
+    assert policy.idle_for == 0 and not policy.is_idle
+    clock.now += 100
+    policy.mark_active()
+    assert not policy.is_idle
+
+
+def running(daemon):
+    """Short IDs, as ContainerInfo has them."""
+    return {cid[:12] for cid, c in daemon.containers.items() if c["State"] == "running"}
+
+
+def test_suspend_and_resume(daemon, service, colima):
+    suspender = Suspender(service)
+    was_running = running(daemon)
+    assert was_running
+
+    assert asyncio.run(suspender.suspend(reason="stop"))
+    record = suspender.record
+    assert (sorted(record.containers), record.reason) == (sorted(was_running), "stop")
+    assert not running(daemon)
+    assert colima.read_text().splitlines() == ["stop"]
+
+    # Removed while suspended: skipped on resume
+    gone = sorted(was_running)[0]
+    del daemon.containers[next(cid for cid in daemon.containers if cid.startswith(gone))]
+    results = asyncio.run(suspender.resume())
+    assert results == dict.fromkeys(sorted(was_running - {gone}), True)
+    assert running(daemon) == was_running - {gone}
+    assert colima.read_text().splitlines() == ["stop", "start"]
+    assert suspender.record is None
+
+
+def test_suspend_with_docker_down_keeps_the_record(daemon, service, colima):
+    suspender = Suspender(service)
+    assert asyncio.run(suspender.suspend())
+    record = suspender.record
+    daemon.stop()
+    service.health.reset()
+    assert asyncio.run(suspender.suspend())
+    assert suspender.record == record
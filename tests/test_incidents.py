@@ -0,0 +1,52 @@
+from colama.services.incidents import IncidentTracker, WindowCounter, parse_health
+
+
+def test_counts_events_inside_the_window():
+    counter = WindowCounter(10, buckets=10)
+    for now in (0.0, 0.5, 1.2):
+        counter.add(now)
+    assert counter.total(1.5) == 3
+    assert counter.total(10.5) == 1  # the events at 0 and 0.5 have left the window
+    assert counter.total(20.0) == 0
+
+
+def test_reused_bucket_starts_over():
+    counter = WindowCounter(10, buckets=10)
+    counter.add(0.0)
+    counter.add(0.1)
+    counter.add(10.0)  # same bucket, next time slice
+    assert counter.total(10.0) == 1
+
+
+def test_parse_health():
+    assert parse_health("Up 5 minutes (unhealthy)") == "unhealthy"
+    assert parse_health("Up 3 seconds (health: starting)") == "starting"
+    assert parse_health("Exited (1) 2 minutes ago") == ""
+
+
+def test_restart_loop_is_reported_once():
+    tracker = IncidentTracker()
+    assert tracker.record_death("web", now=0.0) is None
+    assert tracker.record_death("web", now=10.0) is None
+    incident = tracker.record_death("web", now=20.0)
+    assert (incident.kind, incident.detail) == ("flapping", "exited 3 times in 5 minutes")
+    assert tracker.record_death("web", now=30.0) is None  # still the same loop
+    assert tracker.is_flapping("web", now=40.0)
+    assert not tracker.is_flapping("web", now=40.0 + tracker.FLAP_WINDOW)
+
+
+def test_unhealthy_is_rate_limited():
+    tracker = IncidentTracker()
+    assert tracker.record_health("db", "unhealthy", now=0.0).kind == "unhealthy"
+    tracker.record_health("db", "healthy", now=10.0)
+    assert tracker.record_health("db", "unhealthy", now=20.0) is None  # within NOTIFY_INTERVAL
+    tracker.record_health("db", "healthy", now=30.0)
+    assert tracker.record_health("db", "unhealthy", now=20.0 + tracker.NOTIFY_INTERVAL)
+
+
+def test_retain_drops_removed_containers():
+    tracker = IncidentTracker()
+    tracker.record_death("a", now=0.0)
+    tracker.record_death("b", now=0.0)
+    tracker.retain(["b"])
+    assert tracker.recent_deaths("a") == 0
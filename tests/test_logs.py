@@ -0,0 +1,51 @@
+import time
+
+from colama.services.logs import LogTail
+
+
+def tail(max_lines: int = 3) -> LogTail:
+    return LogTail(lambda: None, "abc", max_lines=max_lines)
+
+
+def test_slow_consumers_lose_the_oldest_lines():
+    logs = tail()
+    logs._push([b"1", b"2"])
+    assert logs.drain(1) == ["1"]
+    logs._push([b"3", b"4", b"5\r"])
+    assert logs.dropped == 1
+    assert logs.backlog == 3
+    assert logs.drain() == ["3", "4", "5"]
+    logs._push([b"%d" % i for i in range(10)])
+    assert logs.dropped == 1 + 7
+    assert logs.drain() == ["7", "8", "9"]
+
+
+def test_invalid_utf8_is_replaced():
+    logs = tail()
+    logs._push([b"caf\xe9"])
+    assert logs.drain() == ["caf�"]
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_follows_the_daemon(daemon, service):
+    container_id = next(iter(daemon.containers))
+    daemon.write_logs(container_id, [f"old {i}" for i in range(5)])
+    logs = service.tail_logs(container_id, max_lines=3)
+    try:
+        assert wait_for(lambda: logs.backlog == 3)
+        assert logs.drain() == ["old 2", "old 3", "old 4"]  # only the tail
+        daemon.write_logs(container_id, [f"new {i}" for i in range(10)])
+        assert wait_for(lambda: logs.dropped == 7)
+        assert logs.drain() == ["new 7", "new 8", "new 9"]
+        assert logs.error is None
+    finally:
+        logs.stop()
+    assert wait_for(lambda: not logs.running)
@@ -0,0 +1,65 @@
+import asyncio
+
+from colama.services.prewarm import ImagePull, PullProgress
+
+
+def feed(pull: ImagePull, *events: dict) -> None:
+    for event in events:
+        pull.feed(event)
+
+
+def test_layers_fold_into_bytes():
+    pull = ImagePull("redis")
+    feed(pull,
+         {"status": "Pulling from library/redis", "id": "latest"},
+         {"status": "Pulling fs layer", "id": "a"},
+         {"status": "Waiting", "id": "b"},
+         {"status": "Downloading", "id": "a", "progressDetail": {"current": 50, "total": 100}},
+         {"status": "Downloading", "id": "b", "progressDetail": {"current": 10, "total": 40}})
+    assert (pull.downloaded, pull.size) == (60, 140)
+    feed(pull,
+         {"status": "Download complete", "id": "a"},
+         {"status": "Extracting", "id": "b", "progressDetail": {"current": 5, "total": 40}},
+         {"status": "Digest: sha256:0123"},
+         {"status": "Status: Downloaded newer image for redis:latest"})
+    assert pull.layers == {"a": (100, 100), "b": (40, 40)}
+    assert not pull.finished  # the state is set by whoever runs the pull
+
+
+def test_already_present_layers():
+    pull = ImagePull("alpine")
+    feed(pull, {"status": "Already exists", "id": "a"})
+    assert pull.layers == {"a": (0, 0)}
+
+
+def test_error_fails_the_pull():
+    pull = ImagePull("missing")
+    feed(pull, {"status": "Pulling fs layer", "id": "a"}, {"error": "manifest unknown"})
+    assert (pull.state, pull.error, pull.finished) == ("failed", "manifest unknown", True)
+
+
+def test_progress_fraction_and_report():
+    progress = PullProgress.for_images(["a", "b"])
+    progress.pulls["a"].state = "present"
+    pulling = progress.pulls["b"]
+    pulling.state = "pulling"
+    pulling.feed({"status": "Downloading", "id": "x", "progressDetail": {"current": 50, "total": 100}})
+    assert progress.fraction == (1 + 0.9 * 0.5) / 2
+    assert not progress.finished
+    pulling.state = "failed"
+    assert progress.finished
+    assert progress.report() == "1 already present · 1 failed"
+
+
+def test_pull_images_from_the_daemon(daemon, service):
+    daemon.pull_delay = 0.001
+    service.PULL_PROGRESS_INTERVAL = 0.0
+    pinned = next(iter(daemon.images.values()))["RepoDigests"][0]
+    seen = []
+    service.add_pull_listener(lambda progress: seen.append(progress.pulls["redis"].layer_totals()))
+    progress = asyncio.run(service.pull_images(["redis", pinned]))
+    assert progress.results() == {"redis": "pulled", pinned: "present"}
+    assert progress.pulls["redis"].layer_totals() == (20_000_000, 20_000_000)
+    # Totals read on the event loop while the pull thread was feeding layers
+    assert len(seen) > 2 and all(downloaded <= size for downloaded, size in seen)
+    assert progress.report() == "1 pulled · 1 already present"
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from colama.services import scheduler as scheduler_module
+from colama.services.scheduler import RefreshScheduler
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(scheduler_module.time, "monotonic", clock)
+    return clock
+
+
+async def nothing():
+    return True
+
+
+def test_interval_slows_down_while_unused(clock):
+    scheduler = RefreshScheduler(nothing)
+    assert scheduler.interval() == scheduler.NORMAL_INTERVAL
+    scheduler.request(fast=True)
+    assert scheduler.interval() == scheduler.FAST_INTERVAL
+    clock.now += scheduler.IDLE_AFTER + 1
+    assert scheduler.interval() == scheduler.IDLE_INTERVAL
+    clock.now += scheduler.PAUSE_AFTER
+    assert scheduler.paused and scheduler.interval() is None
+    scheduler.touch()
+    assert scheduler.interval() == scheduler.NORMAL_INTERVAL
+
+
+def test_backs_off_while_the_daemon_is_down(clock):
+    scheduler = RefreshScheduler(nothing)
+    scheduler._record(True)
+    scheduler._record(False)  # a transition: poll fast for a while
+    assert scheduler.interval() == scheduler.FAST_INTERVAL
+    clock.now += scheduler.FAST_PERIOD
+    intervals = []
+    for _ in range(4):
+        intervals.append(scheduler.interval())
+        scheduler._record(False)
+    assert intervals == [30.0, 60.0, 120.0, 120.0]
+    scheduler._record(True)
+    assert scheduler.interval() == scheduler.FAST_INTERVAL
+    clock.now += scheduler.FAST_PERIOD
+    assert scheduler.interval() == scheduler.NORMAL_INTERVAL
+
+
+def test_unknown_results_change_nothing(clock):
+    scheduler = RefreshScheduler(nothing)
+    scheduler._record(False)
+    scheduler._record(None)
+    assert scheduler._down_runs == 1
+
+
+def test_requests_during_a_refresh_are_coalesced():
+    async def main():
+        runs = 0
+        release = asyncio.Event()
+
+        async def refresh():
+            nonlocal runs
+            runs += 1
+            await release.wait()
+            return True
+
+        scheduler = RefreshScheduler(refresh)
+        scheduler.start()
+        first = asyncio.ensure_future(scheduler.refresh())
+        await asyncio.sleep(0.01)
+        waiting = [asyncio.ensure_future(scheduler.refresh()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert runs == 1 and scheduler.in_flight
+        release.set()
+        await asyncio.wait_for(asyncio.gather(first, *waiting), 1.0)
+        scheduler.stop()
+        return runs
+
+    assert asyncio.run(main()) == 2  # one follow-up run for all three
@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+
+def short_ids(daemon, state: str = "running"):
+    return {cid[:12] for cid, c in daemon.containers.items() if c["State"] == state}
+
+
+def test_stops_everything_at_once(daemon, service):
+    running = short_ids(daemon)
+    for container_id in daemon.containers:
+        daemon.stop_delays[container_id] = 0.5
+    progress = []
+    started = time.monotonic()
+    results = asyncio.run(service.stop_all_containers(
+        timeout=5.0, progress=lambda done, total: progress.append((done, total))))
+    assert time.monotonic() - started < 0.5 * len(running)  # not one after another
+    assert results == dict.fromkeys(running, "stopped")
+    assert progress[-1] == (len(running), len(running))
+    assert not short_ids(daemon)
+
+
+def test_hanging_stops_are_killed_after_the_deadline(daemon, service):
+    running = sorted(short_ids(daemon))
+    slow = next(cid for cid in daemon.containers if cid.startswith(running[0]))
+    # The stop's grace is rounded up to whole seconds, so this one outlives
+    # the half-second deadline; with no kill grace it is killed
+    daemon.stop_delays[slow] = 30.0
+    service.KILL_GRACE = 0.0
+    started = time.monotonic()
+    results = asyncio.run(service.stop_all_containers(timeout=0.5))
+    assert time.monotonic() - started < 1.0
+    assert results[running[0]] == "killed"
+    assert all(results[cid] == "stopped" for cid in running[1:])
+    assert daemon.requests["POST /containers/{id}/kill"] == 1
+
+
+def test_nothing_running(daemon, service):
+    for container_id in list(daemon.containers):
+        daemon.set_state(container_id, "exited", "die")
+    assert asyncio.run(service.stop_all_containers()) == {}
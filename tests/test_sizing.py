@@ -0,0 +1,97 @@
+import asyncio
+
+from colama.services import sizing
+from colama.services.colima import GIB, VMResources
+from colama.services.docker_service import DockerService
+from colama.services.sizing import (
+    MIN_SAMPLES, UsageHistory, UsageSampler, parse_vm_probe, recommend,
+)
+
+HOST = VMResources(8, 16, 0)
+
+
+def history(samples: int = 100, cpu=1.0, memory=5.0, disk=42.0) -> UsageHistory:
+    usage = UsageHistory()
+    for i in range(samples):
+        # One sample in ten is a peak, so the 95th percentile sees it
+        usage.add(cpu * 3 if i % 10 == 0 else cpu, memory, disk)
+    return usage
+
+
+def test_needs_enough_samples():
+    assert recommend(history(MIN_SAMPLES - 1), VMResources(2, 2, 60), HOST) is None
+
+
+def test_sizes_for_the_95th_percentile_with_headroom():
+    result = recommend(history(), VMResources(2, 2, 60), HOST)
+    assert result.recommended == VMResources(4, 7, 70)
+    assert result.changed
+    assert len(result.reasons) == 3
+
+
+def test_capped_by_the_host():
+    result = recommend(history(), VMResources(2, 2, 60), VMResources(2, 4, 0))
+    assert (result.recommended.cpus, result.recommended.memory) == (2, 3)
+    assert any("capped at 3 GiB" in reason for reason in result.reasons)
+
+
+def test_never_below_colima_defaults():
+    result = recommend(history(cpu=0.1, memory=0.2), VMResources(4, 8, 60), HOST)
+    assert (result.recommended.cpus, result.recommended.memory) == (2, 2)
+
+
+def test_disk_only_grows():
+    assert recommend(history(disk=10.0), VMResources(4, 7, 200), HOST).recommended.disk == 200
+    assert not recommend(history(disk=10.0), VMResources(4, 7, 200), HOST).changed
+
+
+def test_unmeasured_values_keep_the_current_size():
+    usage = UsageHistory()
+    for _ in range(MIN_SAMPLES):
+        usage.add(None, None, None)
+    result = recommend(usage, VMResources(3, 6, 60), HOST)
+    assert result.recommended == VMResources(3, 6, 60)
+    assert not result.changed
+
+
+PROBE = """0.52 0.40 0.30 2/180 4242
+MemTotal:        4000000 kB
+MemFree:          500000 kB
+MemAvailable:    1000000 kB
+Filesystem     1024-blocks     Used Available Capacity Mounted on
+overlay           61255492  2048000  59207492       4% /var/lib/docker
+"""
+
+
+def test_parse_vm_probe():
+    assert parse_vm_probe(PROBE) == {
+        "load": 0.52, "memory": 3_000_000 * 1024, "disk": 2_048_000 * 1024,
+    }
+    # The data line names a device on some VMs
+    assert parse_vm_probe(PROBE.replace("overlay", "/dev/vda1"))["disk"] == 2_048_000 * 1024
+    # df failed: no disk, but the rest still counts
+    assert "disk" not in parse_vm_probe(PROBE.split("Filesystem")[0])
+
+
+def test_vm_is_probed_every_few_minutes(monkeypatch, tmp_path):
+    monkeypatch.setenv("COLAMA_CACHE_DIR", str(tmp_path))
+    now = [1000.0]
+    probes = []
+
+    async def probe_vm(profile):
+        probes.append(now[0])
+        return {"load": 1.5, "memory": 3 * GIB}
+
+    monkeypatch.setattr(sizing.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(sizing, "probe_vm", probe_vm)
+    service = DockerService(profile="default")
+    sampler = UsageSampler(service, UsageHistory())
+    try:
+        for _ in range(6):
+            asyncio.run(sampler.sample())
+            now[0] += 60
+    finally:
+        service.shutdown()
+    assert probes == [1000.0, 1300.0]
+    assert sampler.history.values("cpu") == [1.5] * 6
+    assert sampler.history.values("memory") == [3.0] * 6
@@ -0,0 +1,53 @@
+import json
+
+from colama.services.docker_service import ContainerInfo
+from colama.services.snapshot import (
+    CONTAINER_COLUMNS, SNAPSHOT_VERSION, StateSnapshot, snapshot_path,
+)
+
+CONTAINERS = [
+    ContainerInfo("aaa111", "web", "example/web:latest", "Up 2 hours", True, group="shop",
+                  health="healthy", service="web", depends_on="db:service_healthy:false"),
+    ContainerInfo("bbb222", "db", "postgres:16", "Exited (0) 1 hour ago", False),
+]
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "state.json")
+    StateSnapshot(True, CONTAINERS, saved_at=1234.5).save(path)
+    loaded = StateSnapshot.load(path)
+    assert loaded == StateSnapshot(True, CONTAINERS, saved_at=1234.5)
+
+
+def test_unknown_and_missing_columns():
+    # Written by a version that had a "cpu" column but no "flapping" one yet
+    columns = [c for c in CONTAINER_COLUMNS if c != "flapping"]
+    web = CONTAINERS[0]
+    data = {
+        "version": SNAPSHOT_VERSION, "saved_at": 0.0, "docker_running": True,
+        "columns": columns + ["cpu"],
+        "containers": [[getattr(web, c) for c in columns] + [12.5]],
+    }
+    assert StateSnapshot.from_dict(data).containers == [web]
+
+
+def test_stale_or_broken_files_are_ignored(tmp_path):
+    path = tmp_path / "state.json"
+    assert StateSnapshot.load(str(path)) is None  # none saved yet
+
+    data = StateSnapshot(True, CONTAINERS).to_dict()
+    data["version"] = SNAPSHOT_VERSION - 1
+    path.write_text(json.dumps(data))
+    assert StateSnapshot.load(str(path)) is None
+
+    path.write_text('{"version": %d, "docker_running": true' % SNAPSHOT_VERSION)
+    assert StateSnapshot.load(str(path)) is None
+
+    path.write_text(json.dumps({"version": SNAPSHOT_VERSION, "docker_running": True}))
+    assert StateSnapshot.load(str(path)) is None
+
+
+def test_one_file_per_profile(monkeypatch, tmp_path):
+    monkeypatch.setenv("COLAMA_CACHE_DIR", str(tmp_path))
+    assert snapshot_path(None) == str(tmp_path / "state-default.json")
+    assert snapshot_path("work") == str(tmp_path / "state-work.json")
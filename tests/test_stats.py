@@ -0,0 +1,81 @@
+import time
+from types import SimpleNamespace
+
+from colama.services.stats import ContainerStats, RingBuffer, StatsCollector
+
+
+def sample(cpu: int, system: int, memory: int, rx: int, tx: int) -> dict:
+    return {
+        "cpu_stats": {"cpu_usage": {"total_usage": cpu}, "system_cpu_usage": system,
+                      "online_cpus": 2},
+        "precpu_stats": {"cpu_usage": {"total_usage": 0}, "system_cpu_usage": 0},
+        "memory_stats": {"usage": memory, "limit": 1000, "stats": {"inactive_file": 100}},
+        "networks": {"eth0": {"rx_bytes": rx, "tx_bytes": tx}},
+    }
+
+
+def test_ring_buffer_keeps_the_newest_values():
+    buffer = RingBuffer(3)
+    assert buffer.last() is None and buffer.values() == []
+    for value in range(5):
+        buffer.append(value)
+    assert len(buffer) == 3
+    assert buffer.values() == [2.0, 3.0, 4.0]
+    assert buffer.last() == 4.0
+
+
+def test_samples_fold_into_history():
+    stats = ContainerStats(history=10)
+    stats.add_sample(sample(cpu=25, system=100, memory=600, rx=1000, tx=500))
+    stats.add_sample(sample(cpu=50, system=100, memory=700, rx=3000, tx=800))
+    assert stats.cpu_percent.values() == [50.0, 100.0]  # per online CPU, like docker stats
+    assert stats.memory.values() == [500.0, 600.0]  # without the page cache
+    assert stats.memory_limit == 1000.0
+    # Network rates need two samples
+    assert (stats.net_rx.values(), stats.net_tx.values()) == ([2000.0], [300.0])
+    assert "Net ↓ 2.0 KiB/s  ↑ 300 B/s" in stats.summary()
+
+
+def test_summary_before_the_first_sample():
+    assert ContainerStats(history=10).summary() == "Collecting stats..."
+
+
+class FakeClient:
+    """Streams the same sample for each container until the reader lets go."""
+
+    def __init__(self):
+        self.opened = []
+        self.api = SimpleNamespace(stats=self.stats)
+
+    def stats(self, container_id, stream, decode):
+        self.opened.append(container_id)
+        while True:
+            yield sample(cpu=10, system=100, memory=200, rx=0, tx=0)
+            time.sleep(0.01)
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_collector_follows_the_running_containers():
+    client = FakeClient()
+    collector = StatsCollector(lambda: client, history=5, max_streams=2)
+    try:
+        collector.sync(running=["a", "b", "c"], known=["a", "b", "c", "d"])
+        assert wait_for(lambda: len(client.opened) == 2)  # capped at max_streams
+        reading = set(client.opened)
+        assert all(wait_for(lambda: len(collector.get(c).cpu_percent) > 0) for c in reading)
+
+        # Stopped containers keep their history, removed ones lose it
+        stopped = sorted(reading)[0]
+        collector.sync(running=[], known=[stopped])
+        assert collector.get(stopped) is not None
+        assert all(collector.get(c) is None for c in {"a", "b", "c"} - {stopped})
+    finally:
+        collector.stop_all()